@@ -0,0 +1 @@
+"""Upstream plumbing shared by the tools defined in ``main.py``."""
@@ -0,0 +1,139 @@
+"""Month by month backfill of intraday history into the bar store.
+
+The intraday endpoint returns one month per call when given month=YYYY-MM.
+A backfill fetches the months of a range concurrently, each call waiting
+for its turn in the key pool's rate limiters, and writes them to the bar
+store in month order as they arrive. Months held in full are skipped, so
+an interrupted backfill resumes where it stopped, and stored months are
+then read without an upstream call.
+"""
+import asyncio
+import datetime
+import os
+import re
+import time
+
+import httpx
+import numpy as np
+from alpha_vantage.timeseries import TimeSeries
+
+from .client import shared
+from .store import bar_store, month_span, series_name, time_zone_of
+
+# Month fetches in flight at once; the rate limiters pace them further
+CONCURRENCY = int(os.getenv('ALPHAVANTAGE_BACKFILL_CONCURRENCY', '4'))
+
+_MONTH = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+
+
+def months_between(start_month, end_month):
+    """ Return the 'YYYY-MM' months from start_month to end_month inclusive """
+    for month in (start_month, end_month):
+        if not isinstance(month, str) or not _MONTH.match(month):
+            raise ValueError('months must be given as YYYY-MM, got %r' % (month,))
+    first, last = np.datetime64(start_month, 'M'), np.datetime64(end_month, 'M')
+    if last < first:
+        raise ValueError('end_month %s is before start_month %s' % (end_month, start_month))
+    return [str(month) for month in np.arange(first, last + np.timedelta64(1, 'M'))]
+
+
+def _write(symbol, series, run, current):
+    """ Write a run of consecutive fetched months to the bar store as one span
+
+    Keyword Arguments:
+        symbol:  the symbol of the series
+        series:  the series name
+        run:  (month, (columns, time_zone)) of each month, in order
+        current:  the current month, which is never recorded as held in full
+    """
+    columns = {name: np.concatenate([result[0][name] for _, result in run]) for name in run[0][1][0]}
+    span = (month_span(run[0][0])[0], month_span(run[-1][0])[1])
+    complete = [month for month, _ in run if month < current]
+    bar_store.write(symbol, series, columns, run[-1][1][1], span, complete)
+
+
+async def backfill(symbol, interval, start_month, end_month, extended_hours='true', adjusted='true',
+                   progress=None):
+    """ Fetch the intraday bars of every month in a range into the bar store
+    and return a summary of the run.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  '1min', '5min', '15min', '30min' or '60min'
+        start_month, end_month:  the first and last month, as YYYY-MM
+        extended_hours, adjusted:  as for the intraday endpoint
+        progress:  optional coroutine function called with (done, total,
+            message) after every month
+    """
+    months = months_between(start_month, end_month)
+    series = series_name(interval, extended_hours, adjusted)
+    held = set((bar_store.meta(symbol, series) or {}).get('months', ()))
+    # The current month is still growing, so it is never recorded as held in full
+    current = datetime.date.today().strftime('%Y-%m')
+    pending = [month for month in months if month not in held]
+    ts = shared(TimeSeries)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    arrived = {}
+    failed = {}
+    written = [0]
+    started = time.monotonic()
+    lock = asyncio.Lock()
+
+    async def commit():
+        # Write the runs of months that follow the last written one, so that
+        # months arriving in order are appended rather than spliced in; a
+        # failed month splits them, as its stored bars must be left alone
+        runs = [[]]
+        while written[0] < len(pending) and pending[written[0]] in arrived:
+            month = pending[written[0]]
+            result = arrived.pop(month)
+            if result is not None:
+                runs[-1].append((month, result))
+            elif runs[-1]:
+                runs.append([])
+            written[0] += 1
+        for run in runs:
+            if run:
+                await asyncio.to_thread(_write, symbol, series, run, current)
+
+    async def fetch(month):
+        async with semaphore:
+            try:
+                frame = await ts.frame('get_intraday', symbol=symbol, interval=interval, outputsize='full',
+                                       month=month, extended_hours=extended_hours, adjusted=adjusted)
+                result = frame.bar_columns(), time_zone_of(frame.meta_data)
+            except (ValueError, httpx.HTTPError) as e:
+                failed[month] = str(e)
+                result = None
+        async with lock:
+            arrived[month] = result
+            await commit()
+            done = len(arrived) + written[0]
+            elapsed = time.monotonic() - started
+            eta = elapsed / done * (len(pending) - done)
+            if progress is not None:
+                await progress(done, len(pending), '%s %s: %d of %d months fetched, ETA %.0fs'
+                               % (symbol, interval, done, len(pending), eta))
+
+    try:
+        await asyncio.gather(*(fetch(month) for month in pending))
+    finally:
+        # Keep the months that arrived ahead of an earlier one when interrupted,
+        # without a failing write hiding why the run stopped
+        for month, result in sorted(arrived.items()):
+            if result is not None:
+                try:
+                    await asyncio.to_thread(_write, symbol, series, [(month, result)], current)
+                except Exception as e:
+                    failed.setdefault(month, str(e))
+    meta = bar_store.meta(symbol, series) or {}
+    return {
+        'symbol': symbol,
+        'series': series,
+        'months': len(months),
+        'already_held': len(months) - len(pending),
+        'fetched': len(pending) - len(failed),
+        'failed': failed,
+        'rows': meta.get('rows', 0),
+        'seconds': round(time.monotonic() - started, 3),
+    }
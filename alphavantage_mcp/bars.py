@@ -0,0 +1,246 @@
+"""OHLCV price bars served from the bar store.
+
+A stock time series is fetched through the shared client only when the
+store's copy is older than the request's TTL. Then just the bars the store
+lacks, or the last one it holds, are written, and every reader
+gets memory-mapped columns: the price tools format their responses from
+them and the local indicators compute on them without a copy.
+"""
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+
+import numpy as np
+from alpha_vantage.timeseries import TimeSeries
+
+from .cache import ttl_for
+from .client import shared
+from .frames import Frame, select
+from .resample import MINUTES, PERIODS, intraday_meta, period_meta, resample, resample_intraday, resample_stats
+from .store import COLUMNS, bar_store, month_span, series_name, time_zone_of, to_stamps
+
+INTRADAY_INTERVALS = ('1min', '5min', '15min', '30min', '60min')
+SERIES_TYPES = ('open', 'high', 'low', 'close')
+
+
+class Bars(object):
+    """ Price bars of one symbol at one interval, oldest first, with one
+    float array per field.
+
+    Keyword Arguments:
+        index:  the bar timestamps as strings, in the upstream format
+        open, high, low, close, volume:  arrays aligned with index, which
+            may be read-only maps of the bar store
+        time_zone:  the time zone of the timestamps
+        times:  the bar timestamps as int64 seconds, when known
+    """
+
+    def __init__(self, index, open, high, low, close, volume, time_zone=None, times=None):
+        self.index = index
+        self.times = times
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.time_zone = time_zone
+
+    def __len__(self):
+        return len(self.index)
+
+    def series(self, series_type):
+        """ Return the price array selected by an indicator's series_type """
+        if series_type not in SERIES_TYPES:
+            raise ValueError('series_type must be one of %s, got %r' % (', '.join(SERIES_TYPES), series_type))
+        return getattr(self, series_type)
+
+
+# The stored series of each daily and longer stock time series function
+_FUNCTIONS = {
+    'daily': 'TIME_SERIES_DAILY',
+    'weekly': 'TIME_SERIES_WEEKLY',
+    'monthly': 'TIME_SERIES_MONTHLY',
+}
+_PRICES = ('open', 'high', 'low', 'close')
+INDEX_MEMO_SIZE = 32
+
+# Bars.index by (symbol, series, first, last and count of the bar times), least recently used first
+_indexes = OrderedDict()
+
+
+async def _fetch(symbol, interval, outputsize, month, entitlement, extended_hours, adjusted):
+    ts = shared(TimeSeries)
+    if interval in INTRADAY_INTERVALS:
+        return await ts.frame('get_intraday', symbol=symbol, interval=interval, outputsize=outputsize, month=month,
+                              extended_hours=extended_hours, adjusted=adjusted, entitlement=entitlement)
+    if interval == 'daily':
+        return await ts.frame('get_daily', symbol=symbol, outputsize=outputsize)
+    return await ts.frame('get_%s' % (interval,), symbol=symbol)
+
+
+def _unchanged(stored, columns, rows):
+    """ Return whether the store holds some bars of a response as they are
+
+    Keyword Arguments:
+        stored:  the stored columns
+        columns:  the columns of the response
+        rows:  the rows of the response to compare
+    """
+    at = np.minimum(np.searchsorted(stored['time'], columns['time'][rows]), len(stored['time']) - 1)
+    return all(np.array_equal(stored[name][at], values[rows]) for name, values in columns.items())
+
+
+def _ingest(symbol, series, frame, span=None, months=()):
+    """ Write the bars of a time series response Frame to the store and
+    return the [start, end) seconds the response covers.
+
+    Without a span only the bars from the last stored one on are written,
+    provided the store holds the 100 bars before them and the oldest bar of
+    the response as they are; otherwise, as when a split or dividend
+    adjusted the history, the whole response replaces the stored bars it
+    covers.
+    """
+    columns = frame.bar_columns()
+    times = columns['time']
+    if not len(times):
+        return span or (0, 0)
+    covered = int(times[0]), int(times[-1]) + 1
+    time_zone = time_zone_of(frame.meta_data)
+    stored = bar_store.read(symbol, series) if span is None else None
+    if stored is not None and len(stored[0]['time']):
+        new = int(np.searchsorted(times, stored[0]['time'][-1]))
+        # The bars a compact fetch returns are where revisions show up
+        if new and _unchanged(stored[0], columns, np.unique(np.r_[0, max(new - 100, 0):new])):
+            # An unchanged last bar is left alone, so that the new bars are appended in place
+            if new < len(times) and _unchanged(stored[0], columns, [new]):
+                new += 1
+            if new < len(times):
+                bar_store.write(symbol, series, {name: values[new:] for name, values in columns.items()}, time_zone)
+            return covered
+    bar_store.write(symbol, series, columns, time_zone, span or covered, months)
+    return span or covered
+
+
+def _month_meta(symbol, interval, outputsize, stamps, time_zone):
+    return {
+        '1. Information': 'Intraday (%s) open, high, low, close prices and volume' % (interval,),
+        '2. Symbol': symbol,
+        '3. Last Refreshed': stamps[0] if stamps else None,
+        '4. Interval': interval,
+        '5. Output Size': 'Full size' if outputsize == 'full' else 'Compact',
+        '6. Time Zone': time_zone,
+    }
+
+
+async def load_series(symbol, interval='daily', outputsize='full', month=None, entitlement=None,
+                      extended_hours='true', adjusted='true'):
+    """ Return (columns, meta_data): the stored columns of the bars an
+    upstream time series request returns, oldest first, and the meta data of
+    its response. Months held in full by a backfill are read without an
+    upstream call, coarser intraday bars are resampled from the full
+    1-minute series or month and weekly and monthly ones from the full
+    daily series once the store holds those, and other requests are
+    refetched only once the store's copy is older than their TTL.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  '1min', '5min', '15min', '30min', '60min', 'daily',
+            'weekly' or 'monthly' (default 'daily')
+        outputsize:  'compact' for the last 100 bars or 'full'
+            (default 'full')
+        month:  YYYY-MM month of intraday data (default None, the most
+            recent 30 days)
+        entitlement:  'realtime' or 'delayed' for intraday data
+        extended_hours, adjusted:  as for the intraday endpoint
+    """
+    if interval in INTRADAY_INTERVALS:
+        series = series_name(interval, extended_hours, adjusted)
+        function = 'TIME_SERIES_INTRADAY'
+        if interval in MINUTES:
+            minute = bar_store.meta(symbol, series_name('1min', extended_hours, adjusted)) or {}
+            resampled = month in minute.get('months', ()) if month else 'full' in minute.get('requests', {})
+            resample_stats.record(interval, resampled)
+            if resampled:
+                columns, meta_data = await load_series(symbol, '1min', 'full', month, entitlement, extended_hours,
+                                                       adjusted)
+                columns = resample_intraday(columns, interval, extended_hours)
+                if outputsize != 'full':
+                    columns = {name: values[-100:] for name, values in columns.items()}
+                return columns, intraday_meta(meta_data, interval, outputsize, columns)
+    elif interval in _FUNCTIONS:
+        if month is not None:
+            raise ValueError('month is only supported for intraday intervals')
+        function, series = _FUNCTIONS[interval], interval
+        outputsize = outputsize if interval == 'daily' else 'full'
+        if interval in PERIODS:
+            resampled = 'full' in (bar_store.meta(symbol, 'daily') or {}).get('requests', {})
+            resample_stats.record(interval, resampled)
+            if resampled:
+                columns, meta_data = await load_series(symbol, 'daily', 'full')
+                columns = resample(columns, interval)
+                return columns, period_meta(symbol, interval, columns, time_zone_of(meta_data))
+    else:
+        raise ValueError('Unsupported interval %r' % (interval,))
+    stored = bar_store.meta(symbol, series) or {}
+    if month is not None and month in stored.get('months', ()):
+        columns, stored = await asyncio.to_thread(bar_store.read, symbol, series, *month_span(month))
+        if outputsize != 'full':
+            columns = {name: values[-100:] for name, values in columns.items()}
+        stamps = to_stamps(columns['time'][-1:]).tolist()
+        return columns, _month_meta(symbol, interval, outputsize, stamps, stored['time_zone'])
+    request = outputsize if month is None else '%s:%s' % (outputsize, month)
+    info = stored.get('requests', {}).get(request)
+    if info is None or time.time() - info['fetched_at'] >= ttl_for((function, ('interval', interval))):
+        frame = await _fetch(symbol, interval, outputsize, month, entitlement, extended_hours, adjusted)
+        span, months = None, ()
+        if month is not None and outputsize == 'full':
+            # The current month is still growing, so it is never recorded as held in full
+            span = month_span(month)
+            months = [month] if month < datetime.date.today().strftime('%Y-%m') else []
+        start, end = await asyncio.to_thread(_ingest, symbol, series, frame, span, months)
+        info = {'fetched_at': time.time(), 'start': start, 'end': end, 'meta_data': frame.meta_data}
+        await asyncio.to_thread(bar_store.record, symbol, series, request, info)
+    stored = await asyncio.to_thread(bar_store.read, symbol, series, info['start'], info['end'])
+    if stored is None:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}, info['meta_data']
+    return stored[0], info['meta_data']
+
+
+def to_response(columns, meta_data, intraday=False, selection=None):
+    """ Return stored columns formatted as the (data, meta_data) pair of the
+    upstream response, newest bar first, or the part of it a Selection
+    picks.
+    """
+    fields = ['%d. %s' % (i + 1, name) for i, name in enumerate(_PRICES + ('volume',))]
+    frame = Frame(meta_data, None, columns['time'], 's' if intraday else 'D', fields,
+                  [columns[name] for name in _PRICES + ('volume',)], (4, 4, 4, 4, 0))
+    return select(frame, meta_data, selection)
+
+
+async def load_bars(symbol, interval='daily', month=None, entitlement=None):
+    """ Return the full-length Bars of a symbol, read from the bar store
+    through load_series, so it is fetched once and then shared by every
+    local computation.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  '1min', '5min', '15min', '30min', '60min', 'daily',
+            'weekly' or 'monthly' (default 'daily')
+        month:  YYYY-MM month of intraday data (default None, the most
+            recent 30 days)
+        entitlement:  'realtime' or 'delayed' for intraday data
+    """
+    columns, meta_data = await load_series(symbol, interval, 'full', month, entitlement)
+    times = columns['time']
+    # Formatting timestamps costs more than reading the bars, so the index is kept
+    key = (symbol.upper(), interval, int(times[0]), int(times[-1]), len(times)) if len(times) else None
+    index = _indexes.pop(key, None)
+    if index is None:
+        # Intraday timestamps lose their seconds, as in the indicator endpoints' output
+        index = to_stamps(times, 'm' if interval in INTRADAY_INTERVALS else 'D')
+    _indexes[key] = index
+    if len(_indexes) > INDEX_MEMO_SIZE:
+        _indexes.popitem(last=False)
+    return Bars(index, columns['open'], columns['high'], columns['low'], columns['close'], columns['volume'],
+                time_zone=time_zone_of(meta_data), times=times)
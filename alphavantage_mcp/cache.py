@@ -0,0 +1,323 @@
+"""TTL caches for upstream AlphaVantage responses: an in-process LRU and
+an optional SQLite database shared by every server process on the host.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_BYTES = int(float(os.getenv('ALPHAVANTAGE_CACHE_MB', '256')) * 1024 * 1024)
+CACHE_DB = os.getenv('ALPHAVANTAGE_CACHE_DB')
+
+# Query parameters that never change the response
+_IGNORED_PARAMS = {'apikey', 'datatype'}
+# Query parameters holding tickers or currency codes, compared case-insensitively
+_SYMBOL_PARAMS = {'symbol', 'symbols', 'tickers', 'from_symbol', 'to_symbol',
+                  'from_currency', 'to_currency', 'market'}
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+_INTRADAY_INTERVALS = {'1min', '5min', '15min', '30min', '60min'}
+
+# Time to live per upstream function, in seconds
+_TTL = {
+    'GLOBAL_QUOTE': 15,
+    'CURRENCY_EXCHANGE_RATE': 15,
+    'REALTIME_OPTIONS': 15,
+    'MARKET_STATUS': 30,
+    'TOP_GAINERS_LOSERS': MINUTE,
+    'NEWS_SENTIMENT': 5 * MINUTE,
+    'TIME_SERIES_INTRADAY': MINUTE,
+    'FX_INTRADAY': MINUTE,
+    'CRYPTO_INTRADAY': MINUTE,
+    'TIME_SERIES_DAILY': HOUR,
+    'TIME_SERIES_DAILY_ADJUSTED': HOUR,
+    'FX_DAILY': HOUR,
+    'DIGITAL_CURRENCY_DAILY': HOUR,
+    'TIME_SERIES_WEEKLY': 6 * HOUR,
+    'TIME_SERIES_WEEKLY_ADJUSTED': 6 * HOUR,
+    'FX_WEEKLY': 6 * HOUR,
+    'DIGITAL_CURRENCY_WEEKLY': 6 * HOUR,
+    'TIME_SERIES_MONTHLY': DAY,
+    'TIME_SERIES_MONTHLY_ADJUSTED': DAY,
+    'FX_MONTHLY': DAY,
+    'DIGITAL_CURRENCY_MONTHLY': DAY,
+    'SYMBOL_SEARCH': DAY,
+    'OVERVIEW': 6 * HOUR,
+    'DIVIDENDS': 12 * HOUR,
+    'SPLITS': 12 * HOUR,
+    'INCOME_STATEMENT': 12 * HOUR,
+    'BALANCE_SHEET': 12 * HOUR,
+    'CASH_FLOW': 12 * HOUR,
+    'EARNINGS': 12 * HOUR,
+    'HISTORICAL_OPTIONS': DAY,
+    'REAL_GDP': DAY,
+    'REAL_GDP_PER_CAPITA': DAY,
+    'TREASURY_YIELD': DAY,
+    'FEDERAL_FUNDS_RATE': DAY,
+    'CPI': DAY,
+    'INFLATION': DAY,
+    'RETAIL_SALES': DAY,
+    'DURABLES': DAY,
+    'UNEMPLOYMENT': DAY,
+    'NONFARM_PAYROLL': DAY,
+}
+# Commodities and the technical indicators depend on their interval argument
+_TTL_BY_INTERVAL = {
+    'daily': HOUR,
+    'weekly': 6 * HOUR,
+    'monthly': DAY,
+    'quarterly': DAY,
+    'annual': DAY,
+}
+_DEFAULT_TTL = HOUR
+# Full-length series of these functions are brought up to date with compact
+# fetches, so their last copy is kept beyond its TTL as the base to merge into
+REFRESHED_FUNCTIONS = ('TIME_SERIES_DAILY', 'TIME_SERIES_DAILY_ADJUSTED', 'FX_DAILY')
+
+
+def canonical_key(url):
+    """ Return the cache key of an upstream query url: the function name
+    followed by the sorted query arguments, with symbols uppercased and
+    the api key and datatype dropped. The alpha_vantage wrappers already
+    fill in defaults and leave out arguments that are None.
+
+    Keyword Arguments:
+        url:  the query url built by an alpha_vantage wrapper
+    """
+    params = {}
+    for name, value in parse_qsl(urlsplit(url).query):
+        if name in _IGNORED_PARAMS:
+            continue
+        if name in _SYMBOL_PARAMS:
+            value = value.upper()
+        params[name] = value
+    function = params.pop('function', '')
+    return (function,) + tuple(sorted(params.items()))
+
+
+def ttl_for(key):
+    """ Return how many seconds a response may be served from the cache
+
+    Keyword Arguments:
+        key:  a key built by canonical_key
+    """
+    function, params = key[0], dict(key[1:])
+    if function in _TTL:
+        return _TTL[function]
+    interval = params.get('interval')
+    if interval in _INTRADAY_INTERVALS:
+        return MINUTE
+    return _TTL_BY_INTERVAL.get(interval, _DEFAULT_TTL)
+
+
+def refreshable(key):
+    """ Return whether a request is for a full-length series that can be
+    refreshed with a compact fetch
+
+    Keyword Arguments:
+        key:  a key built by canonical_key
+    """
+    return key[0] in REFRESHED_FUNCTIONS and ('outputsize', 'full') in key[1:]
+
+
+class TTLCache(object):
+    """ Least recently used cache bounded by the total size of the stored
+    responses, where every entry also expires after its own time to live.
+    Expired refreshable entries stay until evicted, for stale().
+
+    Keyword Arguments:
+        max_bytes:  upper bound on the summed size of the cached responses
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """ Return the cached value for key, or None when it is missing or
+        has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, size, value = entry
+            if expires <= time.monotonic():
+                if not refreshable(key):
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def stale(self, key):
+        """ Return the value held for key even when it has expired, or None """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry is not None else None
+
+    def set(self, key, value, size, ttl):
+        """ Store value under key for ttl seconds, evicting the least
+        recently used entries until the byte budget is met.
+
+        Keyword Arguments:
+            key:  a key built by canonical_key
+            value:  the parsed response
+            size:  the size of the raw response in bytes
+            ttl:  time to live in seconds
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+response_cache = TTLCache()
+
+
+class SQLiteCache(object):
+    """ Persistent response cache in a SQLite database in WAL mode, so that
+    several server processes can read and write it concurrently and a
+    restarted server starts warm. Responses are stored zlib-compressed
+    together with the time they were fetched; freshness is decided on read
+    from that timestamp and the endpoint's TTL. The states of streamed
+    indicators are kept next to the responses.
+
+    Keyword Arguments:
+        path:  location of the database file, created when missing
+    """
+    # Rows older than the longest TTL can never be served again, but for the
+    # full-length series that compact fetches are merged into
+    _MAX_AGE = max(list(_TTL.values()) + list(_TTL_BY_INTERVAL.values()))
+    _KEPT = ' AND '.join(['NOT (key LIKE \'["%s", %%\' AND key LIKE \'%%["outputsize", "full"]%%\')' % function
+                          for function in REFRESHED_FUNCTIONS])
+    _PRUNE_EVERY = 100
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body BLOB NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS states (key TEXT PRIMARY KEY, body TEXT NOT NULL)')
+
+    def _connection(self):
+        # sqlite3 connections may not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, ttl):
+        """ Return (content, age) for a response fetched less than ttl
+        seconds ago, or None.
+
+        Keyword Arguments:
+            key:  a key built by canonical_key
+            ttl:  time to live of the response in seconds
+        """
+        row = self._connection().execute(
+            'SELECT fetched_at, body FROM responses WHERE key = ?', (json.dumps(key),)).fetchone()
+        age = time.time() - row[0] if row is not None else None
+        with self._lock:
+            if row is None or age >= ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return zlib.decompress(row[1]), age
+
+    def get_stale(self, key):
+        """ Return the content stored under key whatever its age, or None """
+        row = self._connection().execute('SELECT body FROM responses WHERE key = ?', (json.dumps(key),)).fetchone()
+        return zlib.decompress(row[0]) if row is not None else None
+
+    def set(self, key, content):
+        """ Store the raw response content under key, stamped with the
+        current time.
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO responses (key, fetched_at, body) VALUES (?, ?, ?)',
+                         (json.dumps(key), now, zlib.compress(content)))
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self._PRUNE_EVERY == 0
+            if prune:
+                conn.execute('DELETE FROM responses WHERE fetched_at < ? AND ' + self._KEPT, (now - self._MAX_AGE,))
+
+    def get_state(self, key):
+        """ Return the json state stored under key, or None """
+        row = self._connection().execute('SELECT body FROM states WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set_state(self, key, state):
+        """ Store a json serializable state under key, replacing any
+        earlier one; states do not expire.
+        """
+        with self._connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO states (key, body) VALUES (?, ?)', (key, json.dumps(state)))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+disk_cache = SQLiteCache(CACHE_DB) if CACHE_DB else None
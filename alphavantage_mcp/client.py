@@ -0,0 +1,287 @@
+"""Process-wide AlphaVantage client objects and the HTTP pool behind them."""
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import httpx
+
+from .cache import canonical_key, disk_cache, refreshable, response_cache, ttl_for
+from .csvseries import csv_url, from_csv
+from .frames import Frame, from_json, select
+from .history import compact_url, history_stats, merge
+from .keys import key_pool
+from .responses import (INVALID_KEY, THROTTLED, UNAVAILABLE, UnavailableError, UnparseableResponseError, check,
+                        classify, message_of, response_stats)
+from .singleflight import single_flight
+
+POOL_SIZE = int(os.getenv('ALPHAVANTAGE_POOL_SIZE', '10'))
+KEEPALIVE_EXPIRY = float(os.getenv('ALPHAVANTAGE_KEEPALIVE_EXPIRY', '60'))
+TIMEOUT = float(os.getenv('ALPHAVANTAGE_TIMEOUT', '30'))
+# Throttled calls are retried with jittered exponential backoff until this many seconds have passed
+RETRY_DEADLINE = float(os.getenv('ALPHAVANTAGE_RETRY_DEADLINE', '60'))
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+# The wrappers are built with this stand-in; the key pool supplies the real key per call
+_KEY_PLACEHOLDER = 'ALPHAVANTAGE_KEY_PLACEHOLDER'
+
+# httpx logs every request url at INFO, and the url carries the api key
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+
+class ConnectionStats(object):
+    """ Count upstream requests by whether they opened a new connection
+    or reused a kept-alive one from the pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.in_flight = 0
+
+    def record(self, opened):
+        with self._lock:
+            if opened:
+                self.opened += 1
+            else:
+                self.reused += 1
+
+    def as_dict(self):
+        with self._lock:
+            total = self.opened + self.reused
+            return {
+                'requests': total,
+                'in_flight': self.in_flight,
+                'connections_opened': self.opened,
+                'connections_reused': self.reused,
+                'reuse_ratio': self.reused / total if total else 0.0,
+                'pool_size': POOL_SIZE,
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+@functools.cache
+def http_client():
+    """ Return the pooled keep-alive async HTTP client shared by every tool """
+    limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE,
+                          keepalive_expiry=KEEPALIVE_EXPIRY)
+    return httpx.AsyncClient(limits=limits, timeout=TIMEOUT)
+
+
+async def _get(url, headers=None):
+    """ GET the url on the shared pool and record whether a new TCP
+    connection had to be opened for it.
+    """
+    opened = False
+
+    async def trace(event_name, info):
+        nonlocal opened
+        if event_name == 'connection.connect_tcp.started':
+            opened = True
+
+    connection_stats.in_flight += 1
+    try:
+        response = await http_client().get(url, headers=headers, extensions={'trace': trace})
+    finally:
+        connection_stats.in_flight -= 1
+    connection_stats.record(opened)
+    return response
+
+
+def _decoded(content):
+    """ Return a response body decoded: json as json and CSV as its text """
+    return json.loads(content) if content.lstrip()[:1] in (b'{', b'[') else content.decode()
+
+
+def _typed(json_response, key, url):
+    """ Return a time series response as a Frame and any other unchanged.
+    It raises UnparseableResponseError for a body that is not json and not
+    a time series in CSV either.
+    """
+    if isinstance(json_response, str):
+        frame = from_csv(json_response, url)
+        if frame is None:
+            raise UnparseableResponseError('%s returned a response that could not be parsed: %r'
+                                           % (key[0], json_response[:100]))
+        return frame
+    frame = from_json(json_response)
+    return frame if frame is not None else json_response
+
+
+def _size(json_response, content):
+    return json_response.nbytes if isinstance(json_response, Frame) else len(content)
+
+
+class _UrlPlanner(object):
+    """ Mixin that makes an alpha_vantage wrapper hand back the url it
+    built instead of calling it with blocking ``requests``.
+    """
+
+    def _handle_api_call(self, url):
+        return url
+
+
+class AsyncClient(object):
+    """ Async facade over an alpha_vantage wrapper class. Calling one of its
+    ``get_*`` methods lets the wrapper build the query url, fetches it on the
+    shared ``httpx.AsyncClient`` and returns the same (data, meta_data) pair
+    as the synchronous wrapper. Time series responses are held as Frames and
+    their data formatted from those on every call; a ``selection`` keyword,
+    a Selection, restricts that data to the bars and fields it picks.
+    """
+
+    def __init__(self, cls):
+        self._cls = cls
+        self._planner = type(cls.__name__, (_UrlPlanner, cls), {})(key=_KEY_PLACEHOLDER, output_format='json')
+
+    def __getattr__(self, name):
+        # The wrapper methods are _output_format(_call_api_on_func(func));
+        # the inner decorator builds the url, the outer one picks the keys
+        call_api = getattr(self._cls, name).__wrapped__
+
+        @functools.wraps(call_api)
+        async def call(*args, selection=None, **kwargs):
+            url, data_key, meta_data_key = call_api(self._planner, *args, **kwargs)
+            json_response = await self._fetch(url)
+            if isinstance(json_response, Frame):
+                return select(json_response, json_response.meta_data, selection)
+            data = json_response[data_key] if data_key is not None else json_response
+            meta_data = json_response[meta_data_key] if meta_data_key is not None else None
+            return select(data, meta_data, selection)
+        return call
+
+    async def frame(self, name, *args, **kwargs):
+        """ Return the Frame of a call of one of the wrapper's get_* methods
+        that returns a time series. It raises ValueError when the response
+        holds none.
+        """
+        url = getattr(self._cls, name).__wrapped__(self._planner, *args, **kwargs)[0]
+        json_response = await self._fetch(url)
+        if not isinstance(json_response, Frame):
+            raise ValueError('%s returned no time series' % (name,))
+        return json_response
+
+    async def held(self, name, *args, **kwargs):
+        """ Return whether either cache holds a response to a call of one of
+        the wrapper's get_* methods, fresh or expired.
+        """
+        url = getattr(self._cls, name).__wrapped__(self._planner, *args, **kwargs)[0]
+        key = canonical_key(url)
+        if response_cache.stale(key) is not None:
+            return True
+        return disk_cache is not None and await asyncio.to_thread(disk_cache.get_stale, key) is not None
+
+    async def _fetch(self, url):
+        """ Return the checked json response for url, from the in-process or
+        the on-disk cache when a fresh copy is held there. Identical requests
+        arriving while one is in flight share its result.
+        """
+        key = canonical_key(url)
+        json_response = response_cache.get(key)
+        if json_response is not None:
+            return json_response
+        return await single_flight.do(key, lambda: self._load(key, url))
+
+    async def _load(self, key, url):
+        ttl = ttl_for(key)
+        if disk_cache is not None:
+            stored = await asyncio.to_thread(disk_cache.get, key, ttl)
+            if stored is not None:
+                content, age = stored
+                json_response = _typed(_decoded(content), key, url)
+                response_cache.set(key, json_response, _size(json_response, content), ttl - age)
+                return json_response
+        if refreshable(key):
+            json_response = await self._refresh(key, url)
+            if json_response is not None:
+                content = json_response.to_content()
+                response_cache.set(key, json_response, json_response.nbytes, ttl)
+                if disk_cache is not None:
+                    await asyncio.to_thread(disk_cache.set, key, content)
+                return json_response
+        response, json_response = await self._call(key, csv_url(key, url))
+        json_response = _typed(check(json_response), key, url)
+        response_cache.set(key, json_response, _size(json_response, response.content), ttl)
+        if disk_cache is not None:
+            await asyncio.to_thread(disk_cache.set, key, response.content)
+        return json_response
+
+    async def _refresh(self, key, url):
+        """ Return the expired full-length series held for key brought up to
+        date with its compact output, or None when no copy is held or the
+        compact output cannot be merged into it.
+        """
+        held = response_cache.stale(key)
+        if held is None and disk_cache is not None:
+            content = await asyncio.to_thread(disk_cache.get_stale, key)
+            held = _typed(_decoded(content), key, url) if content is not None else None
+        if held is None:
+            return None
+        merged = merge(held, await self._fetch(compact_url(url)))
+        history_stats.record(merged is not None)
+        return merged
+
+    async def _call(self, key, url):
+        """ Call the api with a key from the key pool within its rate limit.
+        Throttled or rejected calls move on to another key while the pool has
+        one in rotation, and otherwise back off exponentially with jitter
+        until RETRY_DEADLINE has passed, after which HTTP 429 and 5xx answers
+        and transport errors raise UnavailableError. Returns the last
+        response and its decoded body, json or CSV text.
+        """
+        deadline = time.monotonic() + RETRY_DEADLINE
+        symbol = key_pool.symbol_of(key)
+        attempt = 0
+        while True:
+            api_key = await key_pool.acquire(symbol)
+            response, json_response, kind, failure = None, None, UNAVAILABLE, None
+            try:
+                response = await _get(url.replace(_KEY_PLACEHOLDER, api_key.key), headers=self._planner.headers)
+                if response.status_code != 429 and response.status_code < 500:
+                    json_response = _decoded(response.content)
+                    kind = classify(json_response)
+            except httpx.TransportError as e:
+                # Refused connections, timeouts and dropped connections are retried as HTTP 5xx are
+                failure = e
+            finally:
+                key_pool.release(api_key, kind, message_of(json_response))
+            response_stats.record(kind)
+            if kind == INVALID_KEY and key_pool.active_keys():
+                # The pool has dropped that key; go again with another one
+                continue
+            if kind not in (THROTTLED, UNAVAILABLE):
+                return response, json_response
+            if kind == THROTTLED and key_pool.active_keys():
+                delay = 0.0
+            else:
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            if time.monotonic() + delay > deadline:
+                response_stats.give_up()
+                if failure is not None:
+                    raise UnavailableError('AlphaVantage could not be reached until the retry deadline passed: %s'
+                                           % (failure.__class__.__name__,)) from failure
+                if kind == UNAVAILABLE:
+                    raise UnavailableError('AlphaVantage answered HTTP %d until the retry deadline passed.'
+                                           % (response.status_code,))
+                return response, json_response
+            response_stats.retried()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+@functools.cache
+def shared(cls):
+    """ Return the long-lived async client for an alpha_vantage wrapper
+    class, built on first use and routed through the shared connection pool.
+
+    Keyword Arguments:
+        cls:  the alpha_vantage class, e.g. TimeSeries or TechIndicators
+    """
+    return AsyncClient(cls)
@@ -0,0 +1,107 @@
+"""Stock time series fetched as CSV.
+
+With datatype=csv the time series endpoints answer with a header line and
+one line per bar, about a third of the bytes of their nested json, and the bars
+parse in one pass straight into the typed columns of a Frame. CSV carries
+no meta data object, so it is rebuilt from the request as upstream words
+it; that is only done for the stock time series, whose meta data depends
+on nothing else. Errors and notices still come back as json.
+"""
+import os
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .frames import UNITS, Frame, typed
+from .store import to_seconds
+
+# 'csv' fetches the stock time series as CSV, 'json' as json
+UPSTREAM_DATATYPE = os.getenv('ALPHAVANTAGE_DATATYPE', 'csv').lower()
+
+# The information line, the time series object and the time zone of each
+# function as its json meta data reports them; the FX and digital currency
+# series, which report UTC, are fetched as json
+_SERIES = {
+    'TIME_SERIES_INTRADAY': (None, None, 'US/Eastern'),
+    'TIME_SERIES_DAILY': ('Daily Prices (open, high, low, close) and Volumes', 'Time Series (Daily)', 'US/Eastern'),
+    'TIME_SERIES_DAILY_ADJUSTED': ('Daily Time Series with Splits and Dividend Events', 'Time Series (Daily)',
+                                   'US/Eastern'),
+    'TIME_SERIES_WEEKLY': ('Weekly Prices (open, high, low, close) and Volumes', 'Weekly Time Series',
+                           'US/Eastern'),
+    'TIME_SERIES_WEEKLY_ADJUSTED': ('Weekly Adjusted Prices and Volumes', 'Weekly Adjusted Time Series',
+                                    'US/Eastern'),
+    'TIME_SERIES_MONTHLY': ('Monthly Prices (open, high, low, close) and Volumes', 'Monthly Time Series',
+                            'US/Eastern'),
+    'TIME_SERIES_MONTHLY_ADJUSTED': ('Monthly Adjusted Prices and Volumes', 'Monthly Adjusted Time Series',
+                                     'US/Eastern'),
+}
+# Functions whose meta data reports the output size
+_SIZED = ('TIME_SERIES_INTRADAY', 'TIME_SERIES_DAILY', 'TIME_SERIES_DAILY_ADJUSTED')
+
+
+def csv_url(key, url):
+    """ Return the url to fetch a request with: asking for CSV when the
+    function is a stock time series, unchanged otherwise.
+
+    Keyword Arguments:
+        key:  the request's key, built by canonical_key
+        url:  the query url built by an alpha_vantage wrapper
+    """
+    if UPSTREAM_DATATYPE != 'csv' or key[0] not in _SERIES:
+        return url
+    return url.replace('datatype=json', 'datatype=csv')
+
+
+def _meta_data(url, last):
+    """ Return the meta data object upstream sends with the json response,
+    which echoes the symbol as the request gave it.
+    """
+    params = dict(parse_qsl(urlsplit(url).query))
+    function = params.get('function')
+    information, data_key, time_zone = _SERIES[function]
+    if function == 'TIME_SERIES_INTRADAY':
+        information = 'Intraday (%s) open, high, low, close prices and volume' % (params.get('interval'),)
+        data_key = 'Time Series (%s)' % (params.get('interval'),)
+    meta_data = {'1. Information': information, '2. Symbol': params.get('symbol'), '3. Last Refreshed': last}
+    if function == 'TIME_SERIES_INTRADAY':
+        meta_data['4. Interval'] = params.get('interval')
+    if function in _SIZED:
+        meta_data['%d. Output Size' % (len(meta_data) + 1,)] = \
+            'Full size' if params.get('outputsize') == 'full' else 'Compact'
+    meta_data['%d. Time Zone' % (len(meta_data) + 1,)] = time_zone
+    return meta_data, data_key
+
+
+def from_csv(content, url):
+    """ Return the Frame of a stock time series response given as CSV, or
+    None when the request is not one or the body is not of that shape.
+
+    Keyword Arguments:
+        content:  the body of the response, text or bytes
+        url:  the query url the response was fetched for
+    """
+    if dict(parse_qsl(urlsplit(url).query)).get('function') not in _SERIES:
+        return None
+    if isinstance(content, bytes):
+        content = content.decode()
+    lines = content.splitlines()
+    if not lines or not lines[0].startswith('timestamp,'):
+        return None
+    # 'adjusted_close' upstream in CSV is '5. adjusted close' in json
+    fields = tuple('%d. %s' % (i + 1, name.strip().replace('_', ' ')) for i, name in enumerate(lines[0].split(',')[1:]))
+    rows = [line.split(',', 1) for line in lines[1:] if line]
+    if not rows:
+        meta_data, data_key = _meta_data(url, None)
+        return Frame(meta_data, data_key, np.empty(0, dtype=np.int64), 'D', (), [], ())
+    stamps = [row[0] for row in rows]
+    unit = UNITS.get(len(stamps[0]))
+    try:
+        values = np.array(','.join(row[1] for row in rows).split(','), dtype=np.float64)
+        if unit is None or len(values) != len(rows) * len(fields):
+            return None
+        times = to_seconds(stamps)
+    except (IndexError, ValueError):
+        return None
+    meta_data, data_key = _meta_data(url, max(stamps))
+    return typed(meta_data, data_key, times, unit, fields, values.reshape(len(rows), len(fields)),
+                 (rows[0][1].split(','), rows[-1][1].split(',')))
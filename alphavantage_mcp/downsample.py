@@ -0,0 +1,85 @@
+"""Shape-preserving downsampling of long series.
+
+A full daily history holds thousands of bars, far more than a chart or a
+reader needs. Both methods pick bars of the series rather than averaging
+them, so every point returned is a real bar: largest triangle three
+buckets ('lttb') keeps in each bucket the bar that spans the largest
+triangle with the bar kept before it and the mean of the next bucket, and
+'minmax' keeps the lowest and the highest bar of each bucket.
+"""
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def lttb(x, y, points):
+    """ Return the sorted positions of the points largest triangle three
+    buckets keeps, the first and the last always among them.
+
+    Keyword Arguments:
+        x:  the sorted x values, e.g. the bar times
+        y:  the y values, without NaN
+        points:  the number of points to keep, at least 3
+    """
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64) - x[0]
+    y = np.asarray(y, dtype=np.float64)
+    # The first and last points are buckets of their own; the rest is cut
+    # into points - 2 buckets of (n - 2) / (points - 2) points
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    # The mean of the bucket after each one, the last point after the last bucket
+    next_x = np.append(np.add.reduceat(x[:-1], edges[:-1])[1:] / counts[1:], x[-1])
+    next_y = np.append(np.add.reduceat(y[:-1], edges[:-1])[1:] / counts[1:], y[-1])
+    kept = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for bucket in range(points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs((x[a] - next_x[bucket]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[bucket] - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[bucket + 1] = a
+    return kept
+
+
+def _firsts(y, ids, targets):
+    """ Return the position of the first point of each bucket equal to its target """
+    hits = np.flatnonzero(y == targets[ids])
+    return hits[np.unique(ids[hits], return_index=True)[1]]
+
+
+def minmax(y, points):
+    """ Return the sorted positions of the lowest and the highest point of
+    each of points // 2 equal buckets.
+
+    Keyword Arguments:
+        y:  the y values, without NaN
+        points:  the most points to keep, at least 2
+    """
+    n = len(y)
+    if points >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.arange(points // 2) * n // (points // 2)
+    ids = np.repeat(np.arange(len(edges)), np.diff(np.append(edges, n)))
+    return np.union1d(_firsts(y, ids, np.minimum.reduceat(y, edges)), _firsts(y, ids, np.maximum.reduceat(y, edges)))
+
+
+def decimate(times, values, points, method='lttb'):
+    """ Return the sorted positions of the bars a downsampling keeps; bars
+    without a value are left out.
+
+    Keyword Arguments:
+        times:  the bar times as int64 seconds, sorted
+        values:  the value of each bar the downsampling follows
+        points:  the most bars to keep
+        method:  'lttb' or 'minmax' (default 'lttb')
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    if method == 'minmax':
+        return valid[minmax(values[valid], points)]
+    return valid[lttb(times[valid], values[valid], points)]
@@ -0,0 +1,398 @@
+"""Time series responses held as typed columns.
+
+A full daily history decoded as json is thousands of small dicts of
+number strings, about ten times the size of the response body. Time series
+responses are converted once, when they arrive, to one int64 array of bar
+times and one float64 or int64 array per field; the caches hold those, the
+merge and resampling code works on them, and the (data, meta_data) pair a
+tool returns is formatted from them. A Selection picks the bars and fields a
+tool returns by binary search over the sorted bar times, downsampled or
+summarized when asked, so only those are formatted.
+"""
+import json
+
+import numpy as np
+
+from .downsample import METHODS, decimate
+from .store import COLUMNS, to_seconds, to_stamps
+from .summary import summarize
+
+# Timestamp units by the length of the upstream timestamps
+UNITS = {10: 'D', 16: 'm', 19: 's'}
+# Names of the fields in the columnar output; others keep their name
+SHORT_NAMES = {'open': 'o', 'high': 'h', 'low': 'l', 'close': 'c', 'adjusted close': 'ac', 'volume': 'v',
+               'dividend amount': 'd', 'split coefficient': 's'}
+OUTPUTS = ('rows', 'columns')
+
+
+def short_name(field):
+    """ Return the name of a field in the columnar output, e.g. 'c' for
+    '4. close'
+    """
+    name = field.split('. ', 1)[-1]
+    return SHORT_NAMES.get(name.lower(), name)
+
+
+def _decimals(value):
+    """ Return the decimals of a number given as a string """
+    return len(value) - value.index('.') - 1 if '.' in value else 0
+
+
+class Frame(object):
+    """ The bars of a time series response as typed columns, oldest first
+
+    Keyword Arguments:
+        meta_data:  the meta data object of the response
+        data_key:  the name of its time series object, e.g.
+            'Time Series (Daily)'
+        times:  the bar timestamps as int64 seconds
+        unit:  'D', 'm' or 's', the precision of the upstream timestamps
+        fields:  the upstream field names, e.g. ('1. open', '2. high', ...)
+        columns:  one array per field, int64 for integral ones and float64
+            otherwise
+        decimals:  the decimals each field is formatted with
+    """
+
+    def __init__(self, meta_data, data_key, times, unit, fields, columns, decimals):
+        self.meta_data = meta_data
+        self.data_key = data_key
+        self.times = times
+        self.unit = unit
+        self.fields = tuple(fields)
+        self.columns = list(columns)
+        self.decimals = tuple(decimals)
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def nbytes(self):
+        """ Return the approximate memory held by the frame """
+        return self.times.nbytes + sum(values.nbytes for values in self.columns) + 1024
+
+    def column(self, name):
+        """ Return the column of a field by its name without the number,
+        e.g. 'close' or 'adjusted close', or None.
+        """
+        for field, values in zip(self.fields, self.columns):
+            if field.split('. ', 1)[-1] == name:
+                return values
+        return None
+
+    def bar_columns(self):
+        """ Return the times and the open, high, low, close and volume
+        columns, typed as the bar store's COLUMNS.
+        """
+        columns = {'time': self.times}
+        for name, dtype in COLUMNS[1:]:
+            values = self.column(name)
+            columns[name] = np.empty(0, dtype=dtype) if values is None else values.astype(dtype, copy=False)
+        return columns
+
+    def data(self, order='desc'):
+        """ Return the time series object of the response, newest bar first
+        or with order 'asc' oldest first.
+        """
+        step = 1 if order == 'asc' else -1
+        stamps = to_stamps(self.times[::step], self.unit).tolist()
+        formatted = [list(map(('%%.%df' % (decimals,)).__mod__, values[::step].tolist()))
+                     for values, decimals in zip(self.columns, self.decimals)]
+        return {stamp: dict(zip(self.fields, row)) for stamp, row in zip(stamps, zip(*formatted))}
+
+    def to_columns(self, order='desc'):
+        """ Return the bars as compact columns, newest bar first or with
+        order 'asc' oldest first: the timestamps as 't' and the values of
+        each field as numbers under its short name, e.g. 'c' for the close.
+        """
+        step = 1 if order == 'asc' else -1
+        columns = {'t': to_stamps(self.times[::step], self.unit).tolist()}
+        for field, values, decimals in zip(self.fields, self.columns, self.decimals):
+            values = values[::step]
+            columns[short_name(field)] = (values if values.dtype.kind == 'i' else np.round(values, decimals)).tolist()
+        return columns
+
+    def to_json(self):
+        """ Return the response as decoded json """
+        return {'Meta Data': self.meta_data, self.data_key: self.data()}
+
+    def to_content(self):
+        """ Return the response as a json body """
+        return json.dumps(self.to_json()).encode()
+
+
+def _bound(value, name, end=False):
+    """ Return a bound given as a date or time in seconds; an end bound is
+    exclusive and so falls just after the day, minute or second given.
+    """
+    try:
+        moment = np.datetime64(str(value).strip())
+    except ValueError:
+        raise ValueError('%s must be given as YYYY-MM-DD[ HH:MM[:SS]], got %r' % (name, value)) from None
+    if end:
+        moment = moment + np.timedelta64(1, np.datetime_data(moment.dtype)[0])
+    return int(moment.astype('datetime64[s]').astype(np.int64))
+
+
+class Selection(object):
+    """ The bars and fields of a time series a tool returns
+
+    Keyword Arguments:
+        start, end:  the first and the last bar time to return, inclusive, as
+            'YYYY-MM-DD[ HH:MM[:SS]]'; an end given as a date takes in the
+            whole day (default None, open ended)
+        limit:  return only the last limit bars within start and end
+            (default None)
+        fields:  the fields to return, a list or a comma separated string of
+            names with or without their number, e.g. 'close,volume'
+            (default None, all fields)
+        order:  'desc' for the newest bar first, as upstream, or 'asc'
+            (default 'desc')
+        max_points:  downsample the bars left to at most that many, at
+            least 3 (default None)
+        downsample:  the downsampling method, 'lttb' or 'minmax'; it follows
+            the close, or the first field returned (default 'lttb')
+        summary:  return summary statistics of the bars left instead of the
+            bars, of the adjusted close, the close or else the first field
+            returned (default False)
+        output:  'rows' for the upstream object keyed by timestamp or
+            'columns' for compact columns, as Frame.to_columns
+            (default 'rows')
+    """
+
+    def __init__(self, start=None, end=None, limit=None, fields=None, order='desc', max_points=None,
+                 downsample='lttb', summary=False, output='rows'):
+        self.start = None if start is None else _bound(start, 'start')
+        self.end = None if end is None else _bound(end, 'end', end=True)
+        if limit is not None:
+            limit = int(limit)
+            if limit < 0:
+                raise ValueError('limit must not be negative, got %d' % (limit,))
+        self.limit = limit
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        self.fields = None if fields is None else tuple(name.strip().lower() for name in fields if name.strip())
+        order = str(order or 'desc').lower()
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc', got %r" % (order,))
+        self.order = order
+        if max_points is not None:
+            max_points = int(max_points)
+            if max_points < 3:
+                raise ValueError('max_points must be at least 3, got %d' % (max_points,))
+        self.max_points = max_points
+        downsample = str(downsample or 'lttb').lower()
+        if downsample not in METHODS:
+            raise ValueError('downsample must be one of %s, got %r' % (', '.join(METHODS), downsample))
+        self.downsample = downsample
+        self.summary = str(summary).lower() == 'true'
+        output = str(output or 'rows').lower()
+        if output not in OUTPUTS:
+            raise ValueError("output must be 'rows' or 'columns', got %r" % (output,))
+        self.output = output
+
+    @property
+    def everything(self):
+        """ Return whether the selection is the whole series as upstream """
+        return self.start is None and self.end is None and self.limit is None and not self.fields \
+            and self.order == 'desc' and self.max_points is None and not self.summary and self.output == 'rows'
+
+    def rows(self, times):
+        """ Return the slice of the bars within start, end and limit
+
+        Keyword Arguments:
+            times:  the bar times as int64 seconds, sorted
+        """
+        first = 0 if self.start is None else int(np.searchsorted(times, self.start))
+        last = len(times) if self.end is None else int(np.searchsorted(times, self.end))
+        if self.limit is not None:
+            first = max(first, last - self.limit)
+        return slice(first, max(first, last))
+
+    def picks(self, fields):
+        """ Return the positions of the selected fields among fields, in
+        their order there. It raises ValueError for a field the series does
+        not have.
+        """
+        if not self.fields:
+            return list(range(len(fields)))
+        names = [field.lower() for field in fields]
+        short = [name.split('. ', 1)[-1] for name in names]
+        unknown = [name for name in self.fields if name not in names and name not in short]
+        if unknown:
+            raise ValueError('Unknown field %s; the series has %s' % (', '.join(map(repr, unknown)),
+                                                                      ', '.join(map(repr, fields))))
+        return [i for i in range(len(fields)) if names[i] in self.fields or short[i] in self.fields]
+
+    def _followed(self, fields, picks, names):
+        """ Return the position of the first of names among the selected
+        fields, or else of the first selected field.
+        """
+        short = [fields[i].split('. ', 1)[-1].lower() for i in picks]
+        return next((picks[short.index(name)] for name in names if name in short), picks[0])
+
+    def take(self, times, fields, column, meta_data):
+        """ Return (rows, picks, meta_data): the positions of the selected
+        bars, oldest first, and of the selected fields, and the meta data
+        with the downsampling recorded when there was one.
+
+        Keyword Arguments:
+            times:  the bar times as int64 seconds, sorted
+            fields:  the field names
+            column:  function of a field position and bar positions
+                returning the field's values at those bars
+            meta_data:  the meta data of the response
+        """
+        rows = np.arange(len(times))[self.rows(times)]
+        picks = self.picks(fields)
+        if self.max_points is not None and not self.summary and len(rows) > self.max_points and picks:
+            followed = self._followed(fields, picks, ('close',))
+            kept = rows[decimate(times[rows], column(followed, rows), self.max_points, self.downsample)]
+            meta_data = dict(meta_data or {})
+            meta_data['Downsampling'] = {'method': self.downsample, 'original points': len(rows),
+                                         'points': len(kept)}
+            rows = kept
+        return rows, picks, meta_data
+
+    def summarize(self, times, fields, column, rows, picks, stamp):
+        """ Return the summary statistics of the selected bars
+
+        Keyword Arguments:
+            times, fields, column:  as for take
+            rows, picks:  the selected bars and fields, from take
+            stamp:  function of a bar position returning its timestamp
+        """
+        if not picks:
+            return {'points': 0}
+        followed = self._followed(fields, picks, ('adjusted close', 'close'))
+        return dict({'field': fields[followed]},
+                    **summarize(times[rows], column(followed, rows), lambda i: stamp(int(rows[i]))))
+
+    def apply(self, data, meta_data):
+        """ Return the (data, meta_data) pair of the selected part of a time
+        series, given as a Frame, as the decoded data of a response keyed by
+        timestamp, or as a list of records with a 'date'.
+        """
+        if isinstance(data, Frame):
+            if self.everything:
+                return data.data(), meta_data
+            rows, picks, meta_data = self.take(data.times, data.fields, lambda i, rows: data.columns[i][rows],
+                                               meta_data)
+            if self.summary:
+                return self.summarize(data.times, data.fields, lambda i, rows: data.columns[i][rows], rows, picks,
+                                      lambda i: str(to_stamps(data.times[i:i + 1], data.unit)[0])), meta_data
+            frame = Frame(meta_data, data.data_key, data.times[rows], data.unit, [data.fields[i] for i in picks],
+                          [data.columns[i][rows] for i in picks], [data.decimals[i] for i in picks])
+            return frame.to_columns(self.order) if self.output == 'columns' else frame.data(self.order), meta_data
+        if self.everything or not isinstance(data, (dict, list)) or not data:
+            return data, meta_data
+        records = list(data.values()) if isinstance(data, dict) else data
+        try:
+            stamps = list(data) if isinstance(data, dict) else [record['date'] for record in records]
+            times = to_seconds(stamps)
+            fields = [name for name in records[0] if name != 'date']
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('The response is not a time series to select from') from None
+        order = np.argsort(times, kind='stable')
+
+        def column(i, rows):
+            return _floats(records[j].get(fields[i]) for j in order[rows])
+
+        rows, picks, meta_data = self.take(times[order], fields, column, meta_data)
+        if self.summary:
+            return self.summarize(times[order], fields, column, rows, picks, lambda i: stamps[order[i]]), meta_data
+        if self.order == 'desc':
+            rows = rows[::-1]
+        if self.output == 'columns':
+            columns = {'t': [stamps[i] for i in order[rows].tolist()]}
+            for i in picks:
+                # NaN, a missing value, is not a json number
+                values = column(i, rows).tolist()
+                columns[short_name(fields[i])] = [None if value != value else value for value in values]
+            return columns, meta_data
+        rows = order[rows]
+        names = [fields[i] for i in picks] if self.fields else None
+        if isinstance(data, dict):
+            return {stamps[i]: records[i] if names is None else {name: records[i][name] for name in names}
+                    for i in rows.tolist()}, meta_data
+        return [records[i] if names is None else dict({'date': stamps[i]}, **{name: records[i][name] for name in names})
+                for i in rows.tolist()], meta_data
+
+
+def _floats(values):
+    """ Return values given as strings as float64, NaN where not a number """
+    out = []
+    for value in values:
+        try:
+            out.append(float(value))
+        except (TypeError, ValueError):
+            out.append(np.nan)
+    return np.array(out, dtype=np.float64)
+
+
+_EVERYTHING = Selection()
+
+
+def select(data, meta_data, selection=None):
+    """ Return the (data, meta_data) pair of the part of a Frame's or a
+    response's time series a Selection picks, the whole of it, newest bar
+    first, without one.
+    """
+    return (selection or _EVERYTHING).apply(data, meta_data)
+
+
+def from_json(json_response):
+    """ Return a Frame of a decoded time series response, possibly without
+    any bars, or None when the response holds no time series or one of an
+    unexpected shape.
+
+    Keyword Arguments:
+        json_response:  the decoded body of the response
+    """
+    if not isinstance(json_response, dict):
+        return None
+    # Technical indicator responses are time series of the indicator's values
+    data_key = next((name for name in json_response if 'Time Series' in name or name.startswith('Technical Analysis')),
+                    None)
+    meta_data = json_response.get('Meta Data')
+    if data_key is None or not isinstance(meta_data, dict) or not isinstance(json_response[data_key], dict):
+        return None
+    data = json_response[data_key]
+    if not data:
+        return Frame(meta_data, data_key, np.empty(0, dtype=np.int64), 'D', (), [], ())
+    stamps = list(data)
+    rows = list(data.values())
+    unit = UNITS.get(len(stamps[0]))
+    try:
+        fields = tuple(rows[0])
+        flat = [value for row in rows for value in row.values()]
+        if unit is None or len(flat) != len(rows) * len(fields) or tuple(rows[-1]) != fields:
+            return None
+        values = np.array(flat, dtype=np.float64).reshape(len(rows), len(fields))
+        times = to_seconds(stamps)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return typed(meta_data, data_key, times, unit, fields, values, (list(rows[0].values()), list(rows[-1].values())))
+
+
+def typed(meta_data, data_key, times, unit, fields, values, samples):
+    """ Return a Frame of parsed bars, in any order
+
+    Keyword Arguments:
+        meta_data, data_key, unit, fields:  as for Frame
+        times:  the bar times as int64 seconds
+        values:  float64 array of one row per bar and one column per field
+        samples:  the values of two bars as upstream formatted them, from
+            which the decimals of each field are taken
+    """
+    # Upstream lists the newest bar first
+    order = np.argsort(times, kind='stable')
+    times, values = times[order], values[order]
+    columns, decimals = [], []
+    for i in range(len(fields)):
+        column = values[:, i]
+        places = max(_decimals(sample[i]) for sample in samples)
+        if not places and np.array_equal(column, np.trunc(column)):
+            column = column.astype(np.int64)
+        columns.append(np.ascontiguousarray(column))
+        decimals.append(places)
+    return Frame(meta_data, data_key, times, unit, fields, columns, decimals)
@@ -0,0 +1,85 @@
+"""Full-length daily series brought up to date with compact fetches.
+
+A full daily history runs to 20 years and over a megabyte, while from one
+day to the next only its last bar or two change. Once a full copy is held,
+an expired one is refreshed with the compact output (the last 100 bars)
+merged into it, and only fetched in full again when the two cannot be
+reconciled.
+"""
+import threading
+
+import numpy as np
+
+from .frames import Frame
+
+
+class HistoryStats(object):
+    """ Count full-length refreshes served by merging a compact fetch and
+    those that had to fetch the full series again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.merged = 0
+        self.refetched = 0
+
+    def record(self, merged):
+        with self._lock:
+            if merged:
+                self.merged += 1
+            else:
+                self.refetched += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'merged': self.merged, 'refetched': self.refetched}
+
+
+history_stats = HistoryStats()
+
+
+def compact_url(url):
+    """ Return the url of the compact output of a full-length request """
+    return url.replace('outputsize=full', 'outputsize=compact')
+
+
+def _adjusts(frame, rows):
+    """ Return whether any of the given bars carries a dividend or split,
+    which changes the adjusted values of every bar before it.
+    """
+    dividends, splits = frame.column('dividend amount'), frame.column('split coefficient')
+    return (dividends is not None and bool(np.any(dividends[rows] != 0))
+            or splits is not None and bool(np.any(splits[rows] != 1)))
+
+
+def merge(full, compact):
+    """ Return the full response Frame with the bars of the compact one
+    merged in, or None when they cannot be merged: the compact window does
+    not reach back into the full series, or a bar both hold other than the
+    full series' last changed, or a new bar adjusts the ones before it.
+
+    Keyword Arguments:
+        full:  the held full-length response
+        compact:  a compact response of the same request
+    """
+    if not isinstance(full, Frame) or not isinstance(compact, Frame):
+        return None
+    if full.data_key != compact.data_key or full.fields != compact.fields or not len(full) or not len(compact):
+        return None
+    start = int(np.searchsorted(full.times, compact.times[0]))
+    held = len(full) - start
+    # The compact window must hold exactly the full series' bars from its first one on
+    if held == 0 or held > len(compact) or not np.array_equal(full.times[start:], compact.times[:held]):
+        return None
+    # The last bar may have been fetched while still trading
+    for old, new in zip(full.columns, compact.columns):
+        if not np.array_equal(old[start:-1], new[:held - 1]):
+            return None
+    if _adjusts(compact, slice(held, None)):
+        return None
+    # Meta data comes from the newer response but for the output size
+    meta_data = {label: full.meta_data[label] if label.endswith('Output Size') and label in full.meta_data else item
+                 for label, item in compact.meta_data.items()}
+    return Frame(meta_data, full.data_key, np.concatenate((full.times[:start], compact.times)), full.unit,
+                 full.fields, [np.concatenate((old[:start], new)) for old, new in zip(full.columns, compact.columns)],
+                 map(max, full.decimals, compact.decimals))
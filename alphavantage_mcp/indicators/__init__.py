@@ -0,0 +1,367 @@
+"""Technical indicators computed locally from one cached price series.
+
+The indicator endpoints cost one upstream call each, even when they all
+derive from the same prices. Here the OHLCV series is loaded once through
+the shared client and every indicator is computed from it with NumPy,
+returning the (data, meta_data) pair in the endpoint's format.
+"""
+import zlib
+from collections import OrderedDict, namedtuple
+from operator import attrgetter
+
+import numpy as np
+
+from ..bars import load_bars
+from . import hilbert, momentum, moving, streaming, trend, volatility, volume
+from .moving import MaType
+
+# inputs names Bars fields, 'series' standing for the one chosen by series_type and
+# 'cycle' for its memoized hilbert.Cycle;
+# params holds (argument, meta data label, default) in the order of the upstream meta data
+Indicator = namedtuple('Indicator', 'title func inputs params outputs')
+
+_PERIOD = ('time_period', '5: Time Period', 20)
+_SERIES = ('series_type', '6: Series Type', 'close')
+_HLC = ('high', 'low', 'close')
+_MACD_PERIODS = (('fastperiod', '5.1: Fast Period', 12), ('slowperiod', '5.2: Slow Period', 26),
+                 ('signalperiod', '5.3: Signal Period', 9))
+_PRICE_OSCILLATOR = (('fastperiod', '5.1: Fast Period', 12), ('slowperiod', '5.2: Slow Period', 26),
+                     ('matype', '5.3: MA Type', MaType(0)), _SERIES)
+_CYCLE_SERIES = ('series_type', '5: Series Type', 'close')
+
+INDICATORS = {
+    'SMA': Indicator('Simple Moving Average (SMA)', moving.sma, ('series',), (_PERIOD, _SERIES), ('SMA',)),
+    'EMA': Indicator('Exponential Moving Average (EMA)', moving.ema, ('series',), (_PERIOD, _SERIES), ('EMA',)),
+    'WMA': Indicator('Weighted Moving Average (WMA)', moving.wma, ('series',), (_PERIOD, _SERIES), ('WMA',)),
+    'DEMA': Indicator('Double Exponential Moving Average (DEMA)', moving.dema, ('series',), (_PERIOD, _SERIES),
+                      ('DEMA',)),
+    'TEMA': Indicator('Triple Exponential Moving Average (TEMA)', moving.tema, ('series',), (_PERIOD, _SERIES),
+                      ('TEMA',)),
+    'TRIMA': Indicator('Triangular Moving Average (TRIMA)', moving.trima, ('series',), (_PERIOD, _SERIES),
+                       ('TRIMA',)),
+    'KAMA': Indicator('Kaufman Adaptive Moving Average (KAMA)', moving.kama, ('series',), (_PERIOD, _SERIES),
+                      ('KAMA',)),
+    'T3': Indicator('Triple Exponential Moving Average (T3)', moving.t3, ('series',),
+                    (_PERIOD, ('vfactor', '6: Volume Factor (vFactor)', 0.7),
+                     ('series_type', '7: Series Type', 'close')), ('T3',)),
+    'MAMA': Indicator('MESA Adaptive Moving Average (MAMA)', hilbert.mama, ('series',),
+                      (('fastlimit', '5.1: Fast Limit', 0.01), ('slowlimit', '5.2: Slow Limit', 0.01), _SERIES),
+                      ('MAMA', 'FAMA')),
+    'MACD': Indicator('Moving Average Convergence/Divergence (MACD)', momentum.macd, ('series',),
+                      _MACD_PERIODS + (_SERIES,), ('MACD', 'MACD_Hist', 'MACD_Signal')),
+    'MACDEXT': Indicator('MACD with Controllable Moving Average Type (MACDEXT)', momentum.macdext, ('series',),
+                         _MACD_PERIODS + (('fastmatype', '5.4: Fast MA Type', MaType(0)),
+                                          ('slowmatype', '5.5: Slow MA Type', MaType(0)),
+                                          ('signalmatype', '5.6: Signal MA Type', MaType(0)), _SERIES),
+                         ('MACD', 'MACD_Hist', 'MACD_Signal')),
+    'STOCH': Indicator('Stochastic (STOCH)', momentum.stoch, _HLC,
+                       (('fastkperiod', '5.1: FastK Period', 5), ('slowkperiod', '5.2: SlowK Period', 3),
+                        ('slowkmatype', '5.3: SlowK MA Type', MaType(0)), ('slowdperiod', '5.4: SlowD Period', 3),
+                        ('slowdmatype', '5.5: SlowD MA Type', MaType(0))),
+                       ('SlowK', 'SlowD')),
+    'STOCHF': Indicator('Stochastic Fast (STOCHF)', momentum.stochf, _HLC,
+                        (('fastkperiod', '5.1: FastK Period', 5), ('fastdperiod', '5.2: FastD Period', 3),
+                         ('fastdmatype', '5.3: FastD MA Type', MaType(0))),
+                        ('FastK', 'FastD')),
+    'RSI': Indicator('Relative Strength Index (RSI)', momentum.rsi, ('series',), (_PERIOD, _SERIES), ('RSI',)),
+    'STOCHRSI': Indicator('Stochastic Relative Strength Index (STOCHRSI)', momentum.stochrsi, ('series',),
+                          (_PERIOD, ('fastkperiod', '6.1: FastK Period', 5), ('fastdperiod', '6.2: FastD Period', 3),
+                           ('fastdmatype', '6.3: FastD MA Type', MaType(0)),
+                           ('series_type', '7: Series Type', 'close')),
+                          ('FastK', 'FastD')),
+    'WILLR': Indicator("Williams' %R (WILLR)", momentum.willr, _HLC, (_PERIOD,), ('WILLR',)),
+    'APO': Indicator('Absolute Price Oscillator (APO)', momentum.apo, ('series',), _PRICE_OSCILLATOR, ('APO',)),
+    'PPO': Indicator('Percentage Price Oscillator (PPO)', momentum.ppo, ('series',), _PRICE_OSCILLATOR, ('PPO',)),
+    'MOM': Indicator('Momentum (MOM)', momentum.mom, ('series',), (_PERIOD, _SERIES), ('MOM',)),
+    'BOP': Indicator('Balance Of Power (BOP)', momentum.bop, ('open',) + _HLC, (), ('BOP',)),
+    'CCI': Indicator('Commodity Channel Index (CCI)', momentum.cci, _HLC, (_PERIOD,), ('CCI',)),
+    'CMO': Indicator('Chande Momentum Oscillator (CMO)', momentum.cmo, ('series',), (_PERIOD, _SERIES), ('CMO',)),
+    'ROC': Indicator('Rate of change : ((price/prevPrice)-1)*100', momentum.roc, ('series',), (_PERIOD, _SERIES),
+                     ('ROC',)),
+    'ROCR': Indicator('Rate of change ratio: (price/prevPrice)', momentum.rocr, ('series',), (_PERIOD, _SERIES),
+                      ('ROCR',)),
+    'MFI': Indicator('Money Flow Index (MFI)', momentum.mfi, _HLC + ('volume',), (_PERIOD,), ('MFI',)),
+    'ULTOSC': Indicator('Ultimate Oscillator (ULTOSC)', momentum.ultosc, _HLC,
+                        (('timeperiod1', '5.1: Time Period 1', 7), ('timeperiod2', '5.2: Time Period 2', 14),
+                         ('timeperiod3', '5.3: Time Period 3', 28)),
+                        ('ULTOSC',)),
+    'BBANDS': Indicator('Bollinger Bands (BBANDS)', volatility.bbands, ('series',),
+                        (_PERIOD, ('nbdevup', '6.1: Deviation multiplier for upper band', 2.0),
+                         ('nbdevdn', '6.2: Deviation multiplier for lower band', 2.0),
+                         ('matype', '6.3: MA Type', MaType(0)), ('series_type', '7: Series Type', 'close')),
+                        ('Real Upper Band', 'Real Middle Band', 'Real Lower Band')),
+    'TRANGE': Indicator('True Range (TRANGE)', volatility.trange, _HLC, (), ('TRANGE',)),
+    'ATR': Indicator('Average True Range (ATR)', volatility.atr, _HLC, (_PERIOD,), ('ATR',)),
+    'NATR': Indicator('Normalized Average True Range (NATR)', volatility.natr, _HLC, (_PERIOD,), ('NATR',)),
+    'PLUS_DM': Indicator('Plus Directional Movement (PLUS_DM)', trend.plus_dm, ('high', 'low'), (_PERIOD,),
+                         ('PLUS_DM',)),
+    'MINUS_DM': Indicator('Minus Directional Movement (MINUS_DM)', trend.minus_dm, ('high', 'low'), (_PERIOD,),
+                          ('MINUS_DM',)),
+    'PLUS_DI': Indicator('Plus Directional Indicator (PLUS_DI)', trend.plus_di, _HLC, (_PERIOD,), ('PLUS_DI',)),
+    'MINUS_DI': Indicator('Minus Directional Indicator (MINUS_DI)', trend.minus_di, _HLC, (_PERIOD,), ('MINUS_DI',)),
+    'DX': Indicator('Directional Movement Index (DX)', trend.dx, _HLC, (_PERIOD,), ('DX',)),
+    'ADX': Indicator('Average Directional Movement Index (ADX)', trend.adx, _HLC, (_PERIOD,), ('ADX',)),
+    'ADXR': Indicator('Average Directional Movement Index Rating (ADXR)', trend.adxr, _HLC, (_PERIOD,), ('ADXR',)),
+    'SAR': Indicator('Parabolic SAR (SAR)', trend.sar, ('high', 'low'),
+                     (('acceleration', '5.1: Acceleration', 0.01), ('maximum', '5.2: Maximum', 0.2)), ('SAR',)),
+    'AROON': Indicator('Aroon (AROON)', trend.aroon, ('high', 'low'), (_PERIOD,), ('Aroon Down', 'Aroon Up')),
+    'AROONOSC': Indicator('Aroon Oscillator (AROONOSC)', trend.aroonosc, ('high', 'low'), (_PERIOD,),
+                          ('AROONOSC',)),
+    'AD': Indicator('Chaikin A/D Line', volume.ad, _HLC + ('volume',), (), ('Chaikin A/D',)),
+    'ADOSC': Indicator('Chaikin A/D Oscillator (ADOSC)', volume.adosc, _HLC + ('volume',),
+                       (('fastperiod', '5.1: FastK Period', 3), ('slowperiod', '5.2: SlowK Period', 10)), ('ADOSC',)),
+    'OBV': Indicator('On Balance Volume (OBV)', volume.obv, ('close', 'volume'), (), ('OBV',)),
+    'HT_TRENDLINE': Indicator('Hilbert Transform, Instantaneous Trendline (HT_TRENDLINE)', attrgetter('trendline'),
+                              ('cycle',), (_CYCLE_SERIES,), ('HT_TRENDLINE',)),
+    'HT_SINE': Indicator('Hilbert Transform, Sine Wave (HT_SINE)', attrgetter('lead_sine', 'sine'), ('cycle',),
+                         (_CYCLE_SERIES,), ('LEAD SINE', 'SINE')),
+    'HT_TRENDMODE': Indicator('Hilbert Transform, Trend vs Cycle Mode (HT_TRENDMODE)', attrgetter('trendmode'),
+                              ('cycle',), (_CYCLE_SERIES,), ('TRENDMODE',)),
+    'HT_DCPERIOD': Indicator('Hilbert Transform, Dominant Cycle Period (HT_DCPERIOD)', attrgetter('dcperiod'),
+                             ('cycle',), (_CYCLE_SERIES,), ('DCPERIOD',)),
+    'HT_DCPHASE': Indicator('Hilbert Transform, Dominant Cycle Phase (HT_DCPHASE)', attrgetter('dcphase'),
+                            ('cycle',), (_CYCLE_SERIES,), ('HT_DCPHASE',)),
+    'HT_PHASOR': Indicator('Hilbert Transform, Phasor Components (HT_PHASOR)',
+                           attrgetter('in_phase', 'quadrature'), ('cycle',), (_CYCLE_SERIES,),
+                           ('PHASE', 'QUADRATURE')),
+}
+
+CYCLE_MEMO_SIZE = 32
+
+# hilbert.Cycle by (symbol, interval, month, last bar, series_type, crc32 of the series),
+# least recently used first
+_cycles = OrderedDict()
+
+
+def _cycle(bars, series_type, key):
+    """ Return the Hilbert transform cycle of the series, computing it only
+    when no indicator has been asked of the same series yet. The checksum of
+    the values tells a revised bar, such as the last one while its session
+    trades, from the one the cycle was computed from.
+    """
+    series = bars.series(series_type)
+    key = key + (series_type, zlib.crc32(np.ascontiguousarray(series)))
+    cycle = _cycles.pop(key, None)
+    if cycle is None:
+        cycle = hilbert.cycle(series)
+    _cycles[key] = cycle
+    if len(_cycles) > CYCLE_MEMO_SIZE:
+        _cycles.popitem(last=False)
+    return cycle
+
+
+def _arguments(indicator, params):
+    """ Return the indicator's arguments with defaults filled in and values
+    coerced to the type of their default.
+    """
+    values = {}
+    for name, _, default in indicator.params:
+        value = params.get(name)
+        values[name] = default if value is None else type(default)(value)
+    return values
+
+
+def _meta_data(indicator, bars, symbol, interval, values):
+    meta_data = {
+        '1: Symbol': symbol,
+        '2: Indicator': indicator.title,
+        '3: Last Refreshed': str(bars.index[-1]) if len(bars) else None,
+        '4: Interval': interval,
+    }
+    number = 5
+    for name, label, _ in indicator.params:
+        meta_data[label] = values[name]
+        number = int(label.split(':')[0].split('.')[0]) + 1
+    meta_data['%d: Time Zone' % number] = bars.time_zone
+    return meta_data
+
+
+def _data(bars, outputs, rows, names, order='desc', output='rows'):
+    """ Return the upstream data object of the outputs named at the given
+    bars, newest bar first or with order 'asc' oldest first, values with
+    four decimals; with output 'columns' the compact columns instead.
+    """
+    if order == 'desc':
+        rows = rows[::-1]
+    index = bars.index[rows].tolist()
+    if output == 'columns':
+        return dict({'t': index}, **{name: np.round(outputs[name][rows], 4).tolist() for name in names})
+    columns = {name: np.char.mod('%.4f', outputs[name][rows]).tolist() for name in names}
+    return {stamp: {name: column[i] for name, column in columns.items()} for i, stamp in enumerate(index)}
+
+
+def _outputs(indicator, bars, values, key):
+    """ Return the indicator's output arrays by name, key identifying the
+    series for the memoized Hilbert transform cycle.
+    """
+    inputs = []
+    for name in indicator.inputs:
+        if name == 'series':
+            inputs.append(bars.series(values['series_type']))
+        elif name == 'cycle':
+            inputs.append(_cycle(bars, values['series_type'], key))
+        else:
+            inputs.append(getattr(bars, name))
+    result = indicator.func(*inputs, **{name: value for name, value in values.items() if name != 'series_type'})
+    if not isinstance(result, tuple):
+        result = (result,)
+    return dict(zip(indicator.outputs, result))
+
+
+def _series_key(bars, symbol, interval, month):
+    return symbol.upper(), interval, month, str(bars.index[-1]) if len(bars) else None
+
+
+async def compute_local(function, symbol, interval='daily', month=None, entitlement=None, selection=None, **params):
+    """ Return an indicator computed from the cached price series as the
+    (data, meta_data) pair the upstream endpoint returns.
+
+    Keyword Arguments:
+        function:  the upstream function name, e.g. 'SMA'
+        symbol:  the symbol for the equity we want to get its data
+        interval:  time interval between two consecutive values (default 'daily')
+        month:  YYYY-MM month of intraday data (default None)
+        entitlement:  'realtime' or 'delayed' for intraday data
+        selection:  the Selection of bars and outputs to return (default None)
+        params:  the indicator's arguments; missing or None ones take the
+            upstream defaults
+    """
+    indicator = INDICATORS.get(function)
+    if indicator is None:
+        raise ValueError('%s cannot be computed locally' % (function,))
+    values = _arguments(indicator, params)
+    bars = await load_bars(symbol, interval, month=month, entitlement=entitlement)
+    outputs = _outputs(indicator, bars, values, _series_key(bars, symbol, interval, month))
+    meta_data = _meta_data(indicator, bars, symbol, interval, values)
+    names = list(outputs)
+    # Bars still inside any output's warm-up are left out
+    rows = np.flatnonzero(~np.any(np.isnan(np.column_stack(list(outputs.values()))), axis=1))
+    if selection is None:
+        return _data(bars, outputs, rows, names), meta_data
+    # The selection is made before anything is formatted
+    times = bars.times[rows]
+
+    def column(i, taken):
+        return outputs[names[i]][rows[taken]]
+
+    taken, picks, meta_data = selection.take(times, names, column, meta_data)
+    if selection.summary:
+        return selection.summarize(times, names, column, taken, picks, lambda i: str(bars.index[rows[i]])), meta_data
+    return _data(bars, outputs, rows[taken], [names[i] for i in picks], selection.order, selection.output), meta_data
+
+
+def _columns(index, columns):
+    """ Return the columnar data object: the bars where any column has a
+    value, newest first, and each column's values on them with four
+    decimals, None where NaN.
+    """
+    table = np.column_stack(list(columns.values()))
+    missing = np.isnan(table)
+    rows = ~np.all(missing, axis=1)
+    table = np.round(table[rows][::-1], 4).astype(object)
+    table[missing[rows][::-1]] = None
+    return {
+        'index': index[rows][::-1].tolist(),
+        'columns': {name: table[:, i].tolist() for i, name in enumerate(columns)},
+    }
+
+
+def _spec(spec):
+    """ Return the (label, function, arguments) of one get_indicators spec:
+    either a function name or a dict with 'function', an optional 'name'
+    and the indicator's arguments.
+    """
+    if isinstance(spec, str):
+        spec = {'function': spec}
+    spec = dict(spec)
+    function = str(spec.pop('function', '')).upper()
+    indicator = INDICATORS.get(function)
+    if indicator is None:
+        raise ValueError('%r cannot be computed locally' % (function or spec,))
+    label = spec.pop('name', None)
+    unknown = set(spec) - {name for name, _, _ in indicator.params}
+    if unknown:
+        raise ValueError('%s takes no argument %s' % (function, ', '.join(sorted(unknown))))
+    if label is None:
+        label = '_'.join([function] + [str(value) for value in spec.values() if value is not None])
+    return label, function, _arguments(indicator, spec)
+
+
+async def compute_many(symbol, specs, interval='daily', month=None, entitlement=None):
+    """ Return several indicators of one price series, all computed from a
+    single load of it, as a (data, meta_data) pair. data holds the shared
+    'index' of timestamps, newest first, and one list of values per output
+    in 'columns', None where an indicator is still warming up.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        specs:  the indicators, each a function name such as 'RSI' or a dict
+            such as {'function': 'SMA', 'time_period': 50, 'name': 'SMA50'};
+            columns are named after 'name', which defaults to the function
+            and the given argument values, suffixed with '.<output>' for
+            indicators with several outputs
+        interval:  time interval between two consecutive values (default 'daily')
+        month:  YYYY-MM month of intraday data (default None)
+        entitlement:  'realtime' or 'delayed' for intraday data
+    """
+    specs = [_spec(spec) for spec in specs]
+    labels = [label for label, _, _ in specs]
+    if not specs or len(set(labels)) < len(labels):
+        raise ValueError('specs must name at least one indicator, each under its own name')
+    bars = await load_bars(symbol, interval, month=month, entitlement=entitlement)
+    key = _series_key(bars, symbol, interval, month)
+    columns = {}
+    for label, function, values in specs:
+        outputs = _outputs(INDICATORS[function], bars, values, key)
+        for output, array in outputs.items():
+            columns[label if len(outputs) == 1 else '%s.%s' % (label, output)] = array
+    meta_data = {
+        '1: Symbol': symbol,
+        '2: Indicators': {label: dict(values, function=function) for label, function, values in specs},
+        '3: Last Refreshed': str(bars.index[-1]) if len(bars) else None,
+        '4: Interval': interval,
+        '5: Time Zone': bars.time_zone,
+    }
+    return _columns(bars.index, columns), meta_data
+
+
+async def compute_updates(symbol, specs, interval='daily', since=None, entitlement=None):
+    """ Return streamed indicators of one symbol for the bars after since,
+    as compute_many does, advancing each indicator's state only over the
+    bars it has not seen yet.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        specs:  the indicators, as for compute_many, each one of
+            streaming.STREAMS
+        interval:  time interval between two consecutive values (default 'daily')
+        since:  timestamp of the last bar the caller has; by default only
+            the latest bar is returned
+        entitlement:  'realtime' or 'delayed' for intraday data
+    """
+    specs = [_spec(spec) for spec in specs]
+    labels = [label for label, _, _ in specs]
+    if not specs or len(set(labels)) < len(labels):
+        raise ValueError('specs must name at least one indicator, each under its own name')
+    for _, function, _ in specs:
+        if function not in streaming.STREAMS:
+            raise ValueError('%s cannot be streamed, only %s' % (function, ', '.join(streaming.STREAMS)))
+    bars = await load_bars(symbol, interval, entitlement=entitlement)
+    if len(bars) < 2:
+        raise ValueError('%s has too few %s bars to stream' % (symbol, interval))
+    start = int(np.searchsorted(bars.index, since, side='right')) if since else len(bars) - 1
+    columns = {}
+    for label, function, values in specs:
+        args = {name: value for name, value in values.items() if name != 'series_type'}
+        key = (symbol.upper(), interval, function, values['series_type'], sorted(args.items()))
+        outputs = await streaming.advance(key, function, args, bars.index, bars.series(values['series_type']), start)
+        for output, array in zip(INDICATORS[function].outputs, outputs):
+            columns[label if len(outputs) == 1 else '%s.%s' % (label, output)] = array
+    meta_data = {
+        '1: Symbol': symbol,
+        '2: Indicators': {label: dict(values, function=function) for label, function, values in specs},
+        '3: Last Refreshed': str(bars.index[-1]),
+        '4: Interval': interval,
+        '5: Time Zone': bars.time_zone,
+    }
+    return _columns(bars.index[start:], columns), meta_data
@@ -0,0 +1,28 @@
+"""Array helpers shared by the indicator modules."""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def first_valid(x):
+    """ Return the index of the first non-NaN value, len(x) when there is none """
+    valid = np.flatnonzero(~np.isnan(x))
+    return int(valid[0]) if len(valid) else len(x)
+
+
+def empty(x):
+    """ Return an all-NaN array as long as x """
+    return np.full(len(x), np.nan)
+
+
+def ratio(numerator, denominator, scale=1.0):
+    """ Return scale * numerator / denominator, 0 where the denominator is 0 """
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out * scale
+
+
+def windows(x, time_period):
+    """ Return the trailing windows of time_period values ending at each bar
+    from time_period - 1 on, together with that first bar's index.
+    """
+    return sliding_window_view(x, time_period), time_period - 1
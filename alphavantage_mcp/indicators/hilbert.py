@@ -0,0 +1,212 @@
+"""Indicators built on Ehlers' Hilbert transform, stepped bar by bar the
+way TA-Lib does, including its separate state for odd and even bars.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .arrays import empty, first_valid
+
+_RAD_TO_DEG = 180.0 / math.pi
+_PERIOD_LOOKBACK = 32
+_PHASE_LOOKBACK = 63
+_PHASE_TABLES = {}
+
+# The cycle indicators, each a float array (trendmode holds 0 or 1)
+Cycle = namedtuple('Cycle', 'trendline sine lead_sine trendmode dcperiod dcphase in_phase quadrature')
+
+
+class _Transform(object):
+    """ One Hilbert transform FIR, with the odd/even bar bookkeeping """
+
+    def __init__(self):
+        self.taps = ([0.0] * 3, [0.0] * 3)
+        self.prev = [0.0, 0.0]
+        self.prev_input = [0.0, 0.0]
+
+    def __call__(self, value, index, odd, adjusted_period):
+        scaled = 0.0962 * value
+        taps = self.taps[odd]
+        result = scaled - taps[index]
+        taps[index] = scaled
+        result -= self.prev[odd]
+        self.prev[odd] = 0.5769 * self.prev_input[odd]
+        result += self.prev[odd]
+        self.prev_input[odd] = value
+        return result * adjusted_period
+
+
+class _Smoother(object):
+    """ Rolling 4-bar weighted average of the price, primed on 3 bars """
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.trailing_index = 0
+        self.trailing = 0.0
+        self.sub = prices[0] + prices[1] + prices[2]
+        self.sum = prices[0] + 2 * prices[1] + 3 * prices[2]
+
+    def __call__(self, price):
+        self.sub += price - self.trailing
+        self.sum += 4 * price
+        self.trailing = self.prices[self.trailing_index]
+        self.trailing_index += 1
+        smoothed = self.sum * 0.1
+        self.sum -= self.sub
+        return smoothed
+
+
+def _transform(prices, warmup):
+    """ Yield (today, smoothed price, in-phase, quadrature, period) for each
+    bar after the first 3 + warmup, which only prime the price smoother.
+    """
+    smooth = _Smoother(prices)
+    for today in range(3, 3 + warmup):
+        smooth(prices[today])
+    detrender, q1, ji, jq = _Transform(), _Transform(), _Transform(), _Transform()
+    hilbert_index = 0
+    period = prev_i2 = prev_q2 = re = im = 0.0
+    i1_odd_prev3 = i1_even_prev3 = i1_odd_prev2 = i1_even_prev2 = 0.0
+    for today in range(3 + warmup, len(prices)):
+        adjusted = 0.075 * period + 0.54
+        smoothed = smooth(prices[today])
+        odd = today % 2
+        detrended = detrender(smoothed, hilbert_index, odd, adjusted)
+        q1_value = q1(detrended, hilbert_index, odd, adjusted)
+        if odd:
+            in_phase = i1_odd_prev3
+            ji_value = ji(i1_odd_prev3, hilbert_index, odd, adjusted)
+            jq_value = jq(q1_value, hilbert_index, odd, adjusted)
+            i1_even_prev3, i1_even_prev2 = i1_even_prev2, detrended
+        else:
+            in_phase = i1_even_prev3
+            ji_value = ji(i1_even_prev3, hilbert_index, odd, adjusted)
+            jq_value = jq(q1_value, hilbert_index, odd, adjusted)
+            hilbert_index = (hilbert_index + 1) % 3
+            i1_odd_prev3, i1_odd_prev2 = i1_odd_prev2, detrended
+        q2 = 0.2 * (q1_value + ji_value) + 0.8 * prev_q2
+        i2 = 0.2 * (in_phase - jq_value) + 0.8 * prev_i2
+        re = 0.2 * (i2 * prev_i2 + q2 * prev_q2) + 0.8 * re
+        im = 0.2 * (i2 * prev_q2 - q2 * prev_i2) + 0.8 * im
+        prev_q2, prev_i2 = q2, i2
+        previous = period
+        if im != 0.0 and re != 0.0:
+            period = 360.0 / (math.atan(im / re) * _RAD_TO_DEG)
+        period = min(max(period, 0.67 * previous), 1.5 * previous)
+        period = min(max(period, 6.0), 50.0)
+        period = 0.2 * period + 0.8 * previous
+        yield today, smoothed, in_phase, q1_value, period
+
+
+def mama(x, fastlimit=0.5, slowlimit=0.05):
+    """ Return the MESA adaptive moving average and its following average
+    (MAMA, FAMA). The first 32 bars are warm-up.
+    """
+    mama_out = empty(x)
+    fama_out = empty(x)
+    offset = first_valid(x)
+    lookback = 32
+    prices = x[offset:].tolist()
+    if len(prices) <= lookback:
+        return mama_out, fama_out
+    mama_value = fama_value = prev_phase = 0.0
+    for today, _, in_phase, quadrature, _ in _transform(prices, 9):
+        phase = math.atan(quadrature / in_phase) * _RAD_TO_DEG if in_phase != 0.0 else 0.0
+        delta_phase, prev_phase = max(prev_phase - phase, 1.0), phase
+        alpha = max(fastlimit / delta_phase, slowlimit) if delta_phase > 1.0 else fastlimit
+        price = prices[today]
+        mama_value = alpha * price + (1 - alpha) * mama_value
+        fama_value = 0.5 * alpha * mama_value + (1 - 0.5 * alpha) * fama_value
+        if today >= lookback:
+            mama_out[offset + today] = mama_value
+            fama_out[offset + today] = fama_value
+    return mama_out, fama_out
+
+
+def _phase_table(cycle_period):
+    """ Return the sines and cosines of cycle_period equal steps round the
+    circle, computed once per whole period.
+    """
+    table = _PHASE_TABLES.get(cycle_period)
+    if table is None:
+        angles = [i * 2 * math.pi / cycle_period for i in range(cycle_period)]
+        table = _PHASE_TABLES[cycle_period] = ([math.sin(a) for a in angles], [math.cos(a) for a in angles])
+    return table
+
+
+def cycle(x):
+    """ Return every Hilbert transform cycle indicator of x as a Cycle.
+
+    TA-Lib primes the price smoother on 9 bars for the dominant cycle period
+    and the phasor (32 bars of warm-up) but on 34 bars for the indicators
+    built on the dominant cycle phase (63 bars of warm-up), so the transform
+    steps through both; the phase and trend computations run once.
+    """
+    outputs = Cycle(*(empty(x) for _ in Cycle._fields))
+    offset = first_valid(x)
+    prices = x[offset:].tolist()
+    if len(prices) <= _PERIOD_LOOKBACK:
+        return outputs
+    smooth_period = 0.0
+    for today, _, in_phase, quadrature, period in _transform(prices, 9):
+        smooth_period = 0.33 * period + 0.67 * smooth_period
+        if today >= _PERIOD_LOOKBACK:
+            outputs.dcperiod[offset + today] = smooth_period
+            outputs.in_phase[offset + today] = in_phase
+            outputs.quadrature[offset + today] = quadrature
+    if len(prices) <= _PHASE_LOOKBACK:
+        return outputs
+    sums = np.concatenate(([0.0], np.cumsum(prices))).tolist()
+    smoothed_prices = []
+    smooth_period = phase = sine = lead_sine = 0.0
+    trends = [0.0, 0.0, 0.0]
+    days_in_trend = 0
+    for today, smoothed, _, _, period in _transform(prices, 34):
+        smoothed_prices.append(smoothed)
+        smooth_period = 0.33 * period + 0.67 * smooth_period
+        cycle_period = int(smooth_period + 0.5)
+        sines, cosines = _phase_table(cycle_period)
+        recent = smoothed_prices[:-cycle_period - 1:-1]
+        real = sum(s * p for s, p in zip(sines, recent))
+        imaginary = sum(c * p for c, p in zip(cosines, recent))
+        prev_phase = phase
+        if imaginary != 0.0:
+            phase = math.atan(real / imaginary) * _RAD_TO_DEG
+        elif real < 0.0:
+            phase -= 90.0
+        elif real > 0.0:
+            phase += 90.0
+        # The second term makes up for the one bar lag of the price smoother
+        phase += 90.0 + 360.0 / smooth_period
+        if imaginary < 0.0:
+            phase += 180.0
+        if phase > 315.0:
+            phase -= 360.0
+        prev_sine, prev_lead_sine = sine, lead_sine
+        sine = math.sin(phase / _RAD_TO_DEG)
+        lead_sine = math.sin((phase + 45.0) / _RAD_TO_DEG)
+        average = (sums[today + 1] - sums[max(today + 1 - cycle_period, 0)]) / cycle_period if cycle_period else 0.0
+        trendline = (4.0 * average + 3.0 * trends[0] + 2.0 * trends[1] + trends[2]) / 10.0
+        trends = [average] + trends[:2]
+        trend = 1.0
+        if sine > lead_sine and prev_sine <= prev_lead_sine or sine < lead_sine and prev_sine >= prev_lead_sine:
+            days_in_trend = 0
+            trend = 0.0
+        days_in_trend += 1
+        if days_in_trend < 0.5 * smooth_period:
+            trend = 0.0
+        # A phase advancing at about the cycle's own rate means the market is cycling
+        change = phase - prev_phase
+        if smooth_period != 0.0 and 0.67 * 360.0 / smooth_period < change < 1.5 * 360.0 / smooth_period:
+            trend = 0.0
+        if trendline != 0.0 and abs((smoothed - trendline) / trendline) >= 0.015:
+            trend = 1.0
+        if today >= _PHASE_LOOKBACK:
+            at = offset + today
+            outputs.trendline[at] = trendline
+            outputs.sine[at] = sine
+            outputs.lead_sine[at] = lead_sine
+            outputs.trendmode[at] = trend
+            outputs.dcphase[at] = phase
+    return outputs
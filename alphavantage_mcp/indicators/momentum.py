@@ -0,0 +1,188 @@
+"""Oscillators and momentum indicators, following TA-Lib's definitions.
+
+Like the moving averages they take and return float arrays of equal
+length, with NaN over the warm-up bars.
+"""
+import numpy as np
+
+from .arrays import empty, first_valid, ratio, windows
+from .moving import ema, lagged_average, ma_lookback, moving_average
+
+
+def wilder_moves(x, time_period):
+    """ Return the up and down moves of x, each smoothed with Wilder's
+    average seeded by the simple mean of the first time_period moves.
+    """
+    start = first_valid(x)
+    gains, losses = empty(x), empty(x)
+    moves = np.diff(x[start:])
+    gains[start + 1:] = np.maximum(moves, 0)
+    losses[start + 1:] = np.maximum(-moves, 0)
+    return ema(gains, time_period, 1.0 / time_period), ema(losses, time_period, 1.0 / time_period)
+
+
+def rsi(x, time_period):
+    gain, loss = wilder_moves(x, time_period)
+    return ratio(gain, gain + loss, 100.0)
+
+
+def cmo(x, time_period):
+    gain, loss = wilder_moves(x, time_period)
+    return ratio(gain - loss, gain + loss, 100.0)
+
+
+def mom(x, time_period):
+    out = empty(x)
+    out[time_period:] = x[time_period:] - x[:-time_period]
+    return out
+
+
+def roc(x, time_period):
+    out = empty(x)
+    out[time_period:] = ratio(x[time_period:], x[:-time_period], 100.0) - 100.0 * (x[:-time_period] != 0)
+    return out
+
+
+def rocr(x, time_period):
+    out = empty(x)
+    out[time_period:] = ratio(x[time_period:], x[:-time_period])
+    return out
+
+
+def _fast_k(high, low, close, time_period):
+    """ Return the position of the close within the high-low range of the
+    last time_period bars, in percent.
+    """
+    out = empty(close)
+    start = max(first_valid(high), first_valid(low), first_valid(close))
+    if len(close) - start < time_period:
+        return out
+    highs, first = windows(high[start:], time_period)
+    lows, _ = windows(low[start:], time_period)
+    highest, lowest = highs.max(axis=1), lows.min(axis=1)
+    out[start + first:] = ratio(close[start + first:] - lowest, highest - lowest, 100.0)
+    return out
+
+
+def stochf(high, low, close, fastkperiod=5, fastdperiod=3, fastdmatype=0):
+    fast_k = _fast_k(high, low, close, fastkperiod)
+    fast_d = moving_average(fast_k, fastdperiod, fastdmatype)
+    fast_k[np.isnan(fast_d)] = np.nan
+    return fast_k, fast_d
+
+
+def stoch(high, low, close, fastkperiod=5, slowkperiod=3, slowkmatype=0, slowdperiod=3, slowdmatype=0):
+    slow_k = moving_average(_fast_k(high, low, close, fastkperiod), slowkperiod, slowkmatype)
+    slow_d = moving_average(slow_k, slowdperiod, slowdmatype)
+    slow_k[np.isnan(slow_d)] = np.nan
+    return slow_k, slow_d
+
+
+def stochrsi(x, time_period, fastkperiod=5, fastdperiod=3, fastdmatype=0):
+    values = rsi(x, time_period)
+    return stochf(values, values, values, fastkperiod, fastdperiod, fastdmatype)
+
+
+def willr(high, low, close, time_period):
+    out = empty(close)
+    if len(close) < time_period:
+        return out
+    highs, first = windows(high, time_period)
+    lows, _ = windows(low, time_period)
+    highest, lowest = highs.max(axis=1), lows.min(axis=1)
+    out[first:] = ratio(highest - close[first:], highest - lowest, -100.0)
+    return out
+
+
+def cci(high, low, close, time_period):
+    out = empty(close)
+    if len(close) < time_period:
+        return out
+    typical, first = windows((high + low + close) / 3, time_period)
+    average = typical.mean(axis=1)
+    deviation = np.abs(typical - average[:, None]).mean(axis=1)
+    out[first:] = ratio(typical[:, -1] - average, 0.015 * deviation)
+    return out
+
+
+def mfi(high, low, close, volume, time_period):
+    out = empty(close)
+    if len(close) <= time_period:
+        return out
+    typical = (high + low + close) / 3
+    flow = typical[1:] * volume[1:]
+    change = np.diff(typical)
+    positive = np.cumsum(np.concatenate(([0.0], np.where(change > 0, flow, 0.0))))
+    negative = np.cumsum(np.concatenate(([0.0], np.where(change < 0, flow, 0.0))))
+    positive = positive[time_period:] - positive[:-time_period]
+    negative = negative[time_period:] - negative[:-time_period]
+    total = positive + negative
+    # Below one unit of money flow the ratio is noise
+    out[time_period:] = ratio(positive, np.where(total < 1, 0.0, total), 100.0)
+    return out
+
+
+def ultosc(high, low, close, timeperiod1=7, timeperiod2=14, timeperiod3=28):
+    out = empty(close)
+    periods = sorted((timeperiod1, timeperiod2, timeperiod3))
+    longest = periods[-1]
+    if len(close) <= longest:
+        return out
+    previous = close[:-1]
+    true_low = np.minimum(low[1:], previous)
+    buying = np.cumsum(np.concatenate(([0.0], close[1:] - true_low)))
+    ranges = np.cumsum(np.concatenate(([0.0], np.maximum(high[1:], previous) - true_low)))
+    total = np.zeros(len(close) - longest)
+    for weight, period in zip((4, 2, 1), periods):
+        pressure = buying[longest:] - buying[longest - period:-period]
+        true_range = ranges[longest:] - ranges[longest - period:-period]
+        total += weight * ratio(pressure, true_range)
+    out[longest:] = 100.0 * total / 7
+    return out
+
+
+def bop(open, high, low, close):
+    spread = high - low
+    return ratio(close - open, np.where(spread < 1e-14, 0.0, spread))
+
+
+def _price_averages(x, fastperiod, slowperiod, matype):
+    if slowperiod < fastperiod:
+        fastperiod, slowperiod = slowperiod, fastperiod
+    return moving_average(x, fastperiod, matype), moving_average(x, slowperiod, matype)
+
+
+def apo(x, fastperiod=12, slowperiod=26, matype=0):
+    fast, slow = _price_averages(x, fastperiod, slowperiod, matype)
+    return fast - slow
+
+
+def ppo(x, fastperiod=12, slowperiod=26, matype=0):
+    fast, slow = _price_averages(x, fastperiod, slowperiod, matype)
+    return ratio(fast - slow, slow, 100.0)
+
+
+def macd_averages(x, fastperiod=12, fastmatype=0, slowperiod=26, slowmatype=0):
+    """ Return the fast and slow moving averages whose difference is the
+    MACD line, both starting where the longer one does.
+    """
+    if slowperiod < fastperiod:
+        fastperiod, slowperiod = slowperiod, fastperiod
+        fastmatype, slowmatype = slowmatype, fastmatype
+    lookback = max(ma_lookback(fastperiod, fastmatype), ma_lookback(slowperiod, slowmatype))
+    return lagged_average(x, fastperiod, fastmatype, lookback), lagged_average(x, slowperiod, slowmatype, lookback)
+
+
+def macdext(x, fastperiod=12, fastmatype=0, slowperiod=26, slowmatype=0, signalperiod=9, signalmatype=0):
+    """ Return (MACD, MACD_Hist, MACD_Signal) with a moving average of its
+    own type for the fast, slow and signal line each.
+    """
+    fast, slow = macd_averages(x, fastperiod, fastmatype, slowperiod, slowmatype)
+    line = fast - slow
+    signal = moving_average(line, signalperiod, signalmatype)
+    line[np.isnan(signal)] = np.nan
+    return line, line - signal, signal
+
+
+def macd(x, fastperiod=12, slowperiod=26, signalperiod=9):
+    return macdext(x, fastperiod, 1, slowperiod, 1, signalperiod, 1)
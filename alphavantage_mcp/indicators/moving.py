@@ -0,0 +1,168 @@
+"""Moving averages, following TA-Lib's definitions as AlphaVantage does.
+
+Every function takes float arrays and returns arrays of the same length
+holding NaN over the warm-up bars. Leading NaNs in the input are skipped,
+so averages can be chained.
+"""
+import numpy as np
+
+from .arrays import empty, first_valid
+
+
+def sma(x, time_period):
+    out = empty(x)
+    start = first_valid(x)
+    if len(x) - start < time_period:
+        return out
+    sums = np.cumsum(np.concatenate(([0.0], x[start:])))
+    out[start + time_period - 1:] = (sums[time_period:] - sums[:-time_period]) / time_period
+    return out
+
+
+def ema(x, time_period, k=None):
+    """ Exponential moving average seeded with the simple average of the
+    first time_period values.
+    """
+    out = empty(x)
+    start = first_valid(x)
+    if len(x) - start < time_period:
+        return out
+    k = 2.0 / (time_period + 1) if k is None else k
+    value = float(np.mean(x[start:start + time_period]))
+    values = [value]
+    for price in x[start + time_period:].tolist():
+        value += k * (price - value)
+        values.append(value)
+    out[start + time_period - 1:] = values
+    return out
+
+
+def wma(x, time_period):
+    out = empty(x)
+    start = first_valid(x)
+    if len(x) - start < time_period:
+        return out
+    # The most recent value gets weight time_period, the oldest weight 1
+    weights = np.arange(time_period, 0, -1, dtype=np.float64)
+    out[start + time_period - 1:] = np.convolve(x[start:], weights, 'valid') / weights.sum()
+    return out
+
+
+def dema(x, time_period):
+    ema1 = ema(x, time_period)
+    return 2 * ema1 - ema(ema1, time_period)
+
+
+def tema(x, time_period):
+    ema1 = ema(x, time_period)
+    ema2 = ema(ema1, time_period)
+    return 3 * ema1 - 3 * ema2 + ema(ema2, time_period)
+
+
+def trima(x, time_period):
+    # Triangular weights 1, 2, ..., 2, 1 are an average of an average
+    half = time_period // 2
+    if time_period % 2:
+        return sma(sma(x, half + 1), half + 1)
+    return sma(sma(x, half), half + 1)
+
+
+def kama(x, time_period):
+    """ Kaufman adaptive moving average with the 2 and 30 bar bounds on
+    its smoothing constant.
+    """
+    out = empty(x)
+    start = first_valid(x)
+    x = x[start:]
+    if len(x) <= time_period:
+        return out
+    fastest, slowest = 2.0 / 3, 2.0 / 31
+    moves = np.cumsum(np.concatenate(([0.0], np.abs(np.diff(x)))))
+    volatility = moves[time_period:] - moves[:-time_period]
+    change = x[time_period:] - x[:-time_period]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efficiency = np.where((volatility <= change) | (volatility < 1e-14), 1.0, np.abs(change / volatility))
+    smoothing = (efficiency * (fastest - slowest) + slowest) ** 2
+    value = float(x[time_period - 1])
+    values = []
+    for price, constant in zip(x[time_period:].tolist(), smoothing.tolist()):
+        value += (price - value) * constant
+        values.append(value)
+    out[start + time_period:] = values
+    return out
+
+
+def t3(x, time_period, vfactor=0.7):
+    """ Tillson's T3: six chained EMAs combined with weights derived from
+    the volume factor.
+    """
+    e1 = ema(x, time_period)
+    e2 = ema(e1, time_period)
+    e3 = ema(e2, time_period)
+    e4 = ema(e3, time_period)
+    e5 = ema(e4, time_period)
+    e6 = ema(e5, time_period)
+    square = vfactor * vfactor
+    c1 = -square * vfactor
+    c2 = 3 * (square - c1)
+    c3 = -6 * square - 3 * (vfactor - c1)
+    c4 = 1 + 3 * vfactor - c1 + 3 * square
+    return c1 * e6 + c2 * e5 + c3 * e4 + c4 * e3
+
+
+# The numbering the matype arguments use, shared with TA-Lib
+MA_TYPES = ('SMA', 'EMA', 'WMA', 'DEMA', 'TEMA', 'TRIMA', 'T3', 'KAMA', 'MAMA')
+
+
+class MaType(int):
+    """ Moving average type given by its number 0 - 8 or its name """
+
+    def __new__(cls, value):
+        if isinstance(value, str) and not value.strip().isdigit():
+            if value.strip().upper() not in MA_TYPES:
+                raise ValueError('Unknown moving average type %r, expected one of %s' % (value, ', '.join(MA_TYPES)))
+            value = MA_TYPES.index(value.strip().upper())
+        value = int(value)
+        if not 0 <= value < len(MA_TYPES):
+            raise ValueError('Moving average types are numbered 0 - %d, got %d' % (len(MA_TYPES) - 1, value))
+        return super().__new__(cls, value)
+
+
+def ma_lookback(time_period, matype=0):
+    """ Return the number of warm-up bars of moving_average """
+    if time_period <= 1:
+        return 0
+    name = MA_TYPES[matype]
+    if name == 'MAMA':
+        return 32
+    if name == 'KAMA':
+        return time_period
+    return {'DEMA': 2, 'TEMA': 3, 'T3': 6}.get(name, 1) * (time_period - 1)
+
+
+def moving_average(x, time_period, matype=0):
+    """ Return the moving average of the given type, as the matype
+    arguments of the oscillators select it. MAMA uses its default limits
+    and ignores time_period.
+    """
+    if time_period <= 1:
+        return np.array(x, dtype=np.float64)
+    name = MA_TYPES[matype]
+    if name == 'MAMA':
+        # hilbert imports this module
+        from .hilbert import mama
+        return mama(x)[0]
+    return {'SMA': sma, 'EMA': ema, 'WMA': wma, 'DEMA': dema, 'TEMA': tema, 'TRIMA': trima, 'T3': t3,
+            'KAMA': kama}[name](x, time_period)
+
+
+def lagged_average(x, time_period, matype, lookback):
+    """ Return moving_average with its start pushed to lookback bars into
+    x, so that it starts with a longer average it is compared to. The
+    recursive averages are seeded from there, as TA-Lib does for MACD and
+    the price oscillators.
+    """
+    out = empty(x)
+    skip = first_valid(x) + max(0, lookback - ma_lookback(time_period, matype))
+    out[skip:] = moving_average(x[skip:], time_period, matype)
+    return out
@@ -0,0 +1,162 @@
+"""Indicators advanced bar by bar from their last state.
+
+EMA, RSI and MACD are recurrences: their value at a bar only depends on
+the state left by the bar before. A stream keeps that state for one
+(symbol, interval, indicator, arguments), so a refresh steps over the
+bars that arrived since instead of recomputing the whole history. States
+are seeded from the batch functions and stepped with the same arithmetic,
+so streamed values equal a full recomputation.
+"""
+import asyncio
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from ..cache import disk_cache
+from .arrays import ratio
+from .momentum import macd, macd_averages, wilder_moves
+from .moving import ema
+
+
+class _Ema(object):
+
+    def __init__(self, time_period):
+        self.time_period = time_period
+        self.k = 2.0 / (time_period + 1)
+
+    def batch(self, x):
+        """ Return the outputs over x and the state after each bar """
+        values = ema(x, self.time_period)
+        return (values,), (values,)
+
+    def step(self, state, price):
+        """ Return the state and the outputs after one more bar """
+        value = state[0] + self.k * (price - state[0])
+        return (value,), (value,)
+
+
+class _Rsi(object):
+
+    def __init__(self, time_period):
+        self.time_period = time_period
+        self.k = 1.0 / time_period
+
+    def batch(self, x):
+        gain, loss = wilder_moves(x, self.time_period)
+        return (ratio(gain, gain + loss, 100.0),), (gain, loss, x)
+
+    def step(self, state, price):
+        gain, loss, previous = state
+        move = price - previous
+        gain += self.k * (max(move, 0.0) - gain)
+        loss += self.k * (max(-move, 0.0) - loss)
+        total = gain + loss
+        return (gain, loss, price), ((gain / total if total != 0 else 0.0) * 100.0,)
+
+
+class _Macd(object):
+
+    def __init__(self, fastperiod=12, slowperiod=26, signalperiod=9):
+        self.periods = fastperiod, slowperiod, signalperiod
+        fastperiod, slowperiod = sorted((fastperiod, slowperiod))
+        self.fast_k, self.slow_k, self.signal_k = (2.0 / (n + 1) for n in (fastperiod, slowperiod, signalperiod))
+
+    def batch(self, x):
+        fastperiod, slowperiod, signalperiod = self.periods
+        outputs = macd(x, fastperiod, slowperiod, signalperiod)
+        fast, slow = macd_averages(x, fastperiod, 1, slowperiod, 1)
+        return outputs, (fast, slow, outputs[2])
+
+    def step(self, state, price):
+        fast, slow, signal = state
+        fast += self.fast_k * (price - fast)
+        slow += self.slow_k * (price - slow)
+        line = fast - slow
+        signal += self.signal_k * (line - signal)
+        return (fast, slow, signal), (line, line - signal, signal)
+
+
+STREAMS = {
+    'EMA': _Ema,
+    'RSI': _Rsi,
+    'MACD': _Macd,
+}
+
+STATE_MEMO_SIZE = 1024
+
+# The latest state of every stream by key, least recently used first, mirrored to the disk cache when there is one
+_states = OrderedDict()
+
+
+def _remember(key, state):
+    _states[key] = state
+    _states.move_to_end(key)
+    if len(_states) > STATE_MEMO_SIZE:
+        _states.popitem(last=False)
+
+
+async def _load(key):
+    state = _states.get(key)
+    if state is None and disk_cache is not None:
+        state = await asyncio.to_thread(disk_cache.get_state, key)
+    if state is not None:
+        _remember(key, state)
+    return state
+
+
+async def _store(key, state):
+    _remember(key, state)
+    if disk_cache is not None:
+        await asyncio.to_thread(disk_cache.set_state, key, state)
+
+
+def _resume(state, index, x):
+    """ Return the position of the stream's last bar in index, or None when
+    the stream cannot be continued on this series: the bar is gone, or the
+    bar before it no longer has the price the state was built on.
+    """
+    if state is None:
+        return None
+    position = int(np.searchsorted(index, state['last']))
+    if not 0 < position < len(index) or index[position] != state['last'] or x[position - 1] != state['settled']:
+        return None
+    return position
+
+
+async def advance(key, function, args, index, x, start):
+    """ Return the outputs of a streamed indicator for the bars of x from
+    start on, advancing its stored state over the bars it has not seen.
+
+    The state is kept as it was before the stream's last bar, so that a
+    bar still forming, such as today's daily bar, is stepped again with its
+    latest price. A stream that cannot be resumed on x, or was asked for
+    bars before its last one, is recomputed in full and seeded again.
+
+    Keyword Arguments:
+        key:  identifies the symbol, interval, indicator and arguments
+        function:  one of STREAMS
+        args:  the indicator's arguments
+        index:  the sorted bar timestamps
+        x:  the price series
+        start:  position of the first bar to return
+    """
+    recurrence = STREAMS[function](**args)
+    key = json.dumps(key)
+    state = await _load(key)
+    position = _resume(state, index, x)
+    if position is None or position > start:
+        outputs, states = recurrence.batch(x)
+        if len(x) > 1 and not np.isnan([values[-2] for values in states]).any():
+            await _store(key, {'last': str(index[-1]), 'settled': float(x[-2]),
+                         'state': [float(values[-2]) for values in states]})
+        return tuple(values[start:] for values in outputs)
+    values = state['state']
+    rows = []
+    for price in x[position:-1].tolist():
+        values, outputs = recurrence.step(values, price)
+        rows.append(outputs)
+    previous = values
+    rows.append(recurrence.step(values, float(x[-1]))[1])
+    await _store(key, {'last': str(index[-1]), 'settled': float(x[-2]), 'state': list(previous)})
+    return tuple(np.array(column[start - position:]) for column in zip(*rows))
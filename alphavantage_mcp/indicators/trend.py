@@ -0,0 +1,143 @@
+"""Directional movement, parabolic SAR and Aroon, following TA-Lib's
+definitions.
+"""
+import numpy as np
+
+from .arrays import empty, ratio, windows
+from .moving import ema
+from .volatility import trange
+
+
+def _movements(high, low):
+    """ Return the one-bar plus and minus directional movements; only the
+    larger of the two counts, and only when it is positive.
+    """
+    up = np.concatenate(([np.nan], np.diff(high)))
+    down = np.concatenate(([np.nan], -np.diff(low)))
+    plus = np.where((up > 0) & (up > down), up, 0.0)
+    minus = np.where((down > 0) & (down > up), down, 0.0)
+    plus[0] = minus[0] = np.nan
+    return plus, minus
+
+
+def _wilder_sum(x, time_period):
+    """ Return Wilder's running sum: the plain sum of the first
+    time_period - 1 values after the leading NaN, then each bar dropping
+    1/time_period of the total before adding its value.
+    """
+    if time_period <= 1:
+        return x.copy()
+    out = empty(x)
+    if len(x) < time_period:
+        return out
+    total = float(np.sum(x[1:time_period]))
+    values = [total]
+    for value in x[time_period:].tolist():
+        total = total - total / time_period + value
+        values.append(total)
+    out[time_period - 1:] = values
+    return out
+
+
+def plus_dm(high, low, time_period):
+    return _wilder_sum(_movements(high, low)[0], time_period)
+
+
+def minus_dm(high, low, time_period):
+    return _wilder_sum(_movements(high, low)[1], time_period)
+
+
+def _indicators(high, low, close, time_period):
+    """ Return the plus and minus directional indicators, in percent of the
+    smoothed true range.
+    """
+    plus, minus = _movements(high, low)
+    true_range = _wilder_sum(trange(high, low, close), time_period)
+    plus_di = ratio(_wilder_sum(plus, time_period), true_range, 100.0)
+    minus_di = ratio(_wilder_sum(minus, time_period), true_range, 100.0)
+    # The first value of the sums has not been smoothed yet
+    plus_di[:time_period] = minus_di[:time_period] = np.nan
+    return plus_di, minus_di
+
+
+def plus_di(high, low, close, time_period):
+    return _indicators(high, low, close, time_period)[0]
+
+
+def minus_di(high, low, close, time_period):
+    return _indicators(high, low, close, time_period)[1]
+
+
+def dx(high, low, close, time_period):
+    plus, minus = _indicators(high, low, close, time_period)
+    return ratio(np.abs(plus - minus), plus + minus, 100.0)
+
+
+def adx(high, low, close, time_period):
+    return ema(dx(high, low, close, time_period), time_period, 1.0 / time_period)
+
+
+def adxr(high, low, close, time_period):
+    values = adx(high, low, close, time_period)
+    out = empty(values)
+    lag = time_period - 1
+    out[lag:] = (values[lag:] + values[:len(values) - lag]) / 2
+    return out
+
+
+def sar(high, low, acceleration=0.01, maximum=0.2):
+    """ Parabolic stop and reverse. The first trend is short when the
+    second bar shows minus directional movement, long otherwise.
+    """
+    out = empty(high)
+    if len(high) < 2:
+        return out
+    step = min(acceleration, maximum)
+    highs, lows = high.tolist(), low.tolist()
+    long = not _movements(high[:2], low[:2])[1][1] > 0
+    if long:
+        extreme, stop = highs[1], lows[0]
+    else:
+        extreme, stop = lows[1], highs[0]
+    factor = step
+    new_high, new_low = highs[1], lows[1]
+    values = []
+    for today in range(1, len(highs)):
+        prev_high, prev_low = new_high, new_low
+        new_high, new_low = highs[today], lows[today]
+        if long and new_low <= stop or not long and new_high >= stop:
+            # Reverse: the stop jumps to the extreme point of the ended trend
+            long = not long
+            stop = min(extreme, prev_low, new_low) if long else max(extreme, prev_high, new_high)
+            values.append(stop)
+            factor = step
+            extreme = new_high if long else new_low
+        else:
+            values.append(stop)
+            if long and new_high > extreme or not long and new_low < extreme:
+                extreme = new_high if long else new_low
+                factor = min(factor + step, maximum)
+        stop += factor * (extreme - stop)
+        stop = min(stop, prev_low, new_low) if long else max(stop, prev_high, new_high)
+    out[1:] = values
+    return out
+
+
+def aroon(high, low, time_period):
+    """ Return (Aroon Down, Aroon Up): how recent the lowest low and the
+    highest high of the last time_period + 1 bars are, in percent. Ties go
+    to the most recent bar.
+    """
+    down, up = empty(low), empty(high)
+    if len(high) <= time_period:
+        return down, up
+    highs, first = windows(high, time_period + 1)
+    lows, _ = windows(low, time_period + 1)
+    up[first:] = 100.0 * (time_period - np.argmax(highs[:, ::-1], axis=1)) / time_period
+    down[first:] = 100.0 * (time_period - np.argmin(lows[:, ::-1], axis=1)) / time_period
+    return down, up
+
+
+def aroonosc(high, low, time_period):
+    down, up = aroon(high, low, time_period)
+    return up - down
@@ -0,0 +1,39 @@
+"""Volatility indicators, following TA-Lib's definitions."""
+import numpy as np
+
+from .arrays import empty, ratio, windows
+from .moving import ema, moving_average
+
+
+def trange(high, low, close):
+    out = empty(close)
+    previous = close[:-1]
+    out[1:] = np.maximum(high[1:], previous) - np.minimum(low[1:], previous)
+    return out
+
+
+def atr(high, low, close, time_period):
+    """ Average true range: Wilder's average of the true range, seeded with
+    the mean of its first time_period values.
+    """
+    true_range = trange(high, low, close)
+    if time_period <= 1:
+        return true_range
+    return ema(true_range, time_period, 1.0 / time_period)
+
+
+def natr(high, low, close, time_period):
+    return ratio(atr(high, low, close, time_period), close, 100.0)
+
+
+def bbands(x, time_period, nbdevup=2.0, nbdevdn=2.0, matype=0):
+    """ Return the (upper, middle, lower) bands: a moving average of the
+    chosen type plus and minus multiples of the population standard
+    deviation over time_period bars.
+    """
+    middle = moving_average(x, time_period, matype)
+    deviation = empty(x)
+    if len(x) >= time_period:
+        values, first = windows(x, time_period)
+        deviation[first:] = values.std(axis=1)
+    return middle + nbdevup * deviation, middle, middle - nbdevdn * deviation
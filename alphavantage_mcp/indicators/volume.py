@@ -0,0 +1,37 @@
+"""Volume indicators, following TA-Lib's definitions."""
+import numpy as np
+
+from .arrays import empty, ratio
+
+
+def ad(high, low, close, volume):
+    """ Chaikin accumulation/distribution line """
+    spread = high - low
+    flow = ratio((close - low) - (high - close), np.where(spread > 0, spread, 0.0)) * volume
+    return np.cumsum(flow)
+
+
+def adosc(high, low, close, volume, fastperiod=3, slowperiod=10):
+    """ Chaikin oscillator: the difference of two EMAs of the A/D line,
+    both seeded with its first value rather than an average.
+    """
+    out = empty(close)
+    lookback = max(fastperiod, slowperiod) - 1
+    if len(close) <= lookback:
+        return out
+    line = ad(high, low, close, volume).tolist()
+    fast_k, slow_k = 2.0 / (fastperiod + 1), 2.0 / (slowperiod + 1)
+    fast = slow = line[0]
+    values = [0.0]
+    for value in line[1:]:
+        fast += fast_k * (value - fast)
+        slow += slow_k * (value - slow)
+        values.append(fast - slow)
+    out[lookback:] = values[lookback:]
+    return out
+
+
+def obv(close, volume):
+    """ On balance volume, starting from the first bar's volume """
+    direction = np.sign(np.diff(close))
+    return np.cumsum(np.concatenate((volume[:1], direction * volume[1:])))
@@ -0,0 +1,161 @@
+"""Pool of AlphaVantage api keys, each with its own rate budget and quota."""
+import datetime
+import os
+import time
+import zlib
+
+from .ratelimit import RateLimiter
+from .responses import INVALID_KEY, THROTTLED, InvalidKeyError
+
+# Comma-separated list of keys; ALPHAVANTAGE_API_KEY is used when unset
+API_KEYS = os.getenv('ALPHAVANTAGE_API_KEYS') or os.getenv('ALPHAVANTAGE_API_KEY') or ''
+# 'headroom' sends each call to the key with the most budget left, 'sticky'
+# hashes the symbol so that a symbol keeps using the same key
+KEY_ROUTING = os.getenv('ALPHAVANTAGE_KEY_ROUTING', 'headroom')
+# Seconds a key sits out after a throttle answer
+KEY_COOLDOWN = float(os.getenv('ALPHAVANTAGE_KEY_COOLDOWN', '60'))
+
+_SYMBOL_PARAMS = ('symbol', 'from_symbol', 'from_currency', 'tickers')
+
+_MISSING_KEY = ('The AlphaVantage API key must be provided through the environment '
+                'variable ALPHAVANTAGE_API_KEY or ALPHAVANTAGE_API_KEYS. Get a free key '
+                'from the alphavantage website: https://www.alphavantage.co/support/#api-key')
+
+
+def _today():
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+def _seconds_to_midnight():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(),
+                                         tzinfo=datetime.timezone.utc)
+    return (midnight - now).total_seconds()
+
+
+class ApiKey(object):
+    """ One api key with its rate limiter, a daily call counter and its
+    rotation state.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.limiter = RateLimiter()
+        self.day = _today()
+        self.used_today = 0
+        self.in_flight = 0
+        self.invalid = False
+        self.cooldown_until = 0.0
+        self.throttled = 0
+
+    def active(self, now):
+        return not self.invalid and self.cooldown_until <= now
+
+    def quota_left(self):
+        if self.day != _today():
+            self.day, self.used_today = _today(), 0
+        if self.limiter.per_day <= 0:
+            return float('inf')
+        return self.limiter.per_day - self.used_today
+
+    def headroom(self):
+        return min(self.limiter.headroom(), self.quota_left())
+
+    def as_dict(self, now):
+        return {
+            'key': '...' + self.key[-4:],
+            'active': self.active(now),
+            'invalid': self.invalid,
+            'cooldown_seconds': max(0.0, self.cooldown_until - now),
+            'used_today': self.used_today if self.day == _today() else 0,
+            'throttled': self.throttled,
+            'in_flight': self.in_flight,
+            'rate_limit': self.limiter.stats(),
+        }
+
+
+class KeyPool(object):
+    """ Route upstream calls over several api keys. Keys answering with a
+    throttle note sit out KEY_COOLDOWN seconds (until UTC midnight when the
+    daily quota is spent) and keys reported invalid leave the rotation for
+    good, so throughput grows with the number of usable keys.
+
+    Keyword Arguments:
+        keys:  the api keys
+        routing:  'headroom' or 'sticky'
+    """
+
+    def __init__(self, keys, routing=KEY_ROUTING):
+        self.keys = [ApiKey(key) for key in dict.fromkeys(keys)]
+        self.routing = routing
+
+    def _choose(self, symbol):
+        if not self.keys:
+            raise ValueError(_MISSING_KEY)
+        candidates = self.active_keys()
+        if not candidates:
+            candidates = [api_key for api_key in self.keys if not api_key.invalid]
+            if not candidates:
+                raise InvalidKeyError('None of the configured AlphaVantage API keys is valid.')
+            # Every key is cooling down: take the one that recovers first
+            return min(candidates, key=lambda api_key: api_key.cooldown_until)
+        if self.routing == 'sticky' and symbol:
+            return candidates[zlib.crc32(symbol.encode()) % len(candidates)]
+        return max(candidates, key=lambda api_key: (api_key.headroom(), -api_key.in_flight,
+                                                    -api_key.used_today))
+
+    async def acquire(self, symbol=None):
+        """ Pick a key for the next call, wait for its rate limiter and
+        count the call against its quota. Pair every acquire with release.
+
+        Keyword Arguments:
+            symbol:  the symbol of the request, used by sticky routing
+        """
+        api_key = self._choose(symbol)
+        api_key.in_flight += 1
+        try:
+            await api_key.limiter.acquire()
+        except BaseException:
+            api_key.in_flight -= 1
+            raise
+        api_key.quota_left()
+        api_key.used_today += 1
+        return api_key
+
+    def release(self, api_key, kind, message=None):
+        """ Return a key after its call and take it out of rotation when
+        the answer showed it throttled or invalid.
+
+        Keyword Arguments:
+            api_key:  the key returned by acquire
+            kind:  the classification of the answer
+            message:  the upstream message of an error answer
+        """
+        api_key.in_flight -= 1
+        if kind == INVALID_KEY:
+            api_key.invalid = True
+        elif kind == THROTTLED:
+            api_key.throttled += 1
+            per_day = message is not None and 'requests per day' in message.lower()
+            cooldown = _seconds_to_midnight() if per_day else KEY_COOLDOWN
+            api_key.cooldown_until = time.monotonic() + cooldown
+
+    def active_keys(self):
+        """ Return the keys currently in rotation """
+        now = time.monotonic()
+        return [api_key for api_key in self.keys if api_key.active(now)]
+
+    def symbol_of(self, key):
+        """ Return the symbol a canonical request key is about, if any """
+        params = dict(key[1:])
+        for name in _SYMBOL_PARAMS:
+            if name in params:
+                return params[name]
+        return None
+
+    def stats(self):
+        now = time.monotonic()
+        return {'routing': self.routing, 'keys': [api_key.as_dict(now) for api_key in self.keys]}
+
+
+key_pool = KeyPool([key.strip() for key in API_KEYS.split(',') if key.strip()])
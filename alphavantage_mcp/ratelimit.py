@@ -0,0 +1,111 @@
+"""Token-bucket scheduling of upstream calls within the api key's quota."""
+import asyncio
+import os
+import time
+
+# The free plan's quota unless set to the limits of the key's plan; 0 for no limit
+REQUESTS_PER_MINUTE = float(os.getenv('ALPHAVANTAGE_REQUESTS_PER_MINUTE', '5'))
+REQUESTS_PER_DAY = float(os.getenv('ALPHAVANTAGE_REQUESTS_PER_DAY', '25'))
+
+
+class TokenBucket(object):
+    """ Bucket holding up to capacity tokens, refilled continuously so that
+    capacity tokens are added per period.
+
+    Keyword Arguments:
+        capacity:  number of requests allowed per period
+        period:  length of the period in seconds
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now):
+        """ Return the seconds until a token is available """
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class RateLimiter(object):
+    """ Scheduler in front of the upstream calls made with one api key.
+    Callers queue in arrival order until both the per-minute and the
+    per-day bucket hold a token; a limit of 0 disables that bucket.
+
+    Keyword Arguments:
+        per_minute:  requests allowed per minute
+        per_day:  requests allowed per day
+    """
+
+    def __init__(self, per_minute=REQUESTS_PER_MINUTE, per_day=REQUESTS_PER_DAY):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self._buckets = []
+        if per_minute > 0:
+            self._buckets.append(TokenBucket(per_minute, 60))
+        if per_day > 0:
+            self._buckets.append(TokenBucket(per_day, 24 * 60 * 60))
+        self._lock = asyncio.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def headroom(self):
+        """ Return how many calls could start right now, inf when unlimited """
+        now = time.monotonic()
+        tokens = float('inf')
+        for bucket in self._buckets:
+            bucket.delay(now)
+            tokens = min(tokens, bucket.tokens)
+        return tokens - self.queue_depth
+
+    async def acquire(self):
+        """ Wait for this caller's turn and consume one token from every bucket """
+        if not self._buckets:
+            self.acquired += 1
+            return
+        start = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._lock:
+                while True:
+                    delay = max(bucket.delay(time.monotonic()) for bucket in self._buckets)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                for bucket in self._buckets:
+                    bucket.take()
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.001:
+            self.delayed += 1
+
+    def stats(self):
+        return {
+            'requests_per_minute': self.per_minute or None,
+            'requests_per_day': self.per_day or None,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'acquired': self.acquired,
+            'delayed': self.delayed,
+            'avg_wait_seconds': self.total_wait / self.acquired if self.acquired else 0.0,
+            'max_wait_seconds': self.max_wait,
+        }
+
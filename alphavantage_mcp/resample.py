@@ -0,0 +1,241 @@
+"""Coarser bars resampled from finer held ones.
+
+A coarser bar is the aggregate of the finer bars within it: the first
+open, the highest high, the lowest low, the last close and adjusted close,
+and the summed volume and dividends. Weekly and monthly bars are stamped
+with the period's last trading day and intraday bars with their start, as
+upstream. So once the full daily or 1-minute series of a symbol is held,
+in the bar store or for the adjusted and crypto series in the response
+caches, the coarser intervals are computed from it instead of fetched.
+"""
+import threading
+
+import numpy as np
+from alpha_vantage.cryptocurrencies import CryptoCurrencies
+from alpha_vantage.timeseries import TimeSeries
+
+from .client import shared
+from .frames import Frame, select
+from .store import time_zone_of, to_stamps
+
+PERIODS = ('weekly', 'monthly')
+# Intraday intervals built from 1-minute bars
+MINUTES = {'5min': 5, '15min': 15, '30min': 30, '60min': 60}
+
+_DAY = 24 * 60 * 60
+# The [open, close) seconds of the trading day with extended_hours true and
+# false; bars start counting from the open
+SESSIONS = {'true': (4 * 60 * 60, 20 * 60 * 60), 'false': (9 * 60 * 60 + 30 * 60, 16 * 60 * 60)}
+# Columns aggregated by their last value and by their sum; open, high and
+# low take the first, the highest and the lowest
+_LAST = ('time', 'close', 'adjusted close')
+_SUM = ('volume', 'dividend amount')
+# Fields of the weekly and monthly adjusted series, in their order upstream
+_ADJUSTED = ('open', 'high', 'low', 'close', 'adjusted close', 'volume', 'dividend amount')
+# Fields of the intraday series
+_INTRADAY = ('open', 'high', 'low', 'close', 'volume')
+
+
+class ResampleStats(object):
+    """ Count, per interval, the requests resampled from finer held bars and
+    those served from their own upstream series.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, interval, resampled):
+        with self._lock:
+            counts = self._counts.setdefault(interval, {'resampled': 0, 'fetched': 0})
+            counts['resampled' if resampled else 'fetched'] += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {interval: dict(counts) for interval, counts in self._counts.items()}
+
+
+resample_stats = ResampleStats()
+
+
+def periods(times, period):
+    """ Return the label of the week (Monday to Sunday) or month of each bar
+
+    Keyword Arguments:
+        times:  the bar times as int64 seconds
+        period:  'weekly' or 'monthly'
+    """
+    if period == 'weekly':
+        # 1970-01-01 was a Thursday
+        return (times // _DAY + 3) // 7
+    if period == 'monthly':
+        return times.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+    raise ValueError('Unsupported period %r' % (period,))
+
+
+def buckets(times, minutes, extended_hours=None):
+    """ Return the start of the intraday bar of each 1-minute bar, and a
+    mask of the bars within the trading session.
+
+    Keyword Arguments:
+        times:  the bar times as int64 seconds
+        minutes:  the length of the coarser bars
+        extended_hours:  'true' or 'false' to count bars from the open of
+            that session, None for markets that trade around the clock
+    """
+    width = minutes * 60
+    if extended_hours is None:
+        return times // width * width, np.ones(len(times), dtype=bool)
+    opening, closing = SESSIONS[str(extended_hours).lower()]
+    day = times // _DAY * _DAY
+    since = times - day - opening
+    return day + opening + since // width * width, (since >= 0) & (times - day < closing)
+
+
+def aggregate(columns, groups, label=False):
+    """ Return the columns of one bar per run of equal group labels
+
+    Keyword Arguments:
+        columns:  dict of column arrays, oldest first
+        groups:  the group label of each bar, non-decreasing
+        label:  whether to stamp each bar with its group label rather than
+            the time of its last bar
+    """
+    if not len(groups):
+        return {name: values[:0] for name, values in columns.items()}
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(groups)) + 1))
+    ends = np.concatenate((starts[1:], [len(groups)])) - 1
+    out = {}
+    for name, values in columns.items():
+        if name in _LAST:
+            out[name] = values[ends]
+        elif name in _SUM:
+            out[name] = np.add.reduceat(values, starts)
+        elif name == 'high':
+            out[name] = np.maximum.reduceat(values, starts)
+        elif name == 'low':
+            out[name] = np.minimum.reduceat(values, starts)
+        else:
+            out[name] = values[starts]
+    if label:
+        out['time'] = groups[starts]
+    return out
+
+
+def resample(columns, period):
+    """ Return daily columns resampled to 'weekly' or 'monthly' bars """
+    return aggregate(columns, periods(columns['time'], period))
+
+
+def resample_intraday(columns, interval, extended_hours=None):
+    """ Return 1-minute columns resampled to a coarser intraday interval
+
+    Keyword Arguments:
+        columns:  dict of column arrays, oldest first
+        interval:  '5min', '15min', '30min' or '60min'
+        extended_hours:  the session of the bars, as for buckets
+    """
+    starts, within = buckets(columns['time'], MINUTES[interval], extended_hours)
+    if not within.all():
+        columns = {name: values[within] for name, values in columns.items()}
+        starts = starts[within]
+    return aggregate(columns, starts, label=True)
+
+
+def intraday_meta(meta_data, interval, outputsize, columns):
+    """ Return the meta data of a 1-minute response rewritten for the
+    coarser interval resampled from it.
+    """
+    stamps = to_stamps(columns['time'][-1:]).tolist()
+    out = {}
+    for name, value in meta_data.items():
+        if name.endswith('Information'):
+            value = value.replace('(1min)', '(%s)' % (interval,))
+        elif name.endswith('Interval'):
+            value = interval
+        elif name.endswith('Output Size'):
+            value = 'Full size' if outputsize == 'full' else 'Compact'
+        elif name.endswith('Last Refreshed'):
+            value = stamps[0] if stamps else None
+        out[name] = value
+    return out
+
+
+def period_meta(symbol, period, columns, time_zone, adjusted=False):
+    """ Return the meta data of the upstream weekly or monthly response """
+    stamps = to_stamps(columns['time'][-1:], 'D').tolist()
+    return {
+        '1. Information': '%s %s' % (period.capitalize(), 'Adjusted Prices and Volumes' if adjusted else
+                                     'Prices (open, high, low, close) and Volumes'),
+        '2. Symbol': symbol,
+        '3. Last Refreshed': stamps[0] if stamps else None,
+        '4. Time Zone': time_zone,
+    }
+
+
+def _resampled(frame, names, resampler, meta_data, data_key):
+    """ Return a Frame of the named fields of a time series Frame resampled
+    by resampler, a function of a dict of columns, with the fields
+    numbered in the order given and formatted as in the source.
+    """
+    decimals = dict(zip((field.split('. ', 1)[-1] for field in frame.fields), frame.decimals))
+    columns = {name: frame.column(name) for name in names}
+    columns['time'] = frame.times
+    columns = resampler(columns)
+    return Frame(meta_data(columns), data_key, columns['time'], frame.unit,
+                 ['%d. %s' % (i + 1, name) for i, name in enumerate(names)], [columns[name] for name in names],
+                 [decimals[name] for name in names])
+
+
+async def resample_adjusted(symbol, period, selection=None):
+    """ Return the weekly or monthly adjusted (data, meta_data) pair computed
+    from the full daily adjusted series, or None when neither cache holds a
+    copy of it. An expired copy is brought up to date first.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        period:  'weekly' or 'monthly'
+        selection:  the Selection of bars and fields to return (default None)
+    """
+    ts = shared(TimeSeries)
+    if not await ts.held('get_daily_adjusted', symbol=symbol, outputsize='full'):
+        resample_stats.record(period + '_adjusted', False)
+        return None
+    daily = await ts.frame('get_daily_adjusted', symbol=symbol, outputsize='full')
+    frame = _resampled(daily, _ADJUSTED, lambda columns: resample(columns, period),
+                       lambda columns: period_meta(symbol, period, columns, time_zone_of(daily.meta_data), True),
+                       '%s Adjusted Time Series' % (period.capitalize(),))
+    resample_stats.record(period + '_adjusted', True)
+    return select(frame, frame.meta_data, selection)
+
+
+async def resample_crypto(symbol, market, interval, outputsize='compact', selection=None):
+    """ Return the crypto intraday (data, meta_data) pair of a coarser
+    interval computed from the full 1-minute series, or None when neither
+    cache holds a copy of it. An expired copy is fetched again first, which
+    then serves every interval.
+
+    Keyword Arguments:
+        symbol:  digital/crypto currency of your choice
+        market:  exchange market of your choice
+        interval:  '5min', '15min', '30min' or '60min'
+        outputsize:  'compact' for the last 100 bars or 'full'
+        selection:  the Selection of bars and fields to return (default None)
+    """
+    if interval not in MINUTES:
+        return None
+    cc = shared(CryptoCurrencies)
+    if not await cc.held('get_crypto_intraday', symbol=symbol, market=market, interval='1min', outputsize='full'):
+        resample_stats.record('crypto_' + interval, False)
+        return None
+    minute = await cc.frame('get_crypto_intraday', symbol=symbol, market=market, interval='1min', outputsize='full')
+
+    def resampler(columns):
+        columns = resample_intraday(columns, interval)
+        return columns if outputsize == 'full' else {name: values[-100:] for name, values in columns.items()}
+
+    frame = _resampled(minute, _INTRADAY, resampler,
+                       lambda columns: intraday_meta(minute.meta_data, interval, outputsize, columns),
+                       'Time Series Crypto (%s)' % (interval,))
+    resample_stats.record('crypto_' + interval, True)
+    return select(frame, frame.meta_data, selection)
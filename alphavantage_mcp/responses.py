@@ -0,0 +1,143 @@
+"""Classification of AlphaVantage responses.
+
+AlphaVantage answers most failures with HTTP 200 and a json body holding an
+``Error Message``, ``Information`` or ``Note`` key instead of data. These are
+told apart here so that throttling can be retried and never cached.
+"""
+import threading
+
+OK = 'ok'
+THROTTLED = 'throttled'
+PREMIUM = 'premium'
+INVALID_CALL = 'invalid_call'
+INVALID_KEY = 'invalid_key'
+EMPTY = 'empty'
+INFORMATION = 'information'
+UNAVAILABLE = 'unavailable'
+
+_THROTTLE_MARKERS = ('call frequency', 'rate limit', 'requests per day', 'requests per minute',
+                     'burst pattern', 'spreading out your free api requests')
+_INVALID_KEY_MARKERS = ('apikey is invalid', 'api key is invalid', 'invalid api key')
+
+
+class AlphaVantageError(ValueError):
+    """ Error payload returned by AlphaVantage. Subclasses ValueError, which
+    the tools have always raised for upstream problems.
+    """
+    kind = INFORMATION
+
+
+class ThrottledError(AlphaVantageError):
+    kind = THROTTLED
+
+
+class PremiumEndpointError(AlphaVantageError):
+    kind = PREMIUM
+
+
+class InvalidCallError(AlphaVantageError):
+    """ Raised for 'Invalid API call', which is also how unknown symbols are reported """
+    kind = INVALID_CALL
+
+
+class InvalidKeyError(AlphaVantageError):
+    kind = INVALID_KEY
+
+
+class UnavailableError(AlphaVantageError):
+    """ Raised when HTTP 429 or 5xx answers outlast the retry deadline """
+    kind = UNAVAILABLE
+
+
+class UnparseableResponseError(AlphaVantageError):
+    """ Raised for a body that is neither json nor a time series in CSV """
+
+
+_ERRORS = {
+    THROTTLED: ThrottledError,
+    PREMIUM: PremiumEndpointError,
+    INVALID_CALL: InvalidCallError,
+    INVALID_KEY: InvalidKeyError,
+}
+
+
+def message_of(json_response):
+    """ Return the error text of an upstream json response, or None """
+    if not isinstance(json_response, dict):
+        return None
+    for key in ('Error Message', 'Information', 'Note'):
+        if key in json_response:
+            return str(json_response[key])
+    return None
+
+
+def classify(json_response):
+    """ Return the kind of an upstream json response: one of OK, THROTTLED,
+    PREMIUM, INVALID_CALL, INVALID_KEY, EMPTY or INFORMATION. UNAVAILABLE is
+    assigned by the transport to HTTP 429 and 5xx answers.
+
+    Keyword Arguments:
+        json_response:  the decoded body of the response
+    """
+    if not json_response:
+        return EMPTY
+    if not isinstance(json_response, dict):
+        return OK
+    message = message_of(json_response)
+    if message is None:
+        return OK
+    text = message.lower()
+    if any(marker in text for marker in _INVALID_KEY_MARKERS):
+        return INVALID_KEY
+    if any(marker in text for marker in _THROTTLE_MARKERS):
+        return THROTTLED
+    # Throttle notes advertise the premium plans too, so this comes second
+    if 'premium' in text:
+        return PREMIUM
+    if 'Error Message' in json_response:
+        return INVALID_CALL
+    return INFORMATION
+
+
+class ResponseStats(object):
+    """ Count upstream responses per kind, plus retries and give-ups """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.kinds = {}
+        self.retries = 0
+        self.gave_up = 0
+
+    def record(self, kind):
+        with self._lock:
+            self.kinds[kind] = self.kinds.get(kind, 0) + 1
+
+    def retried(self):
+        with self._lock:
+            self.retries += 1
+
+    def give_up(self):
+        with self._lock:
+            self.gave_up += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'kinds': dict(self.kinds), 'retries': self.retries, 'gave_up': self.gave_up}
+
+
+response_stats = ResponseStats()
+
+
+def check(json_response):
+    """ Return json_response when it holds data, otherwise raise the
+    AlphaVantageError matching its kind.
+
+    Keyword Arguments:
+        json_response:  the decoded body of the response
+    """
+    kind = classify(json_response)
+    if kind == OK:
+        return json_response
+    if kind == EMPTY:
+        raise AlphaVantageError('Error getting data from the api, no return was given.')
+    raise _ERRORS.get(kind, AlphaVantageError)(message_of(json_response))
@@ -0,0 +1,50 @@
+"""Coalescing of identical concurrent upstream requests."""
+import asyncio
+
+
+class SingleFlight(object):
+    """ Run at most one load per key at a time. The first caller for a key
+    starts the load, and every caller arriving while it is in flight awaits
+    the same task and receives the same result or exception.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.loads = 0
+        self.coalesced = 0
+
+    async def do(self, key, load):
+        """ Return the result of ``await load()``, shared with all concurrent
+        callers using the same key.
+
+        Keyword Arguments:
+            key:  hashable identity of the request
+            load:  zero-argument coroutine function performing the request
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.loads += 1
+        else:
+            self.coalesced += 1
+        # A caller giving up must not cancel the load the others wait on
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even when every caller has left
+            task.exception()
+
+    def stats(self):
+        return {
+            'in_flight': len(self._tasks),
+            'upstream_loads': self.loads,
+            'coalesced_calls': self.coalesced,
+        }
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,228 @@
+"""On-disk columnar store of price bars, read through memory maps.
+
+Each (symbol, series) is a directory of raw little-endian column files,
+sorted by time: the bar's wall clock time in the exchange's time zone as
+int64 seconds, open, high, low and close as float64 and volume as int64.
+meta.json holds the row count, the time zone, the months held in full and
+when each kind of upstream request last refreshed the series. Reads map
+the files without copying them. Bars that all follow the stored ones are
+appended in place, past the rows readers have mapped; any other write,
+a revised last bar included, saves the columns as a new generation and
+then switches meta.json over to it, so that readers never see a stored
+bar change under them or a half written series.
+
+The store may be shared by several server processes. Writers hold an
+exclusive flock on the series' lock file over the read-modify-write of
+meta.json and the removal of the old generation, and readers a shared one
+while they read meta.json and map its generation.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows, where only the threads of one process are kept apart
+    fcntl = None
+
+STORE_DIR = os.path.expanduser(os.getenv('ALPHAVANTAGE_STORE_DIR', '~/.cache/alphavantage-mcp/bars'))
+
+COLUMNS = (('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'), ('volume', '<i8'))
+
+
+def to_seconds(stamps):
+    """ Return 'YYYY-MM-DD[ HH:MM:SS]' timestamps as int64 seconds """
+    return np.array(stamps, dtype='datetime64[s]').astype(np.int64)
+
+
+def to_stamps(seconds, unit='s'):
+    """ Return int64 seconds as upstream timestamps, to the second, minute
+    ('m') or day ('D').
+    """
+    stamps = np.datetime_as_string(np.asarray(seconds).astype('datetime64[s]'), unit=unit)
+    return stamps if unit == 'D' else np.char.replace(stamps, 'T', ' ')
+
+
+def time_zone_of(meta_data):
+    """ Return the time zone named in the meta data of a time series response """
+    return next((value for name, value in (meta_data or {}).items() if name.endswith('Time Zone')), None)
+
+
+def month_span(month):
+    """ Return the [start, end) seconds of a 'YYYY-MM' month """
+    start = np.datetime64(month, 'M')
+    return int(start.astype('datetime64[s]').astype(np.int64)), \
+        int((start + np.timedelta64(1, 'M')).astype('datetime64[s]').astype(np.int64))
+
+
+def series_name(interval, extended_hours='true', adjusted='true'):
+    """ Return the store's name for an intraday series variant, e.g.
+    '1min' for the upstream defaults and '1min-regular-raw' without the
+    extended hours and the split and dividend adjustments.
+    """
+    name = interval
+    if str(extended_hours).lower() == 'false':
+        name += '-regular'
+    if str(adjusted).lower() == 'false':
+        name += '-raw'
+    return name
+
+
+@contextmanager
+def _flocked(directory, exclusive):
+    """ Hold a flock on the lock file of a series directory """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, 'lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class BarStore(object):
+    """ Columnar bar files under one root directory
+
+    Keyword Arguments:
+        root:  the directory holding one directory per symbol, created on
+            the first write
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _directory(self, symbol, series):
+        return os.path.join(self.root, symbol.upper(), series)
+
+    def meta(self, symbol, series):
+        """ Return the meta data of a stored series, or None """
+        try:
+            with open(os.path.join(self._directory(symbol, series), 'meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def read(self, symbol, series, start=None, end=None):
+        """ Return the stored bars with a time in [start, end) as a dict of
+        column arrays together with the meta data, or None when the series is
+        not stored.
+
+        Keyword Arguments:
+            symbol:  the symbol of the series
+            series:  the series name, e.g. from series_name
+            start, end:  bounds in seconds, open ended when None
+        """
+        directory = self._directory(symbol, series)
+        if not os.path.isdir(directory):
+            return None
+        # The maps stay valid once open, even after a writer removes their files;
+        # without flock a writer may still do so in between, and the read is retried
+        for attempt in range(2):
+            try:
+                with _flocked(directory, exclusive=False):
+                    meta = self.meta(symbol, series)
+                    if meta is None:
+                        return None
+                    columns = self._load(directory, meta)
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+        times = columns['time']
+        first = 0 if start is None else int(np.searchsorted(times, start))
+        last = len(times) if end is None else int(np.searchsorted(times, end))
+        return {name: values[first:last] for name, values in columns.items()}, meta
+
+    def _load(self, directory, meta):
+        # Rows written after meta.json was last saved are not part of the series yet
+        if not meta['rows']:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+        return {name: np.memmap(os.path.join(directory, '%s.%d' % (name, meta['generation'])), dtype=dtype,
+                                mode='r', shape=(meta['rows'],))
+                for name, dtype in COLUMNS}
+
+    def write(self, symbol, series, columns, time_zone, span=None, months=()):
+        """ Store bars, replacing the stored ones within their span
+
+        Keyword Arguments:
+            symbol:  the symbol of the series
+            series:  the series name, e.g. from series_name
+            columns:  dict of the COLUMNS arrays, sorted by time
+            time_zone:  the time zone of the bar times
+            span:  [start, end) seconds the bars cover in full, by default
+                from the first bar to just after the last
+            months:  'YYYY-MM' months that are now held in full
+        """
+        times = columns['time']
+        if span is None:
+            span = (int(times[0]), int(times[-1]) + 1) if len(times) else (0, 0)
+        directory = self._directory(symbol, series)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, _flocked(directory, exclusive=True):
+            meta = self.meta(symbol, series) or {'generation': 0, 'rows': 0, 'months': [], 'requests': {}}
+            stored = self._load(directory, meta) if meta['rows'] else None
+            old = meta['generation']
+            if stored is None:
+                self._write_at(directory, meta, columns, 0)
+            elif stored['time'][-1] < span[0]:
+                # Only a pure append leaves the rows readers may have mapped untouched
+                self._write_at(directory, meta, columns, meta['rows'])
+            else:
+                self._rewrite(directory, meta, stored, columns, span)
+            meta['time_zone'] = time_zone
+            meta['months'] = sorted(set(meta['months']) | set(months))
+            self._save_meta(directory, meta)
+            if meta['generation'] != old and stored is not None:
+                for name, _ in COLUMNS:
+                    os.remove(os.path.join(directory, '%s.%d' % (name, old)))
+
+    def _write_at(self, directory, meta, columns, row):
+        # Files are never truncated, as that would pull pages from under the
+        # maps of readers; bytes past the row count are simply ignored
+        for name, dtype in COLUMNS:
+            path = os.path.join(directory, '%s.%d' % (name, meta['generation']))
+            with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                f.seek(row * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        meta['rows'] = row + len(columns['time'])
+
+    def record(self, symbol, series, request, info):
+        """ Record when and with what meta data a kind of upstream request,
+        e.g. 'full' or 'compact', last refreshed a stored series.
+        """
+        directory = self._directory(symbol, series)
+        if not os.path.isdir(directory):
+            return
+        with self._lock, _flocked(directory, exclusive=True):
+            meta = self.meta(symbol, series)
+            if meta is None:
+                return
+            meta.setdefault('requests', {})[request] = info
+            self._save_meta(directory, meta)
+
+    def _rewrite(self, directory, meta, stored, columns, span):
+        times = stored['time']
+        before = int(np.searchsorted(times, span[0]))
+        after = int(np.searchsorted(times, span[1]))
+        generation = meta['generation'] + 1
+        for name, dtype in COLUMNS:
+            values = np.concatenate((stored[name][:before], np.asarray(columns[name], dtype=dtype),
+                                     stored[name][after:]))
+            values.astype(dtype).tofile(os.path.join(directory, '%s.%d' % (name, generation)))
+        meta['generation'] = generation
+        meta['rows'] = before + len(columns['time']) + len(times) - after
+
+    def _save_meta(self, directory, meta):
+        path = os.path.join(directory, 'meta.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+
+bar_store = BarStore()
@@ -0,0 +1,84 @@
+"""Summary statistics of a series instead of its rows.
+
+Questions like how volatile a stock has been this year or which way a
+macro series is trending need a handful of numbers, not thousands of rows.
+summarize computes them with array operations over the typed columns of
+the selected bars: the range, the percentiles, the returns and their
+annualized volatility, the deepest drawdown and a least squares trend.
+"""
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_DAY = 24 * 60 * 60
+_YEAR = 365.25 * _DAY
+
+
+def _number(value):
+    """ Return a statistic rounded for the response, None when not finite """
+    value = float(value)
+    return round(value, 6) if np.isfinite(value) else None
+
+
+def summarize(times, values, stamp):
+    """ Return the summary statistics of a series; returns, volatility and
+    drawdown only when every value is positive, as for prices. Values that
+    are NaN are left out.
+
+    Keyword Arguments:
+        times:  the bar times as int64 seconds, sorted
+        values:  the value of each bar
+        stamp:  function of a bar position returning its timestamp
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    times, values = times[valid], values[valid]
+    if not len(values):
+        return {'points': 0}
+
+    def at(i):
+        return {'time': stamp(int(valid[i])), 'value': _number(values[i])}
+
+    summary = {
+        'points': len(values),
+        'first': at(0),
+        'last': at(-1),
+        'change': _number(values[-1] - values[0]),
+        'min': at(int(np.argmin(values))),
+        'max': at(int(np.argmax(values))),
+        'mean': _number(values.mean()),
+        'std': _number(values.std()),
+        'percentiles': {str(q): _number(value) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+    }
+    if len(values) < 2:
+        return summary
+    days = (times - times[0]) / _DAY
+    if days[-1] > 0:
+        slope, intercept = np.polyfit(days, values, 1)
+        residual = values - (slope * days + intercept)
+        total = ((values - values.mean()) ** 2).sum()
+        summary['trend'] = {
+            'slope_per_day': _number(slope),
+            'slope_per_year': _number(slope * 365.25),
+            'r2': _number(1 - (residual ** 2).sum() / total) if total else None,
+        }
+    if (values > 0).all():
+        returns = values[1:] / values[:-1] - 1
+        logs = np.log1p(returns)
+        # Bars per year as observed, so trading days, weeks or minutes alike
+        per_year = (len(values) - 1) / ((times[-1] - times[0]) / _YEAR) if times[-1] > times[0] else np.nan
+        peaks = np.maximum.accumulate(values)
+        drawdowns = values / peaks - 1
+        trough = int(np.argmin(drawdowns))
+        peak = int(np.argmax(values[:trough + 1]))
+        summary['return'] = _number(values[-1] / values[0] - 1)
+        summary['returns'] = {
+            'mean': _number(returns.mean()),
+            'std': _number(returns.std(ddof=1)) if len(returns) > 1 else None,
+            'best': {'time': stamp(int(valid[np.argmax(returns) + 1])), 'value': _number(returns.max())},
+            'worst': {'time': stamp(int(valid[np.argmin(returns) + 1])), 'value': _number(returns.min())},
+            'periods_per_year': _number(per_year),
+        }
+        summary['realized_volatility'] = _number(logs.std(ddof=1) * np.sqrt(per_year)) if len(logs) > 1 else None
+        summary['max_drawdown'] = {'value': _number(drawdowns[trough]), 'peak': at(peak), 'trough': at(trough)}
+    return summary
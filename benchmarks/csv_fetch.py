@@ -0,0 +1,90 @@
+"""Compare fetching the stock time series as CSV with fetching them as json.
+
+It reports, for a full daily series of --bars bars, the size of either
+body and the time to parse it into a Frame, the time get_daily takes to
+fetch and parse it from the stand-in of benchmarks/upstream.py with
+either datatype, and the size and time of the tool's result through
+FastMCP with output='rows' and output='columns' once it is cached.
+
+    python benchmarks/csv_fetch.py --bars 6000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('ALPHAVANTAGE_API_KEY', 'demo')
+os.environ['ALPHAVANTAGE_STORE_DIR'] = tempfile.mkdtemp()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as tools  # noqa: E402
+from alphavantage_mcp import csvseries  # noqa: E402
+from alphavantage_mcp.csvseries import from_csv  # noqa: E402
+from alphavantage_mcp.frames import from_json  # noqa: E402
+
+import upstream  # noqa: E402
+
+URL = 'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=IBM&outputsize=full'
+
+
+def timed(func, repeat=20):
+    """ Return the median milliseconds of a call """
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+async def fetched(datatype, symbol):
+    """ Return the milliseconds get_daily takes to fetch a full series with a datatype """
+    csvseries.UPSTREAM_DATATYPE = datatype
+    began = time.perf_counter()
+    await tools.get_daily(symbol, 'full')
+    return (time.perf_counter() - began) * 1000
+
+
+async def called(output):
+    """ Return the characters and milliseconds of a cached get_daily result through FastMCP """
+    began = time.perf_counter()
+    content = await tools.mcp.call_tool('get_daily', {'symbol': 'ROWS', 'outputsize': 'full', 'output': output})
+    elapsed = (time.perf_counter() - began) * 1000
+    blocks = content[0] if isinstance(content, tuple) else content
+    return sum(len(block.text) for block in blocks), elapsed
+
+
+async def run():
+    # The first call opens the connection and imports what the others share
+    await tools.get_daily('WARM')
+    for datatype in ('json', 'csv'):
+        print('get_daily full fetched as %-4s  %7.1f ms' % (datatype, await fetched(datatype, datatype.upper())))
+    await called('rows')
+    for output in ('rows', 'columns'):
+        size, elapsed = await called(output)
+        print("output='%s'%s %7.0f KB %7.1f ms" % (output, ' ' * (8 - len(output)), size / 1024, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bars', type=int, default=6000, help='daily bars of the series')
+    arguments = parser.parse_args()
+    series = upstream.daily_series(arguments.bars)
+    json_body = json.dumps(upstream.daily_response('IBM', series)).encode()
+    csv_body = upstream.daily_csv(series).encode()
+    print('body:  json %7.0f KB   csv %7.0f KB' % (len(json_body) / 1024, len(csv_body) / 1024))
+    print('parse: json %7.1f ms   csv %7.1f ms' % (timed(lambda: from_json(json.loads(json_body))),
+                                                   timed(lambda: from_csv(csv_body, URL))))
+    server = upstream.serve(arguments.bars)
+    try:
+        asyncio.run(run())
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
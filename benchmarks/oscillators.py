@@ -0,0 +1,64 @@
+"""Time the momentum oscillators computed upstream against computed locally.
+
+Every tool is called twice for a fresh symbol, with compute='remote' and
+compute='local', against the stand-in of benchmarks/upstream.py. The
+remote calls fetch one indicator response each; the local ones share a
+single fetch of the daily series. --latency holds every upstream answer
+back, as the round trip to the real api does.
+
+    python benchmarks/oscillators.py --bars 6000 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('ALPHAVANTAGE_API_KEY', 'demo')
+os.environ['ALPHAVANTAGE_STORE_DIR'] = tempfile.mkdtemp()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as tools  # noqa: E402
+from alphavantage_mcp.indicators import INDICATORS  # noqa: E402
+
+import upstream  # noqa: E402
+
+OSCILLATORS = ('MACD', 'MACDEXT', 'STOCH', 'STOCHF', 'RSI', 'STOCHRSI', 'WILLR', 'APO', 'PPO', 'MOM', 'BOP', 'CCI',
+               'CMO', 'ROC', 'ROCR', 'MFI', 'ULTOSC')
+
+
+async def timed(server, tool, symbol, compute):
+    calls = len(server.calls)
+    began = time.perf_counter()
+    await tool(symbol, compute=compute)
+    return time.perf_counter() - began, len(server.calls) - calls
+
+
+async def run(server):
+    print('%-10s %12s %8s %12s %8s' % ('function', 'remote ms', 'calls', 'local ms', 'calls'))
+    totals = [0.0, 0, 0.0, 0]
+    for function in OSCILLATORS:
+        tool = getattr(tools, 'get_%s' % (function.lower(),))
+        remote = await timed(server, tool, 'R%s' % (function,), 'remote')
+        local = await timed(server, tool, 'LOCAL', 'local')
+        print('%-10s %12.1f %8d %12.1f %8d' % (function, remote[0] * 1000, remote[1], local[0] * 1000, local[1]))
+        totals = [total + value for total, value in zip(totals, remote + local)]
+    print('%-10s %12.1f %8d %12.1f %8d' % ('total', totals[0] * 1000, totals[1], totals[2] * 1000, totals[3]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bars', type=int, default=6000, help='daily bars of every symbol')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds each upstream answer is held back')
+    arguments = parser.parse_args()
+    outputs = {function: INDICATORS[function].outputs for function in OSCILLATORS}
+    server = upstream.serve(arguments.bars, arguments.latency, outputs)
+    try:
+        asyncio.run(run(server))
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare time series responses held as decoded json with typed columns.
+
+For a full daily payload of --bars bars it times json.loads alone,
+json.loads plus the conversion to a Frame, and formatting the Frame back
+into the (data, meta_data) pair a tool returns. The peak RSS of holding
+--held payloads of either kind is measured in a separate process each,
+so that one does not inherit the other's heap.
+
+    python benchmarks/typed_columns.py --bars 6000 --held 100
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alphavantage_mcp.frames import from_json  # noqa: E402
+
+import upstream  # noqa: E402
+
+
+def body(bars, symbol='IBM'):
+    return json.dumps(upstream.daily_response(symbol, upstream.daily_series(bars))).encode()
+
+
+def timed(func, repeat=20):
+    """ Return the median milliseconds of a call """
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+def peak_rss():
+    """ Return the peak resident set size of this process in MB """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def hold(kind, bars, held):
+    """ Hold held payloads as decoded json or as Frames and print the RSS they added """
+    payloads = [body(bars, 'S%d' % (i,)) for i in range(held)]
+    before = peak_rss()
+    kept = []
+    for payload in payloads:
+        decoded = json.loads(payload)
+        kept.append(decoded if kind == 'dicts' else from_json(decoded))
+        del decoded
+    print(peak_rss() - before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bars', type=int, default=6000, help='daily bars of the payload')
+    parser.add_argument('--held', type=int, default=100, help='payloads held for the memory measure')
+    parser.add_argument('--hold', choices=('dicts', 'frames'), help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.hold:
+        hold(arguments.hold, arguments.bars, arguments.held)
+        return
+    payload = body(arguments.bars)
+    frame = from_json(json.loads(payload))
+    print('payload: %d bars, %.2f MB' % (arguments.bars, len(payload) / 1e6))
+    print('json.loads:              %7.1f ms' % (timed(lambda: json.loads(payload)),))
+    print('json.loads + from_json:  %7.1f ms' % (timed(lambda: from_json(json.loads(payload))),))
+    print('Frame.data():            %7.1f ms' % (timed(frame.data),))
+    for kind in ('dicts', 'frames'):
+        added = subprocess.run([sys.executable, __file__, '--hold', kind, '--bars', str(arguments.bars),
+                                '--held', str(arguments.held)], capture_output=True, text=True, check=True).stdout
+        print('peak RSS holding %d payloads as %s: +%.0f MB' % (arguments.held, kind, float(added)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""A local stand-in for the AlphaVantage api, for the benchmarks.
+
+serve() answers TIME_SERIES_DAILY, as json or CSV, with a generated
+random walk of daily bars, and every indicator endpoint with a response
+of the size upstream sends for that many bars. It points the
+alpha_vantage wrappers at itself, so it must run before any tool is
+called. Set ALPHAVANTAGE_API_KEY and ALPHAVANTAGE_STORE_DIR before
+importing the server's modules, as they read them on import.
+"""
+import datetime
+import http.server
+import json
+import random
+import threading
+import time
+import urllib.parse
+
+from alpha_vantage.alphavantage import AlphaVantage
+
+FIELDS = ('1. open', '2. high', '3. low', '4. close', '5. volume')
+
+
+def daily_series(bars=6000, seed=1):
+    """ Return the 'Time Series (Daily)' object of a random walk, newest bar first """
+    rnd = random.Random(seed)
+    day, price, series = datetime.date(2000, 1, 3), 100.0, {}
+    while len(series) < bars:
+        if day.weekday() < 5:
+            close = price * (1 + rnd.gauss(0, 0.015))
+            high = max(price, close) * (1 + abs(rnd.gauss(0, 0.006)))
+            low = min(price, close) * (1 - abs(rnd.gauss(0, 0.006)))
+            series[day.isoformat()] = dict(zip(FIELDS, ('%.4f' % price, '%.4f' % high, '%.4f' % low, '%.4f' % close,
+                                                        str(rnd.randint(2000000, 9000000)))))
+            price = close
+        day += datetime.timedelta(days=1)
+    return dict(sorted(series.items(), reverse=True))
+
+
+def daily_response(symbol, series):
+    return {
+        'Meta Data': {'1. Information': 'Daily Prices (open, high, low, close) and Volumes', '2. Symbol': symbol,
+                      '3. Last Refreshed': next(iter(series)), '4. Output Size': 'Full size',
+                      '5. Time Zone': 'US/Eastern'},
+        'Time Series (Daily)': series,
+    }
+
+
+def daily_csv(series):
+    lines = ['timestamp,open,high,low,close,volume']
+    lines += ['%s,%s' % (stamp, ','.join(bar[field] for field in FIELDS)) for stamp, bar in series.items()]
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def indicator_response(function, symbol, series, names=None):
+    """ Return an indicator response with a value per bar for each output name """
+    names = names or (function,)
+    return {
+        'Meta Data': {'1: Symbol': symbol, '2: Indicator': function, '3: Last Refreshed': next(iter(series)),
+                      '4: Interval': 'daily', '5: Time Zone': 'US/Eastern'},
+        'Technical Analysis: %s' % (function,): {stamp: {name: bar['4. close'] for name in names}
+                                                for stamp, bar in series.items()},
+    }
+
+
+class Upstream(object):
+    """ The running stand-in: the queries it answered, in order
+
+    Keyword Arguments:
+        bars:  the number of daily bars of every symbol
+        latency:  seconds each answer is held back, as for a round trip
+            to the real api
+        outputs:  the output names of each indicator, by function; the
+            function itself names the single output of the others
+    """
+
+    def __init__(self, bars=6000, latency=0.0, outputs=None):
+        self.series = daily_series(bars)
+        self.latency = latency
+        self.outputs = outputs or {}
+        self.calls = []
+        upstream = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+                upstream.calls.append(query)
+                body, content_type = upstream.answer(query)
+                time.sleep(upstream.latency)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        AlphaVantage._ALPHA_VANTAGE_API_URL = 'http://127.0.0.1:%d/query?' % (self.server.server_port,)
+
+    def answer(self, query):
+        function, symbol = query.get('function'), query.get('symbol')
+        if function == 'TIME_SERIES_DAILY':
+            series = self.series if query.get('outputsize') == 'full' else dict(list(self.series.items())[:100])
+            if query.get('datatype') == 'csv':
+                return daily_csv(series).encode(), 'application/x-download'
+            return json.dumps(daily_response(symbol, series)).encode(), 'application/json'
+        response = indicator_response(function, symbol, self.series, self.outputs.get(function))
+        return json.dumps(response).encode(), 'application/json'
+
+    def close(self):
+        self.server.shutdown()
+
+
+def serve(bars=6000, latency=0.0, outputs=None):
+    """ Return a running Upstream the alpha_vantage wrappers now call """
+    return Upstream(bars, latency, outputs)
@@ -1,4 +1,8 @@
+import asyncio
+import textwrap
+
 from mcp.server import FastMCP
+from mcp.server.fastmcp import Context
 from alpha_vantage.alphaintelligence import AlphaIntelligence
 from alpha_vantage.commodities import Commodities
 from alpha_vantage.cryptocurrencies import CryptoCurrencies
@@ -9,15 +13,119 @@ from alpha_vantage.options import Options
 from alpha_vantage.techindicators import TechIndicators
 from alpha_vantage.timeseries import TimeSeries
 
-mcp = FastMCP("alphavantage-mcp")
+from alphavantage_mcp.backfill import backfill
+from alphavantage_mcp.bars import load_series, to_response
+from alphavantage_mcp.cache import disk_cache, response_cache
+from alphavantage_mcp.client import connection_stats, shared
+from alphavantage_mcp.frames import Selection, short_name
+from alphavantage_mcp.history import history_stats
+from alphavantage_mcp.indicators import INDICATORS, compute_local, compute_many, compute_updates
+from alphavantage_mcp.keys import key_pool
+from alphavantage_mcp.resample import resample_adjusted, resample_crypto, resample_stats
+from alphavantage_mcp.responses import response_stats
+from alphavantage_mcp.singleflight import single_flight
 
+mcp = FastMCP("alphavantage-mcp")
 
-@mcp.tool()
-def get_intraday(symbol: str, interval: str = '15min', outputsize: str = 'compact',
-                 month: str = None, extended_hours: str = 'true', adjusted: str = 'true', entitlement=None):
+PRICES = ('open', 'high', 'low', 'close')
+
+
+def _quoted(names):
+    """ Return names quoted and listed, e.g. "'open', 'high' and 'low'" """
+    names = ["'%s'" % (name,) for name in names]
+    return names[0] if len(names) == 1 else '%s and %s' % (', '.join(names[:-1]), names[-1])
+
+
+def _selectable(noun, stamps, fields, shape, summary, columns):
+    """ Return a decorator appending the arguments every time series tool
+    passes to its Selection to the tool's docstring, so that they are
+    documented in one place. It goes below @mcp.tool(), which reads the
+    docstring.
+
+    Keyword Arguments:
+        noun:  what the series holds, 'bar' or 'value'
+        stamps:  the timestamp formats start and end take
+        fields:  the text of the fields argument, or None for tools without one
+        shape:  what downsampling keeps the shape of
+        summary:  the statistics summary returns
+        columns:  the names of the columns the 'columns' output holds
+            besides the timestamps
+    """
+    entries = [
+        ('start, end', 'only return the %ss from start to end inclusive, given as %s; an end date takes in the '
+                       'whole day (default None)' % (noun, stamps)),
+        ('limit', 'only return the last limit %ss from start to end (default None)' % (noun,)),
+        ('fields', fields),
+        ('order', "'desc' for the newest %s first or 'asc' for the oldest first (default 'desc')" % (noun,)),
+        ('max_points', 'downsample the %ss to at most that many, keeping the shape of %s (default None)'
+         % (noun, shape)),
+        ('downsample', "the downsampling method, 'lttb' or 'minmax' (default 'lttb')"),
+        ('summary', 'return summary statistics of the %ss instead: %s (default False)' % (noun, summary)),
+        ('output', "'rows' for the upstream object keyed by timestamp or 'columns' for compact columns, "
+                   "{%s} (default 'rows')" % (', '.join("'%s':\xa0[...]" % (name,) for name in ('t',) + columns),)),
+    ]
+    # No line breaks within a column's "'name': [...]"
+    fragment = '\n'.join(textwrap.fill('%s:  %s' % entry, 84, initial_indent=' ' * 8, subsequent_indent=' ' * 12)
+                         for entry in entries if entry[1] is not None).replace('\xa0', ' ')
+
+    def decorate(tool):
+        tool.__doc__ = '%s\n%s\n    ' % (tool.__doc__.rstrip(), fragment)
+        return tool
+    return decorate
+
+
+def bar_selection(*fields):
+    """ Return the selection decorator of a price tool whose bars hold fields """
+    close = 'adjusted close' if 'adjusted close' in fields else 'close'
+    return _selectable('bar', 'YYYY-MM-DD or YYYY-MM-DD HH:MM:SS',
+                       'the fields to return, comma separated, out of %s (default None, all of them)'
+                       % (_quoted(fields),),
+                       'the close', 'the range, percentiles, returns, realized volatility, drawdown and trend of '
+                       'the %s' % (close,), tuple(map(short_name, fields)))
+
+
+def indicator_selection(function):
+    """ Return the selection decorator of the tool of an indicator function """
+    outputs = INDICATORS[function].outputs if function in INDICATORS else (function,)
+    if len(outputs) == 1:
+        fields = 'the outputs to return, here only %s (default None, all of them)' % (_quoted(outputs),)
+    else:
+        fields = 'the outputs to return, comma separated, out of %s (default None, all of them)' % (_quoted(outputs),)
+    return _selectable('value', 'YYYY-MM-DD or YYYY-MM-DD HH:MM:SS', fields,
+                       'the first output returned' if len(outputs) > 1 else 'the %s' % (outputs[0],),
+                       'the range, percentiles and trend, and for positive series the returns, realized '
+                       'volatility and drawdown', tuple(outputs))
+
+
+def series_selection():
+    """ Return the selection decorator of a commodity or economic indicator tool """
+    return _selectable('value', 'YYYY-MM-DD', None, 'the series',
+                       'the range, percentiles and trend, and for positive series the returns, realized '
+                       'volatility and drawdown', ('value',))
+
+
+def _local(compute):
+    """ Return whether an indicator tool computes its indicator locally. It
+    raises ValueError for a compute other than 'local' or 'remote'.
+    """
+    if compute not in ('local', 'remote'):
+        raise ValueError("compute must be 'local' or 'remote', got %r" % (compute,))
+    return compute == 'local'
+
+
+@mcp.tool()
+@bar_selection(*PRICES, 'volume')
+async def get_intraday(symbol: str, interval: str = '15min', outputsize: str = 'compact',
+                       month: str = None, extended_hours: str = 'true', adjusted: str = 'true', entitlement=None,
+                       start: str = None, end: str = None, limit: int = None, fields: str = None, order: str = 'desc',
+                       max_points: int = None, downsample: str = 'lttb', summary: bool = False, output: str = 'rows'):
     """ Return intraday time series in two json objects as data and
     meta_data. It raises ValueError when problems arise
 
+    The bars are served from the local bar store, which holds the months
+    stored in full by backfill_intraday, and coarser intervals are
+    resampled from the full 1-minute series when that is already held.
+
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
         interval:  time interval between two conscutive values,
@@ -41,13 +149,44 @@ def get_intraday(symbol: str, interval: str = '15min', outputsize: str = 'compac
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_intraday(symbol=symbol, interval=interval, outputsize=outputsize, month=month,
-                           extended_hours=extended_hours, adjusted=adjusted, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    columns, meta_data = await load_series(symbol, interval, outputsize, month, entitlement, extended_hours,
+                                           adjusted)
+    return to_response(columns, meta_data, intraday=True, selection=selection)
 
 
 @mcp.tool()
-def get_daily(symbol, outputsize='compact'):
+async def backfill_intraday(symbol: str, interval: str, start_month: str, end_month: str, ctx: Context,
+                            extended_hours: str = 'true', adjusted: str = 'true'):
+    """ Fetch the intraday history of a symbol month by month into the local
+    bar store and return a summary of the run. The months are fetched
+    concurrently within the rate limits, progress and an ETA are reported
+    as each month arrives, and months already stored are skipped, so an
+    interrupted backfill resumes where it stopped. get_intraday then serves
+    the stored months without an upstream call.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  time interval between two conscutive values,
+            supported values are '1min', '5min', '15min', '30min', '60min'
+        start_month:  the first month to fetch, as YYYY-MM, e.g. "2022-01"
+        end_month:  the last month to fetch, as YYYY-MM
+        extended_hours:  'true' includes the extended trading hours, 'false'
+            only the regular ones (default 'true')
+        adjusted:  'true' adjusts the bars for splits and dividends, 'false'
+            returns the as-traded values (default 'true')
+    """
+    async def progress(done, total, message):
+        await ctx.report_progress(done, total)
+        await ctx.info(message)
+
+    return await backfill(symbol, interval, start_month, end_month, extended_hours, adjusted, progress=progress)
+
+
+@mcp.tool()
+@bar_selection(*PRICES, 'volume')
+async def get_daily(symbol, outputsize='compact', start=None, end=None, limit=None, fields=None, order='desc',
+                    max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return daily time series in two json objects as data and
     meta_data. It raises ValueError when problems arise
 
@@ -58,12 +197,15 @@ def get_daily(symbol, outputsize='compact'):
             data series, and 'full' returns the full-length daily times
             series, commonly above 1MB (default 'compact')
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_daily(symbol=symbol, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    return to_response(*await load_series(symbol, 'daily', outputsize), selection=selection)
 
 
 @mcp.tool()
-def get_daily_adjusted(symbol, outputsize='compact', entitlement=None):
+@bar_selection(*PRICES, 'adjusted close', 'volume', 'dividend amount', 'split coefficient')
+async def get_daily_adjusted(symbol, outputsize='compact', entitlement=None,
+                             start=None, end=None, limit=None, fields=None, order='desc',
+                             max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return daily adjusted (date, daily open, daily high, daily low,
     daily close, daily split/dividend-adjusted close, daily volume)
     time series in two json objects as data and
@@ -78,65 +220,84 @@ def get_daily_adjusted(symbol, outputsize='compact', entitlement=None):
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_daily_adjusted(symbol=symbol, outputsize=outputsize, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    ts = shared(TimeSeries)
+    return await ts.get_daily_adjusted(symbol=symbol, outputsize=outputsize, entitlement=entitlement,
+                                       selection=selection)
 
 
 @mcp.tool()
-def get_weekly(symbol):
+@bar_selection(*PRICES, 'volume')
+async def get_weekly(symbol, start=None, end=None, limit=None, fields=None, order='desc',
+                     max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return weekly time series in two json objects as data and
-    meta_data. It raises ValueError when problems arise
+    meta_data. It raises ValueError when problems arise. The bars are
+    resampled from the full daily series when that is already held.
 
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
-
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_weekly(symbol=symbol)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    return to_response(*await load_series(symbol, 'weekly'), selection=selection)
 
 
 @mcp.tool()
-def get_weekly_adjusted(symbol):
+@bar_selection(*PRICES, 'adjusted close', 'volume', 'dividend amount')
+async def get_weekly_adjusted(symbol, start=None, end=None, limit=None, fields=None, order='desc',
+                              max_points=None, downsample='lttb', summary=False, output='rows'):
     """  weekly adjusted time series (last trading day of each week,
     weekly open, weekly high, weekly low, weekly close, weekly adjusted
     close, weekly volume, weekly dividend) of the equity specified,
-    covering up to 20 years of historical data.
+    covering up to 20 years of historical data, resampled from the full
+    daily adjusted series when that is already held.
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
-
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_weekly_adjusted(symbol=symbol)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    resampled = await resample_adjusted(symbol, 'weekly', selection=selection)
+    if resampled is not None:
+        return resampled
+    ts = shared(TimeSeries)
+    return await ts.get_weekly_adjusted(symbol=symbol, selection=selection)
 
 
 @mcp.tool()
-def get_monthly(symbol):
+@bar_selection(*PRICES, 'volume')
+async def get_monthly(symbol, start=None, end=None, limit=None, fields=None, order='desc',
+                      max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return monthly time series in two json objects as data and
-    meta_data. It raises ValueError when problems arise
+    meta_data. It raises ValueError when problems arise. The bars are
+    resampled from the full daily series when that is already held.
 
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
-
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_monthly(symbol=symbol)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    return to_response(*await load_series(symbol, 'monthly'), selection=selection)
 
 
 @mcp.tool()
-def get_monthly_adjusted(symbol):
+@bar_selection(*PRICES, 'adjusted close', 'volume', 'dividend amount')
+async def get_monthly_adjusted(symbol, start=None, end=None, limit=None, fields=None, order='desc',
+                               max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return monthly time series in two json objects as data and
-    meta_data. It raises ValueError when problems arise
+    meta_data. It raises ValueError when problems arise. The bars are
+    resampled from the full daily adjusted series when that is already
+    held.
 
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
-
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_monthly_adjusted(symbol=symbol)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    resampled = await resample_adjusted(symbol, 'monthly', selection=selection)
+    if resampled is not None:
+        return resampled
+    ts = shared(TimeSeries)
+    return await ts.get_monthly_adjusted(symbol=symbol, selection=selection)
 
 
 @mcp.tool()
-def get_quote_endpoint(symbol, entitlement=None):
+async def get_quote_endpoint(symbol, entitlement=None):
     """ Return the latest price and volume information for a
      security of your choice
 
@@ -145,12 +306,12 @@ def get_quote_endpoint(symbol, entitlement=None):
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_quote_endpoint(symbol=symbol, entitlement=entitlement)
+    ts = shared(TimeSeries)
+    return await ts.get_quote_endpoint(symbol=symbol, entitlement=entitlement)
 
 
 @mcp.tool()
-def get_symbol_search(keywords):
+async def get_symbol_search(keywords):
     """ Return best matching symbols and market information
     based on keywords. It raises ValueError when problems arise
 
@@ -158,21 +319,21 @@ def get_symbol_search(keywords):
         keywords: the keywords to query on
 
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_symbol_search(keywords=keywords)
+    ts = shared(TimeSeries)
+    return await ts.get_symbol_search(keywords=keywords)
 
 
 @mcp.tool()
-def get_market_status():
+async def get_market_status():
     """ Return current market status (open vs. closed) of major trading venues.
     It raises ValueError when problems arise
     """
-    ts = TimeSeries(output_format='json')
-    return ts.get_market_status()
+    ts = shared(TimeSeries)
+    return await ts.get_market_status()
 
 
 @mcp.tool()
-def get_company_overview(symbol):
+async def get_company_overview(symbol):
     """
     Returns the company information, financial ratios,
     and other key metrics for the equity specified.
@@ -182,36 +343,36 @@ def get_company_overview(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_company_overview(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_company_overview(symbol=symbol)
 
 
 @mcp.tool()
-def get_dividends(symbol):
+async def get_dividends(symbol):
     """
     Returns historical and future (declared) dividend distributions.
 
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_dividends(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_dividends(symbol=symbol)
 
 
 @mcp.tool()
-def get_splits(symbol):
+async def get_splits(symbol):
     """
     Returns historical split events.
 
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_splits(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_splits(symbol=symbol)
 
 
 @mcp.tool()
-def get_income_statement_annual(symbol):
+async def get_income_statement_annual(symbol):
     """
     Returns the annual and quarterly income statements for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -220,12 +381,12 @@ def get_income_statement_annual(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_income_statement_annual(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_income_statement_annual(symbol=symbol)
 
 
 @mcp.tool()
-def get_income_statement_quarterly(symbol):
+async def get_income_statement_quarterly(symbol):
     """
     Returns the annual and quarterly income statements for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -234,12 +395,12 @@ def get_income_statement_quarterly(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_income_statement_quarterly(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_income_statement_quarterly(symbol=symbol)
 
 
 @mcp.tool()
-def get_balance_sheet_annual(symbol):
+async def get_balance_sheet_annual(symbol):
     """
     Returns the annual and quarterly balance sheets for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -248,12 +409,12 @@ def get_balance_sheet_annual(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_balance_sheet_annual(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_balance_sheet_annual(symbol=symbol)
 
 
 @mcp.tool()
-def get_balance_sheet_quarterly(symbol):
+async def get_balance_sheet_quarterly(symbol):
     """
     Returns the annual and quarterly balance sheets for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -262,12 +423,12 @@ def get_balance_sheet_quarterly(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_balance_sheet_quarterly(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_balance_sheet_quarterly(symbol=symbol)
 
 
 @mcp.tool()
-def get_cash_flow_annual(symbol):
+async def get_cash_flow_annual(symbol):
     """
     Returns the annual and quarterly cash flows for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -276,12 +437,12 @@ def get_cash_flow_annual(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_cash_flow_annual(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_cash_flow_annual(symbol=symbol)
 
 
 @mcp.tool()
-def get_cash_flow_quarterly(symbol):
+async def get_cash_flow_quarterly(symbol):
     """
     Returns the annual and quarterly cash flows for the company of interest.
     Data is generally refreshed on the same day a company reports its latest
@@ -290,12 +451,12 @@ def get_cash_flow_quarterly(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_cash_flow_quarterly(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_cash_flow_quarterly(symbol=symbol)
 
 
 @mcp.tool()
-def get_earnings_annual(symbol):
+async def get_earnings_annual(symbol):
     """
     Returns the annual and quarterly earnings (EPS) for the company of interest.
     Quarterly data also includes analyst estimates and surprise metrics.
@@ -303,12 +464,12 @@ def get_earnings_annual(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_earnings_annual(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_earnings_annual(symbol=symbol)
 
 
 @mcp.tool()
-def get_earnings_quarterly(symbol):
+async def get_earnings_quarterly(symbol):
     """
     Returns the annual and quarterly earnings (EPS) for the company of interest.
     Quarterly data also includes analyst estimates and surprise metrics.
@@ -316,12 +477,38 @@ def get_earnings_quarterly(symbol):
     Keyword Arguments:
         symbol:  the symbol for the equity we want to get its data
     """
-    fd = FundamentalData(output_format='json')
-    return fd.get_earnings_quarterly(symbol=symbol)
+    fd = shared(FundamentalData)
+    return await fd.get_earnings_quarterly(symbol=symbol)
+
+
+@mcp.tool()
+async def get_financial_statements(symbol, period='annual'):
+    """
+    Returns the income statement, balance sheet and cash flow reports for the
+    company of interest in one call. The three statements are fetched in
+    parallel, and each full statement is cached once per symbol, so the
+    get_*_annual and get_*_quarterly tools are served from the same copy.
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        period:  supported values are 'annual' and 'quarterly' (default 'annual')
+    """
+    if period not in ('annual', 'quarterly'):
+        raise ValueError("period must be 'annual' or 'quarterly', not {!r}".format(period))
+    fd = shared(FundamentalData)
+    (income, _), (balance, _), (cash_flow, _) = await asyncio.gather(
+        getattr(fd, 'get_income_statement_' + period)(symbol=symbol),
+        getattr(fd, 'get_balance_sheet_' + period)(symbol=symbol),
+        getattr(fd, 'get_cash_flow_' + period)(symbol=symbol))
+    return {'symbol': symbol, 'period': period, 'income_statement': income,
+            'balance_sheet': balance, 'cash_flow': cash_flow}
 
 
 @mcp.tool()
-def get_sma(self, symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('SMA')
+async def get_sma(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return simple moving average time series in two json objects as data and
     meta_data. It raises ValueError when problems arise
 
@@ -338,14 +525,24 @@ def get_sma(self, symbol, interval='daily', time_period=20, series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_sma(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('SMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_sma(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('EMA')
+async def get_ema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return exponential moving average time series in two json objects
     as data and meta_data. It raises ValueError when problems arise
 
@@ -362,14 +559,24 @@ def get_ema(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('EMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_wma(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('WMA')
+async def get_wma(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return weighted moving average time series in two json objects
     as data and meta_data. It raises ValueError when problems arise
 
@@ -386,14 +593,24 @@ def get_wma(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_wma(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('WMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_wma(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_dema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('DEMA')
+async def get_dema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                   compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                   max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return double exponential moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -410,14 +627,24 @@ def get_dema(symbol, interval='daily', time_period=20, series_type='close', mont
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_dema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                       entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('DEMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_dema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                             month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_tema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('TEMA')
+async def get_tema(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                   compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                   max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return triple exponential moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -434,14 +661,24 @@ def get_tema(symbol, interval='daily', time_period=20, series_type='close', mont
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_tema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                       entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('TEMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_tema(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                             month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_trima(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('TRIMA')
+async def get_trima(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                    compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                    max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return triangular moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -458,14 +695,24 @@ def get_trima(symbol, interval='daily', time_period=20, series_type='close', mon
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_trima(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                        entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('TRIMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_trima(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                              month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_kama(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('KAMA')
+async def get_kama(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                   compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                   max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return Kaufman adaptative moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -482,15 +729,25 @@ def get_kama(symbol, interval='daily', time_period=20, series_type='close', mont
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_kama(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                       entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('KAMA', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_kama(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                             month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_mama(symbol, interval='daily', series_type='close',
-             fastlimit=None, slowlimit=None, month=None, entitlement=None):
+@indicator_selection('MAMA')
+async def get_mama(symbol, interval='daily', series_type='close',
+                   fastlimit=None, slowlimit=None, month=None, entitlement=None, compute='remote',
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Return MESA adaptative moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -510,14 +767,25 @@ def get_mama(symbol, interval='daily', series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_mama(symbol=symbol, interval=interval, series_type=series_type, fastlimit=fastlimit,
-                       slowlimit=slowlimit, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MAMA', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, fastlimit=fastlimit, slowlimit=slowlimit,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_mama(symbol=symbol, interval=interval, series_type=series_type, fastlimit=fastlimit,
+                             slowlimit=slowlimit, month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_vwap(symbol, interval='5min', month=None, entitlement=None):
+@indicator_selection('VWAP')
+async def get_vwap(symbol, interval='5min', month=None, entitlement=None,
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Returns the volume weighted average price (VWAP) for intraday time series.
 
     Keyword Arguments:
@@ -531,12 +799,17 @@ def get_vwap(symbol, interval='5min', month=None, entitlement=None):
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_vwap(symbol=symbol, interval=interval, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    ti = shared(TechIndicators)
+    return await ti.get_vwap(symbol=symbol, interval=interval, month=month, entitlement=entitlement,
+                             selection=selection)
 
 
 @mcp.tool()
-def get_t3(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('T3')
+async def get_t3(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                 compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                 max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return triple exponential moving average time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -553,15 +826,25 @@ def get_t3(symbol, interval='daily', time_period=20, series_type='close', month=
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_t3(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                     entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('T3', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_t3(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                           month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_macd(symbol, interval='daily', series_type='close',
-             fastperiod=None, slowperiod=None, signalperiod=None, month=None, entitlement=None):
+@indicator_selection('MACD')
+async def get_macd(symbol, interval='daily', series_type='close',
+                   fastperiod=None, slowperiod=None, signalperiod=None, month=None, entitlement=None, compute='remote',
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Return the moving average convergence/divergence time series in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -581,16 +864,28 @@ def get_macd(symbol, interval='daily', series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_macd(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
-                       slowperiod=slowperiod, signalperiod=signalperiod, month=month, entitlement=entitlement)
-
-
-@mcp.tool()
-def get_macdext(symbol, interval='daily', series_type='close',
-                fastperiod=None, slowperiod=None, signalperiod=None, fastmatype=None,
-                slowmatype=None, signalmatype=None, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MACD', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, fastperiod=fastperiod, slowperiod=slowperiod,
+                                   signalperiod=signalperiod, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_macd(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
+                             slowperiod=slowperiod, signalperiod=signalperiod, month=month, entitlement=entitlement,
+                             selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('MACDEXT')
+async def get_macdext(symbol, interval='daily', series_type='close',
+                      fastperiod=None, slowperiod=None, signalperiod=None, fastmatype=None,
+                      slowmatype=None, signalmatype=None, month=None, entitlement=None, compute='remote',
+                      start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                      summary=False, output='rows'):
     """ Return the moving average convergence/divergence time series in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -632,16 +927,29 @@ def get_macdext(symbol, interval='daily', series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_macdext(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
-                          slowperiod=slowperiod, signalperiod=signalperiod, fastmatype=fastmatype,
-                          slowmatype=slowmatype, signalmatype=signalmatype, month=month, entitlement=entitlement)
-
-
-@mcp.tool()
-def get_stoch(symbol, interval='daily', fastkperiod=None,
-              slowkperiod=None, slowdperiod=None, slowkmatype=None, slowdmatype=None, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MACDEXT', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, fastperiod=fastperiod, slowperiod=slowperiod,
+                                   signalperiod=signalperiod, fastmatype=fastmatype, slowmatype=slowmatype,
+                                   signalmatype=signalmatype, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_macdext(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
+                                slowperiod=slowperiod, signalperiod=signalperiod, fastmatype=fastmatype,
+                                slowmatype=slowmatype, signalmatype=signalmatype, month=month, entitlement=entitlement,
+                                selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('STOCH')
+async def get_stoch(symbol, interval='daily', fastkperiod=None,
+                    slowkperiod=None, slowdperiod=None, slowkmatype=None, slowdmatype=None, month=None,
+                    entitlement=None, compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                    max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the stochatic oscillator values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -680,16 +988,27 @@ def get_stoch(symbol, interval='daily', fastkperiod=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_stoch(symbol=symbol, interval=interval, fastkperiod=fastkperiod, slowkperiod=slowkperiod,
-                        slowdperiod=slowdperiod, slowkmatype=slowkmatype, slowdmatype=slowdmatype, month=month,
-                        entitlement=entitlement)
-
-
-@mcp.tool()
-def get_stochf(symbol, interval='daily', fastkperiod=None,
-               fastdperiod=None, fastdmatype=None, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('STOCH', symbol, interval, month=month, entitlement=entitlement,
+                                   fastkperiod=fastkperiod, slowkperiod=slowkperiod, slowdperiod=slowdperiod,
+                                   slowkmatype=slowkmatype, slowdmatype=slowdmatype, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_stoch(symbol=symbol, interval=interval, fastkperiod=fastkperiod, slowkperiod=slowkperiod,
+                              slowdperiod=slowdperiod, slowkmatype=slowkmatype, slowdmatype=slowdmatype, month=month,
+                              entitlement=entitlement, selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('STOCHF')
+async def get_stochf(symbol, interval='daily', fastkperiod=None,
+                     fastdperiod=None, fastdmatype=None, month=None, entitlement=None, compute='remote',
+                     start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                     summary=False, output='rows'):
     """ Return the stochatic oscillator values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -722,14 +1041,25 @@ def get_stochf(symbol, interval='daily', fastkperiod=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_stochf(symbol=symbol, interval=interval, fastkperiod=fastkperiod, fastdperiod=fastdperiod,
-                         fastdmatype=fastdmatype, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('STOCHF', symbol, interval, month=month, entitlement=entitlement,
+                                   fastkperiod=fastkperiod, fastdperiod=fastdperiod, fastdmatype=fastdmatype,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_stochf(symbol=symbol, interval=interval, fastkperiod=fastkperiod, fastdperiod=fastdperiod,
+                               fastdmatype=fastdmatype, month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_rsi(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('RSI')
+async def get_rsi(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the relative strength index time series in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -746,16 +1076,26 @@ def get_rsi(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_rsi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
-
-
-@mcp.tool()
-def get_stochrsi(symbol, interval='daily', time_period=20,
-                 series_type='close', fastkperiod=None, fastdperiod=None,
-                 fastdmatype=None, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('RSI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_rsi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('STOCHRSI')
+async def get_stochrsi(symbol, interval='daily', time_period=20,
+                       series_type='close', fastkperiod=None, fastdperiod=None,
+                       fastdmatype=None, month=None, entitlement=None, compute='remote',
+                       start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Return the stochatic relative strength index in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -791,15 +1131,26 @@ def get_stochrsi(symbol, interval='daily', time_period=20,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_stochrsi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
-                           fastkperiod=fastkperiod, fastdperiod=fastdperiod, fastdmatype=fastdmatype, month=month,
-                           entitlement=entitlement)
-
-
-@mcp.tool()
-def get_willr(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('STOCHRSI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, fastkperiod=fastkperiod,
+                                   fastdperiod=fastdperiod, fastdmatype=fastdmatype, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_stochrsi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                                 fastkperiod=fastkperiod, fastdperiod=fastdperiod, fastdmatype=fastdmatype, month=month,
+                                 entitlement=entitlement, selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('WILLR')
+async def get_willr(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                    start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                    summary=False, output='rows'):
     """ Return the Williams' %R (WILLR) values in two json objects as data
     and meta_data. It raises ValueError when problems arise
 
@@ -814,13 +1165,24 @@ def get_willr(symbol, interval='daily', time_period=20, month=None, entitlement=
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_willr(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('WILLR', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_willr(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                              entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_adx(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('ADX')
+async def get_adx(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return  the average directional movement index values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -835,13 +1197,24 @@ def get_adx(symbol, interval='daily', time_period=20, month=None, entitlement=No
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_adx(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ADX', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_adx(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                            entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_adxr(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('ADXR')
+async def get_adxr(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Return  the average directional movement index  rating in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -856,14 +1229,25 @@ def get_adxr(symbol, interval='daily', time_period=20, month=None, entitlement=N
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_adxr(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ADXR', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_adxr(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                             entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_apo(symbol, interval='daily', series_type='close',
-            fastperiod=None, slowperiod=None, matype=None, month=None, entitlement=None):
+@indicator_selection('APO')
+async def get_apo(symbol, interval='daily', series_type='close',
+                  fastperiod=None, slowperiod=None, matype=None, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the absolute price oscillator values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -895,15 +1279,27 @@ def get_apo(symbol, interval='daily', series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_apo(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
-                      slowperiod=slowperiod, matype=matype, month=month, entitlement=entitlement)
-
-
-@mcp.tool()
-def get_ppo(symbol, interval='daily', series_type='close',
-            fastperiod=None, slowperiod=None, matype=None, month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('APO', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, fastperiod=fastperiod, slowperiod=slowperiod, matype=matype,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_apo(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
+                            slowperiod=slowperiod, matype=matype, month=month, entitlement=entitlement,
+                            selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('PPO')
+async def get_ppo(symbol, interval='daily', series_type='close',
+                  fastperiod=None, slowperiod=None, matype=None, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the percentage price oscillator values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -935,14 +1331,26 @@ def get_ppo(symbol, interval='daily', series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ppo(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
-                      slowperiod=slowperiod, matype=matype, month=month, entitlement=entitlement)
-
-
-@mcp.tool()
-def get_mom(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('PPO', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, fastperiod=fastperiod, slowperiod=slowperiod, matype=matype,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ppo(symbol=symbol, interval=interval, series_type=series_type, fastperiod=fastperiod,
+                            slowperiod=slowperiod, matype=matype, month=month, entitlement=entitlement,
+                            selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('MOM')
+async def get_mom(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the momentum values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -959,14 +1367,24 @@ def get_mom(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_mom(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MOM', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_mom(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_bop(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('BOP')
+async def get_bop(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the balance of power values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -981,13 +1399,24 @@ def get_bop(symbol, interval='daily', time_period=20, month=None, entitlement=No
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_bop(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('BOP', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_bop(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                            entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_cci(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('CCI')
+async def get_cci(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the commodity channel index values  in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1002,13 +1431,24 @@ def get_cci(symbol, interval='daily', time_period=20, month=None, entitlement=No
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_cci(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('CCI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_cci(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                            entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_cmo(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('CMO')
+async def get_cmo(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Chande momentum oscillator in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1025,14 +1465,24 @@ def get_cmo(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_cmo(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('CMO', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_cmo(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_roc(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('ROC')
+async def get_roc(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the rate of change values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1049,14 +1499,24 @@ def get_roc(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_roc(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ROC', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_roc(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_rocr(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('ROCR')
+async def get_rocr(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                   compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                   max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the rate of change ratio values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1073,14 +1533,24 @@ def get_rocr(symbol, interval='daily', time_period=20, series_type='close', mont
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_rocr(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                       entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ROCR', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_rocr(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                             month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_aroon(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('AROON')
+async def get_aroon(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                    compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                    max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the aroon values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1097,14 +1567,24 @@ def get_aroon(symbol, interval='daily', time_period=20, series_type='close', mon
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_aroon(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                        entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('AROON', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_aroon(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                              month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_aroonosc(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('AROONOSC')
+async def get_aroonosc(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                       compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                       max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the aroon oscillator values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1121,14 +1601,24 @@ def get_aroonosc(symbol, interval='daily', time_period=20, series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_aroonosc(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
-                           month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('AROONOSC', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_aroonosc(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                                 month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_mfi(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('MFI')
+async def get_mfi(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the money flow index values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1145,14 +1635,24 @@ def get_mfi(symbol, interval='daily', time_period=20, series_type='close', month
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_mfi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MFI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_mfi(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                            month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_trix(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('TRIX')
+async def get_trix(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Return the1-day rate of change of a triple smooth exponential
     moving average in two json objects as data and meta_data.
     It raises ValueError when problems arise
@@ -1171,14 +1671,18 @@ def get_trix(symbol, interval='daily', time_period=20, series_type='close', mont
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_trix(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                       entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    ti = shared(TechIndicators)
+    return await ti.get_trix(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                             month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ultosc(symbol, interval='daily', timeperiod1=None,
-               timeperiod2=None, timeperiod3=None, month=None, entitlement=None):
+@indicator_selection('ULTOSC')
+async def get_ultosc(symbol, interval='daily', timeperiod1=None,
+                     timeperiod2=None, timeperiod3=None, month=None, entitlement=None, compute='remote',
+                     start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                     summary=False, output='rows'):
     """ Return the ultimate oscillaror values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1198,14 +1702,25 @@ def get_ultosc(symbol, interval='daily', timeperiod1=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ultosc(symbol=symbol, interval=interval, timeperiod1=timeperiod1, timeperiod2=timeperiod2,
-                         timeperiod3=timeperiod3, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ULTOSC', symbol, interval, month=month, entitlement=entitlement,
+                                   timeperiod1=timeperiod1, timeperiod2=timeperiod2, timeperiod3=timeperiod3,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ultosc(symbol=symbol, interval=interval, timeperiod1=timeperiod1, timeperiod2=timeperiod2,
+                               timeperiod3=timeperiod3, month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_dx(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+@indicator_selection('DX')
+async def get_dx(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                 compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                 max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the directional movement index values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1222,14 +1737,24 @@ def get_dx(symbol, interval='daily', time_period=20, series_type='close', month=
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_dx(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type, month=month,
-                     entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('DX', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_dx(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                           month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_minus_di(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('MINUS_DI')
+async def get_minus_di(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                       start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Return the minus directional indicator values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1244,14 +1769,24 @@ def get_minus_di(symbol, interval='daily', time_period=20, month=None, entitleme
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_minus_di(symbol=symbol, interval=interval, time_period=time_period, month=month,
-                           entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MINUS_DI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_minus_di(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                                 entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_plus_di(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('PLUS_DI')
+async def get_plus_di(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                      start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                      summary=False, output='rows'):
     """ Return the plus directional indicator values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1266,14 +1801,24 @@ def get_plus_di(symbol, interval='daily', time_period=20, month=None, entitlemen
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_plus_di(symbol=symbol, interval=interval, time_period=time_period, month=month,
-                          entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('PLUS_DI', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_plus_di(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                                entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_minus_dm(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('MINUS_DM')
+async def get_minus_dm(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                       start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Return the minus directional movement values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1287,14 +1832,24 @@ def get_minus_dm(symbol, interval='daily', time_period=20, month=None, entitleme
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_minus_dm(symbol=symbol, interval=interval, time_period=time_period, month=month,
-                           entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('MINUS_DM', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_minus_dm(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                                 entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_plus_dm(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('PLUS_DM')
+async def get_plus_dm(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                      start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                      summary=False, output='rows'):
     """ Return the plus directional movement values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1308,15 +1863,25 @@ def get_plus_dm(symbol, interval='daily', time_period=20, month=None, entitlemen
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_plus_dm(symbol=symbol, interval=interval, time_period=time_period, month=month,
-                          entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('PLUS_DM', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_plus_dm(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                                entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_bbands(symbol, interval='daily', time_period=20, series_type='close',
-               nbdevup=None, nbdevdn=None, matype=None, month=None, entitlement=None):
+@indicator_selection('BBANDS')
+async def get_bbands(symbol, interval='daily', time_period=20, series_type='close',
+                     nbdevup=None, nbdevdn=None, matype=None, month=None, entitlement=None, compute='remote',
+                     start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                     summary=False, output='rows'):
     """ Return the bollinger bands values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -1353,14 +1918,26 @@ def get_bbands(symbol, interval='daily', time_period=20, series_type='close',
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
-    """
-    ti = TechIndicators(output_format='json')
-    return ti.get_bbands(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
-                         nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype, month=month, entitlement=entitlement)
-
-
-@mcp.tool()
-def get_midpoint(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None):
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('BBANDS', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, series_type=series_type, nbdevup=nbdevup, nbdevdn=nbdevdn,
+                                   matype=matype, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_bbands(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                               nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype, month=month, entitlement=entitlement,
+                               selection=selection)
+
+
+@mcp.tool()
+@indicator_selection('MIDPOINT')
+async def get_midpoint(symbol, interval='daily', time_period=20, series_type='close', month=None, entitlement=None,
+                       start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Return the midpoint values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1378,13 +1955,17 @@ def get_midpoint(symbol, interval='daily', time_period=20, series_type='close',
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_midpoint(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
-                           month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    ti = shared(TechIndicators)
+    return await ti.get_midpoint(symbol=symbol, interval=interval, time_period=time_period, series_type=series_type,
+                                 month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_midprice(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('MIDPRICE')
+async def get_midprice(symbol, interval='daily', time_period=20, month=None, entitlement=None,
+                       start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Return the midprice values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1400,13 +1981,17 @@ def get_midprice(symbol, interval='daily', time_period=20, month=None, entitleme
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_midprice(symbol=symbol, interval=interval, time_period=time_period, month=month,
-                           entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    ti = shared(TechIndicators)
+    return await ti.get_midprice(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                                 entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_sar(symbol, interval='daily', acceleration=None, maximum=None, month=None, entitlement=None):
+@indicator_selection('SAR')
+async def get_sar(symbol, interval='daily', acceleration=None, maximum=None, month=None, entitlement=None,
+                  compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                  max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the midprice values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1424,14 +2009,24 @@ def get_sar(symbol, interval='daily', acceleration=None, maximum=None, month=Non
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_sar(symbol=symbol, interval=interval, acceleration=acceleration, maximum=maximum, month=month,
-                      entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('SAR', symbol, interval, month=month, entitlement=entitlement,
+                                   acceleration=acceleration, maximum=maximum, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_sar(symbol=symbol, interval=interval, acceleration=acceleration, maximum=maximum, month=month,
+                            entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_trange(symbol, interval='daily', month=None, entitlement=None):
+@indicator_selection('TRANGE')
+async def get_trange(symbol, interval='daily', month=None, entitlement=None, compute='remote',
+                     start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                     summary=False, output='rows'):
     """ Return the true range values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1445,13 +2040,24 @@ def get_trange(symbol, interval='daily', month=None, entitlement=None):
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_trange(symbol=symbol, interval=interval, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('TRANGE', symbol, interval, month=month, entitlement=entitlement,
+                                   selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_trange(symbol=symbol, interval=interval, month=month, entitlement=entitlement,
+                               selection=selection)
 
 
 @mcp.tool()
-def get_atr(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('ATR')
+async def get_atr(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the average true range values in two json objects as
     data and meta_data. It raises ValueError when problems arise
 
@@ -1466,13 +2072,24 @@ def get_atr(symbol, interval='daily', time_period=20, month=None, entitlement=No
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_atr(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ATR', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_atr(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                            entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_natr(symbol, interval='daily', time_period=20, month=None, entitlement=None):
+@indicator_selection('NATR')
+async def get_natr(symbol, interval='daily', time_period=20, month=None, entitlement=None, compute='remote',
+                   start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                   summary=False, output='rows'):
     """ Return the normalized average true range values in two json objects
     as data and meta_data. It raises ValueError when problems arise
 
@@ -1487,13 +2104,24 @@ def get_natr(symbol, interval='daily', time_period=20, month=None, entitlement=N
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_natr(symbol=symbol, interval=interval, time_period=time_period, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('NATR', symbol, interval, month=month, entitlement=entitlement,
+                                   time_period=time_period, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_natr(symbol=symbol, interval=interval, time_period=time_period, month=month,
+                             entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ad(symbol, interval='daily', month=None, entitlement=None):
+@indicator_selection('AD')
+async def get_ad(symbol, interval='daily', month=None, entitlement=None, compute='remote',
+                 start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                 summary=False, output='rows'):
     """ Return the Chaikin A/D line values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1507,14 +2135,23 @@ def get_ad(symbol, interval='daily', month=None, entitlement=None):
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ad(symbol=symbol, interval=interval, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('AD', symbol, interval, month=month, entitlement=entitlement, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ad(symbol=symbol, interval=interval, month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_adosc(symbol, interval='daily', fastperiod=None,
-              slowperiod=None, month=None, entitlement=None):
+@indicator_selection('ADOSC')
+async def get_adosc(symbol, interval='daily', fastperiod=None,
+                    slowperiod=None, month=None, entitlement=None, compute='remote',
+                    start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                    summary=False, output='rows'):
     """ Return the Chaikin A/D oscillator values in two
     json objects as data and meta_data. It raises ValueError when problems
     arise
@@ -1531,14 +2168,24 @@ def get_adosc(symbol, interval='daily', fastperiod=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_adosc(symbol=symbol, interval=interval, fastperiod=fastperiod, slowperiod=slowperiod, month=month,
-                        entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('ADOSC', symbol, interval, month=month, entitlement=entitlement,
+                                   fastperiod=fastperiod, slowperiod=slowperiod, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_adosc(symbol=symbol, interval=interval, fastperiod=fastperiod, slowperiod=slowperiod,
+                              month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_obv(symbol, interval='daily', month=None, entitlement=None):
+@indicator_selection('OBV')
+async def get_obv(symbol, interval='daily', month=None, entitlement=None, compute='remote',
+                  start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                  summary=False, output='rows'):
     """ Return the on balance volume values in two json
     objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1552,13 +2199,22 @@ def get_obv(symbol, interval='daily', month=None, entitlement=None):
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_obv(symbol=symbol, interval=interval, month=month, entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('OBV', symbol, interval, month=month, entitlement=entitlement, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_obv(symbol=symbol, interval=interval, month=month, entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_trendline(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_TRENDLINE')
+async def get_ht_trendline(symbol, interval='daily', series_type='close', month=None, entitlement=None,
+                           compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                           max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Hilbert transform, instantaneous trendline values in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1574,14 +2230,24 @@ def get_ht_trendline(symbol, interval='daily', series_type='close', month=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_trendline(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                               entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_TRENDLINE', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_trendline(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                     entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_sine(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_SINE')
+async def get_ht_sine(symbol, interval='daily', series_type='close', month=None, entitlement=None, compute='remote',
+                      start=None, end=None, limit=None, fields=None, order='desc', max_points=None, downsample='lttb',
+                      summary=False, output='rows'):
     """ Return the Hilbert transform, sine wave values in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1597,14 +2263,24 @@ def get_ht_sine(symbol, interval='daily', series_type='close', month=None, entit
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_sine(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                          entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_SINE', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_sine(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_trendmode(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_TRENDMODE')
+async def get_ht_trendmode(symbol, interval='daily', series_type='close', month=None, entitlement=None,
+                           compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                           max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Hilbert transform, trend vs cycle mode in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1620,14 +2296,24 @@ def get_ht_trendmode(symbol, interval='daily', series_type='close', month=None,
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_trendmode(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                               entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_TRENDMODE', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_trendmode(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                     entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_dcperiod(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_DCPERIOD')
+async def get_ht_dcperiod(symbol, interval='daily', series_type='close', month=None, entitlement=None,
+                          compute='remote', start=None, end=None, limit=None, fields=None, order='desc',
+                          max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Hilbert transform, dominant cycle period in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1643,14 +2329,24 @@ def get_ht_dcperiod(symbol, interval='daily', series_type='close', month=None, e
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_dcperiod(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                              entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_DCPERIOD', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_dcperiod(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                    entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_dcphase(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_DCPHASE')
+async def get_ht_dcphase(symbol, interval='daily', series_type='close', month=None, entitlement=None, compute='remote',
+                         start=None, end=None, limit=None, fields=None, order='desc',
+                         max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Hilbert transform, dominant cycle phase in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1666,14 +2362,24 @@ def get_ht_dcphase(symbol, interval='daily', series_type='close', month=None, en
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_dcphase(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                             entitlement=entitlement)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_DCPHASE', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_dcphase(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                   entitlement=entitlement, selection=selection)
 
 
 @mcp.tool()
-def get_ht_phasor(symbol, interval='daily', series_type='close', month=None, entitlement=None):
+@indicator_selection('HT_PHASOR')
+async def get_ht_phasor(symbol, interval='daily', series_type='close', month=None, entitlement=None, compute='remote',
+                        start=None, end=None, limit=None, fields=None, order='desc',
+                        max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Return the Hilbert transform, phasor components in two
     json objects as data and meta_data. It raises ValueError when problems arise
 
@@ -1689,135 +2395,239 @@ def get_ht_phasor(symbol, interval='daily', series_type='close', month=None, ent
             based on the most recent 30 days of intraday data.
         entitlement:  Supported values are 'realtime' for realtime US stock market data
             or 'delayed' for 15-minute delayed US stock market data
+        compute:  'remote' calls the indicator endpoint, 'local' computes the
+            indicator from the cached daily or intraday price series, so that
+            several indicators of one symbol cost a single api call (default 'remote')
+    """
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    if _local(compute):
+        return await compute_local('HT_PHASOR', symbol, interval, month=month, entitlement=entitlement,
+                                   series_type=series_type, selection=selection)
+    ti = shared(TechIndicators)
+    return await ti.get_ht_phasor(symbol=symbol, interval=interval, series_type=series_type, month=month,
+                                  entitlement=entitlement, selection=selection)
+
+
+@mcp.tool()
+async def get_indicators(symbol, interval='daily', specs=None, month=None, entitlement=None):
+    """ Return several technical indicators of one symbol in two json objects
+    as data and meta_data, all computed locally from a single fetch of the
+    price series. data holds the shared 'index' of timestamps, newest first,
+    and 'columns' with one list of values per indicator output, aligned on
+    that index and null while an indicator is warming up.
+    It raises ValueError when problems arise
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  time interval between two conscutive values,
+            supported values are '1min', '5min', '15min', '30min', '60min', 'daily',
+            'weekly', 'monthly' (default 'daily')
+        specs:  list of indicators, each an upstream function name such as 'RSI'
+            or an object with 'function', its arguments and an optional column
+            'name', e.g. [{'function': 'SMA', 'time_period': 50}, 'RSI',
+            {'function': 'BBANDS', 'time_period': 20, 'name': 'BB'}].
+            Indicators with several outputs get one column per output, named
+            '<name>.<output>', e.g. 'BB.Real Upper Band'
+        month:  ONLY applicable to intraday intervals.
+            By default, not set and the technical indicator values will be calculated
+            based on the most recent 30 days of intraday data.
+        entitlement:  Supported values are 'realtime' for realtime US stock market data
+            or 'delayed' for 15-minute delayed US stock market data
+    """
+    return await compute_many(symbol, specs or [], interval, month=month, entitlement=entitlement)
+
+
+@mcp.tool()
+async def get_indicator_updates(symbol, interval='daily', specs=None, since=None, entitlement=None):
+    """ Return the latest values of streamed EMA, RSI and MACD indicators of
+    one symbol in two json objects as data and meta_data, laid out as by
+    get_indicators. Each indicator keeps its state between calls, also across
+    restarts when the disk cache is enabled, and only steps over the bars that
+    arrived since, so refreshing a live view does not recompute the history.
+    It raises ValueError when problems arise
+
+    Keyword Arguments:
+        symbol:  the symbol for the equity we want to get its data
+        interval:  time interval between two conscutive values,
+            supported values are '1min', '5min', '15min', '30min', '60min', 'daily',
+            'weekly', 'monthly' (default 'daily')
+        specs:  list of indicators as for get_indicators, each of 'EMA', 'RSI'
+            or 'MACD', e.g. [{'function': 'EMA', 'time_period': 9}, 'MACD']
+        since:  timestamp of the last bar already received; the values of the
+            bars after it are returned. By default only the latest bar is
+        entitlement:  Supported values are 'realtime' for realtime US stock market data
+            or 'delayed' for 15-minute delayed US stock market data
     """
-    ti = TechIndicators(output_format='json')
-    return ti.get_ht_phasor(symbol=symbol, interval=interval, series_type=series_type, month=month,
-                            entitlement=entitlement)
+    return await compute_updates(symbol, specs or [], interval, since=since, entitlement=entitlement)
 
 
 @mcp.tool()
-def get_wti(interval='monthly'):
+@series_selection()
+async def get_wti(interval='monthly',
+                  start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                  output='rows'):
     """ Returns the West Texas Intermediate (WTI) crude oil prices.
 
     Keyword Arguments:
         interval:  supported values are 'daily', 'weekly', 'monthly' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_wti(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_wti(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_brent(interval='monthly'):
+@series_selection()
+async def get_brent(interval='monthly',
+                    start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                    output='rows'):
     """ Returns the Brent (Europe) crude oil prices.
 
     Keyword Arguments:
         interval:  supported values are 'daily', 'weekly', 'monthly' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_brent(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_brent(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_natural_gas(interval='monthly'):
+@series_selection()
+async def get_natural_gas(interval='monthly',
+                          start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                          summary=False, output='rows'):
     """ Returns the Henry Hub natural gas spot prices.
 
     Keyword Arguments:
         interval:  supported values are 'daily', 'weekly', 'monthly' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_natural_gas(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_natural_gas(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_copper(interval='monthly'):
+@series_selection()
+async def get_copper(interval='monthly',
+                     start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                     output='rows'):
     """ Returns the global price of copper.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_copper(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_copper(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_aluminum(interval='monthly'):
+@series_selection()
+async def get_aluminum(interval='monthly',
+                       start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Returns the global price of aluminum.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_aluminum(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_aluminum(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_wheat(interval='monthly'):
+@series_selection()
+async def get_wheat(interval='monthly',
+                    start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                    output='rows'):
     """ Returns the global price of wheat.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_wheat(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_wheat(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_corn(interval='monthly'):
+@series_selection()
+async def get_corn(interval='monthly',
+                   start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                   output='rows'):
     """ Returns the global price of corn.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_corn(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_corn(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_cotton(interval='monthly'):
+@series_selection()
+async def get_cotton(interval='monthly',
+                     start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                     output='rows'):
     """ Returns the global price of cotton.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_cotton(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_cotton(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_sugar(interval='monthly'):
+@series_selection()
+async def get_sugar(interval='monthly',
+                    start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                    output='rows'):
     """ Returns the global price of sugar.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_sugar(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_sugar(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_coffee(interval='monthly'):
+@series_selection()
+async def get_coffee(interval='monthly',
+                     start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                     output='rows'):
     """ Returns the global price of coffee.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_coffee(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_coffee(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_price_index(interval='monthly'):
+@series_selection()
+async def get_price_index(interval='monthly',
+                          start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                          summary=False, output='rows'):
     """ Returns the global price index of all commodities.
 
     Keyword Arguments:
         interval:  supported values are 'monthly', 'quarterly', 'annual' (default 'monthly')
     """
-    cm = Commodities(output_format='json')
-    return cm.get_price_index(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    cm = shared(Commodities)
+    return await cm.get_price_index(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_currency_exchange_rate(from_currency, to_currency):
+async def get_currency_exchange_rate(from_currency, to_currency):
     """ Returns the realtime exchange rate for any pair of physical
     currency (e.g., EUR) or physical currency (e.g., USD).
 
@@ -1829,12 +2639,15 @@ def get_currency_exchange_rate(from_currency, to_currency):
         It can either be a physical currency or digital/crypto currency.
         For example: to_currency=USD or to_currency=BTC.
     """
-    fg = ForeignExchange(output_format='json')
-    return fg.get_currency_exchange_rate(from_currency, to_currency)
+    fg = shared(ForeignExchange)
+    return await fg.get_currency_exchange_rate(from_currency, to_currency)
 
 
 @mcp.tool()
-def get_currency_exchange_intraday(from_symbol, to_symbol, interval='15min', outputsize='compact'):
+@bar_selection(*PRICES)
+async def get_currency_exchange_intraday(from_symbol, to_symbol, interval='15min', outputsize='compact',
+                                         start=None, end=None, limit=None, fields=None, order='desc',
+                                         max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns the intraday exchange rate for any pair of physical
     currency (e.g., EUR) or physical currency (e.g., USD).
 
@@ -1852,12 +2665,17 @@ def get_currency_exchange_intraday(from_symbol, to_symbol, interval='15min', out
             data series, and 'full' returns the full-length intraday times
             series, commonly above 1MB (default 'compact')
     """
-    fg = ForeignExchange(output_format='json')
-    return fg.get_currency_exchange_intraday(from_symbol, to_symbol, interval=interval, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    fg = shared(ForeignExchange)
+    return await fg.get_currency_exchange_intraday(from_symbol, to_symbol, interval=interval, outputsize=outputsize,
+                                                   selection=selection)
 
 
 @mcp.tool()
-def get_currency_exchange_daily(from_symbol, to_symbol, outputsize='compact'):
+@bar_selection(*PRICES)
+async def get_currency_exchange_daily(from_symbol, to_symbol, outputsize='compact',
+                                      start=None, end=None, limit=None, fields=None, order='desc',
+                                      max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns the daily exchange rate for any pair of physical
     currency (e.g., EUR) or physical currency (e.g., USD).
 
@@ -1872,12 +2690,16 @@ def get_currency_exchange_daily(from_symbol, to_symbol, outputsize='compact'):
             data series, and 'full' returns the full-length daily times
             series, commonly above 1MB (default 'compact')
     """
-    fg = ForeignExchange(output_format='json')
-    return fg.get_currency_exchange_daily(from_symbol, to_symbol, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    fg = shared(ForeignExchange)
+    return await fg.get_currency_exchange_daily(from_symbol, to_symbol, outputsize=outputsize, selection=selection)
 
 
 @mcp.tool()
-def get_currency_exchange_weekly(from_symbol, to_symbol, outputsize='compact'):
+@bar_selection(*PRICES)
+async def get_currency_exchange_weekly(from_symbol, to_symbol, outputsize='compact',
+                                       start=None, end=None, limit=None, fields=None, order='desc',
+                                       max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns the weekly exchange rate for any pair of physical
     currency (e.g., EUR) or physical currency (e.g., USD).
 
@@ -1892,12 +2714,16 @@ def get_currency_exchange_weekly(from_symbol, to_symbol, outputsize='compact'):
             data series, and 'full' returns the full-length weekly times
             series, commonly above 1MB (default 'compact')
     """
-    fg = ForeignExchange(output_format='json')
-    return fg.get_currency_exchange_weekly(from_symbol, to_symbol, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    fg = shared(ForeignExchange)
+    return await fg.get_currency_exchange_weekly(from_symbol, to_symbol, outputsize=outputsize, selection=selection)
 
 
 @mcp.tool()
-def get_currency_exchange_monthly(from_symbol, to_symbol, outputsize='compact'):
+@bar_selection(*PRICES)
+async def get_currency_exchange_monthly(from_symbol, to_symbol, outputsize='compact',
+                                        start=None, end=None, limit=None, fields=None, order='desc',
+                                        max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns the monthly exchange rate for any pair of physical
     currency (e.g., EUR) or physical currency (e.g., USD).
 
@@ -1915,31 +2741,45 @@ def get_currency_exchange_monthly(from_symbol, to_symbol, outputsize='compact'):
             data series, and 'full' returns the full-length monthly times
             series, commonly above 1MB (default 'compact')
     """
-    fg = ForeignExchange(output_format='json')
-    return fg.get_currency_exchange_monthly(from_symbol, to_symbol, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    fg = shared(ForeignExchange)
+    return await fg.get_currency_exchange_monthly(from_symbol, to_symbol, outputsize=outputsize, selection=selection)
 
 
 @mcp.tool()
-def get_real_gdp(interval='annual'):
+@series_selection()
+async def get_real_gdp(interval='annual',
+                       start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Returns the annual and quarterly Real GDP of the United States
 
     Keyword Arguments:
         interval:  supported values are 'quarterly', 'annual' (default 'annual')
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_real_gdp(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_real_gdp(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_real_gdp_per_capita(interval='annual'):
+@series_selection()
+async def get_real_gdp_per_capita(interval='annual',
+                                  start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                                  summary=False, output='rows'):
     """ Returns the quarterly Real GDP per Capita data of the United States
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_real_gdp_per_capita(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_real_gdp_per_capita(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_treasury_yield(interval='monthly', maturity='10year'):
+@series_selection()
+async def get_treasury_yield(interval='monthly', maturity='10year',
+                             start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                             summary=False, output='rows'):
     """ Returns the US treasury yield of a given maturity timeline
 
     Keyword Arguments:
@@ -1947,75 +2787,109 @@ def get_treasury_yield(interval='monthly', maturity='10year'):
         maturity:  supported values are '3month', '2year', '5year', '7year',
             '10year', '30year' (default '10year')
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_treasury_yield(interval=interval, maturity=maturity)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_treasury_yield(interval=interval, maturity=maturity, selection=selection)
 
 
 @mcp.tool()
-def get_ffr(interval='monthly'):
+@series_selection()
+async def get_ffr(interval='monthly',
+                  start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                  output='rows'):
     """ Returns the federal funds rate (interest rate) of the United States
 
     Keyword Arguments:
         interval:  supported values are 'daily', 'weekly', 'monthly' (default 'monthly')
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_ffr(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_ffr(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_cpi(interval='monthly'):
+@series_selection()
+async def get_cpi(interval='monthly',
+                  start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb', summary=False,
+                  output='rows'):
     """ Returns the consumer price index of the United States
 
     Keyword Arguments:
         interval:  supported values are 'semiannual', 'monthly' (default 'monthly')
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_cpi(interval=interval)
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_cpi(interval=interval, selection=selection)
 
 
 @mcp.tool()
-def get_inflation():
+@series_selection()
+async def get_inflation(start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                        summary=False, output='rows'):
     """ Returns the annual inflation rates (consumer prices) of the United States
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_inflation()
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_inflation(selection=selection)
 
 
 @mcp.tool()
-def get_retail_sales():
+@series_selection()
+async def get_retail_sales(start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                           summary=False, output='rows'):
     """ Returns the monthly Advance Retail Sales: Retail Trade data of the United States
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_retail_sales()
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_retail_sales(selection=selection)
 
 
 @mcp.tool()
-def get_durables():
+@series_selection()
+async def get_durables(start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                       summary=False, output='rows'):
     """ Returns the monthly manufacturers' new orders of durable goods in the United States
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_durables()
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_durables(selection=selection)
 
 
 @mcp.tool()
-def get_unemployment():
+@series_selection()
+async def get_unemployment(start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                           summary=False, output='rows'):
     """ Returns the monthly unemployment data of the United States
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_unemployment()
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_unemployment(selection=selection)
 
 
 @mcp.tool()
-def get_nonfarm():
+@series_selection()
+async def get_nonfarm(start=None, end=None, limit=None, order='desc', max_points=None, downsample='lttb',
+                      summary=False, output='rows'):
     """ Returns the monthly US All Employees: Total Nonfarm
+
+    Keyword Arguments:
     """
-    ei = EconIndicators(output_format='json')
-    return ei.get_nonfarm()
+    selection = Selection(start, end, limit, None, order, max_points, downsample, summary, output)
+    ei = shared(EconIndicators)
+    return await ei.get_nonfarm(selection=selection)
 
 
 @mcp.tool()
-def get_news_sentiment(tickers=None, topics=None, time_from=None, time_to=None,
-                       sort='LATEST', limit=50):
+async def get_news_sentiment(tickers=None, topics=None, time_from=None, time_to=None,
+                             sort='LATEST', limit=50):
     """ Return live and historical market news & sentiment data
     from news outlets around the world.
     It raises ValueError when problems arise
@@ -2031,40 +2905,40 @@ def get_news_sentiment(tickers=None, topics=None, time_from=None, time_to=None,
         limit:  number of output results
             supported values are 50, 1000 (default 50)
     """
-    ai = AlphaIntelligence(output_format='json')
-    return ai.get_news_sentiment(tickers=tickers, topics=topics, time_from=time_from, time_to=time_to, sort=sort,
-                                 limit=limit)
+    ai = shared(AlphaIntelligence)
+    return await ai.get_news_sentiment(tickers=tickers, topics=topics, time_from=time_from, time_to=time_to, sort=sort,
+                                       limit=limit)
 
 
 @mcp.tool()
-def get_top_gainers():
+async def get_top_gainers():
     """ Returns the top 20 gainers in the US market.
     It raises ValueError when problems arise.
     """
-    ai = AlphaIntelligence(output_format='json')
-    return ai.get_top_gainers()
+    ai = shared(AlphaIntelligence)
+    return await ai.get_top_gainers()
 
 
 @mcp.tool()
-def get_top_losers(self):
+async def get_top_losers():
     """ Returns the top 20 losers in the US market.
     It raises ValueError when problems arise.
     """
-    ai = AlphaIntelligence(output_format='json')
-    return ai.get_top_losers()
+    ai = shared(AlphaIntelligence)
+    return await ai.get_top_losers()
 
 
 @mcp.tool()
-def get_most_active():
+async def get_most_active():
     """ Returns the top 20  most actively traded tickers in the US market.
     It raises ValueError when problems arise.
     """
-    ai = AlphaIntelligence(output_format='json')
-    return ai.get_most_active()
+    ai = shared(AlphaIntelligence)
+    return await ai.get_most_active()
 
 
 @mcp.tool()
-def get_realtime_options(symbol, contract=None):
+async def get_realtime_options(symbol, contract=None):
     """ Return realtime US options data.
     It raises ValueError when problems arise
 
@@ -2073,12 +2947,12 @@ def get_realtime_options(symbol, contract=None):
         contract:  US options contract ID.
             By default, not set and entire option chain is returned
     """
-    optoions = Options(output_format='json')
-    return optoions.get_realtime_options(symbol=symbol, contract=contract)
+    optoions = shared(Options)
+    return await optoions.get_realtime_options(symbol=symbol, contract=contract)
 
 
 @mcp.tool()
-def get_historical_options(symbol, date=None):
+async def get_historical_options(symbol, date=None):
     """ Return historical US options data.
     It raises ValueError when problems arise
 
@@ -2087,12 +2961,14 @@ def get_historical_options(symbol, date=None):
         date:  By default, not set and data for the previous trading session is returned.
             Any date later than 2008-01-01 is accepted.
     """
-    optoions = Options(output_format='json')
-    return optoions.get_historical_options(symbol=symbol, date=date)
+    optoions = shared(Options)
+    return await optoions.get_historical_options(symbol=symbol, date=date)
 
 
 @mcp.tool()
-def get_digital_currency_daily(symbol, market):
+@bar_selection(*PRICES, 'volume')
+async def get_digital_currency_daily(symbol, market, start=None, end=None, limit=None, fields=None, order='desc',
+                                     max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns  the daily historical time series for a digital currency
     (e.g., BTC) traded on a specific market (e.g., CNY/Chinese Yuan),
     refreshed daily at midnight (UTC). Prices and volumes are quoted in
@@ -2105,12 +2981,15 @@ def get_digital_currency_daily(symbol, market):
         market: The exchange market of your choice. It can be any of the
         market in the market list. For example: market=CNY.
     """
-    cc = CryptoCurrencies(output_format='json')
-    return cc.get_digital_currency_daily(symbol=symbol, market=market)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    cc = shared(CryptoCurrencies)
+    return await cc.get_digital_currency_daily(symbol=symbol, market=market, selection=selection)
 
 
 @mcp.tool()
-def get_digital_currency_weekly(symbol, market):
+@bar_selection(*PRICES, 'volume')
+async def get_digital_currency_weekly(symbol, market, start=None, end=None, limit=None, fields=None, order='desc',
+                                      max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns  the weekly historical time series for a digital currency
     (e.g., BTC) traded on a specific market (e.g., CNY/Chinese Yuan),
     refreshed daily at midnight (UTC). Prices and volumes are quoted in
@@ -2123,12 +3002,15 @@ def get_digital_currency_weekly(symbol, market):
         market: The exchange market of your choice. It can be any of the
         market in the market list. For example: market=CNY.
     """
-    cc = CryptoCurrencies(output_format='json')
-    return cc.get_digital_currency_weekly(symbol=symbol, market=market)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    cc = shared(CryptoCurrencies)
+    return await cc.get_digital_currency_weekly(symbol=symbol, market=market, selection=selection)
 
 
 @mcp.tool()
-def get_digital_currency_monthly(symbol, market):
+@bar_selection(*PRICES, 'volume')
+async def get_digital_currency_monthly(symbol, market, start=None, end=None, limit=None, fields=None, order='desc',
+                                       max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns  the monthly historical time series for a digital currency
     (e.g., BTC) traded on a specific market (e.g., CNY/Chinese Yuan),
     refreshed daily at midnight (UTC). Prices and volumes are quoted in
@@ -2141,12 +3023,13 @@ def get_digital_currency_monthly(symbol, market):
         market: The exchange market of your choice. It can be any of the
         market in the market list. For example: market=CNY.
     """
-    cc = CryptoCurrencies(output_format='json')
-    return cc.get_digital_currency_monthly(symbol=symbol, market=market)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    cc = shared(CryptoCurrencies)
+    return await cc.get_digital_currency_monthly(symbol=symbol, market=market, selection=selection)
 
 
 @mcp.tool()
-def get_digital_currency_exchange_rate(from_currency, to_currency):
+async def get_digital_currency_exchange_rate(from_currency, to_currency):
     """ Returns the realtime exchange rate for any pair of digital
     currency (e.g., BTC) or physical currency (e.g., USD).
     Keyword Arguments:
@@ -2157,15 +3040,21 @@ def get_digital_currency_exchange_rate(from_currency, to_currency):
         It can either be a physical currency or digital/crypto currency.
         For example: to_currency=USD or to_currency=BTC.
     """
-    cc = CryptoCurrencies(output_format='json')
-    return cc.get_digital_currency_exchange_rate(from_currency=from_currency, to_currency=to_currency)
+    cc = shared(CryptoCurrencies)
+    return await cc.get_digital_currency_exchange_rate(from_currency=from_currency, to_currency=to_currency)
 
 
 @mcp.tool()
-def get_crypto_intraday(symbol, market, interval, outputsize='compact'):
+@bar_selection(*PRICES, 'volume')
+async def get_crypto_intraday(symbol, market, interval, outputsize='compact',
+                              start=None, end=None, limit=None, fields=None, order='desc',
+                              max_points=None, downsample='lttb', summary=False, output='rows'):
     """ Returns the intraday time series
     of the cryptocurrency specified, updated realtime.
 
+    Coarser intervals are resampled from the full 1-minute series when
+    that is already held.
+
     Keyword Arguments:
         symbol:  digital/crypto currency of your choice
         market:  exchange market of your choice
@@ -2176,8 +3065,44 @@ def get_crypto_intraday(symbol, market, interval, outputsize='compact'):
             data series, and 'full' returns the full-length intraday times
             series (default 'compact')
     """
-    cc = CryptoCurrencies(output_format='json')
-    return cc.get_crypto_intraday(symbol=symbol, market=market, interval=interval, outputsize=outputsize)
+    selection = Selection(start, end, limit, fields, order, max_points, downsample, summary, output)
+    resampled = await resample_crypto(symbol, market, interval, outputsize, selection=selection)
+    if resampled is not None:
+        return resampled
+    cc = shared(CryptoCurrencies)
+    return await cc.get_crypto_intraday(symbol=symbol, market=market, interval=interval, outputsize=outputsize,
+                                        selection=selection)
+
+
+@mcp.tool()
+def get_server_stats():
+    """ Return runtime statistics of this server, one object per section.
+
+    Sections:
+        connections:  upstream requests that reused a pooled connection or
+            opened a new one
+        responses:  upstream responses by kind, and the retries and give-ups
+        api_keys:  the quota use, rotation state and rate limiter queue of
+            every api key
+        single_flight:  upstream calls saved by joining an identical request
+            already in flight
+        cache:  hits, misses and evictions of the in-memory response cache
+        disk_cache:  hits and misses of the persistent cache, None without one
+        history:  full-length daily series refreshed by merging a compact
+            fetch or fetched again in full
+        resample:  requests of each interval resampled from finer bars or
+            fetched
+    """
+    return {
+        'connections': connection_stats.as_dict(),
+        'responses': response_stats.as_dict(),
+        'api_keys': key_pool.stats(),
+        'single_flight': single_flight.stats(),
+        'cache': response_cache.stats(),
+        'disk_cache': disk_cache.stats() if disk_cache is not None else None,
+        'history': history_stats.as_dict(),
+        'resample': resample_stats.as_dict(),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+
+from alphavantage_mcp import indicators
+from alphavantage_mcp.bars import Bars
+from alphavantage_mcp.csvseries import from_csv
+from alphavantage_mcp.store import to_stamps
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def recorded(function):
+    """ Return the recorded query arguments and upstream response of an indicator """
+    with open(os.path.join(FIXTURES, '%s.json' % (function,))) as f:
+        return json.load(f)
+
+
+# The symbol the fixtures were recorded for; a generated series is labeled as none listed
+with open(os.path.join(FIXTURES, 'SMA.json')) as f:
+    SYMBOL = json.load(f)['response']['Meta Data']['1: Symbol']
+
+
+def recorded_bars():
+    """ Return the recorded daily prices as Bars, as load_bars would """
+    with open(os.path.join(FIXTURES, 'prices.csv'), 'rb') as f:
+        content = f.read()
+    columns = from_csv(content, 'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=%s'
+                                '&outputsize=full' % (SYMBOL,)).bar_columns()
+    return Bars(to_stamps(columns['time'], 'D'), columns['open'], columns['high'], columns['low'], columns['close'],
+                columns['volume'], time_zone='US/Eastern', times=columns['time'])
+
+
+@pytest.fixture
+def parity(monkeypatch):
+    """ Return a check that an indicator computed locally from the recorded
+    prices matches its recorded upstream output on every recorded bar.
+    """
+    bars = recorded_bars()
+
+    async def load_bars(symbol, interval='daily', month=None, entitlement=None):
+        return bars
+    monkeypatch.setattr(indicators, 'load_bars', load_bars)
+
+    def check(function):
+        fixture = recorded(function)
+        expected = fixture['response']['Technical Analysis: %s' % (function,)]
+        data, meta_data = asyncio.run(indicators.compute_local(function, SYMBOL, 'daily', **fixture['params']))
+        assert expected and set(expected) <= set(data)
+        stamps = sorted(expected)
+        names = list(expected[stamps[0]])
+        assert set(data[stamps[0]]) == set(names)
+        local = np.array([[float(data[stamp][name]) for name in names] for stamp in stamps])
+        upstream = np.array([[float(expected[stamp][name]) for name in names] for stamp in stamps])
+        # Both sides are rounded to four decimals
+        np.testing.assert_allclose(local, upstream, rtol=1e-9, atol=1.01e-4, err_msg=function)
+        return data, meta_data
+    return check
@@ -0,0 +1,192 @@
+"""Record the fixtures of the local indicator parity tests.
+
+    python tests/fixtures/record.py           # from AlphaVantage, ALPHAVANTAGE_API_KEY set
+    python tests/fixtures/record.py --talib   # offline, TA-Lib over a generated series
+
+Writes prices.csv, the daily bars of SYMBOL, or offline of a random walk
+labeled SYNTHETIC, as TIME_SERIES_DAILY returns them in CSV, and one
+<FUNCTION>.json per indicator of CALLS: the query arguments, where the
+values came from and the response of the indicator endpoint cut to its
+last RECORDED bars. Upstream computes its indicators with TA-Lib, so the
+offline recording computes them with TA-Lib too, from prices.csv as
+written, which takes the place of the upstream history.
+"""
+import csv
+import datetime
+import io
+import json
+import os
+import random
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+URL = 'https://www.alphavantage.co/query?'
+SYMBOL = 'IBM'
+# The generated series is no listed stock's, so it is not recorded as one
+SYNTHETIC = 'SYNTH'
+RECORDED = 100
+
+# The query arguments of each indicator, all of them given so that no default is relied upon
+CALLS = {
+    'SMA': {'time_period': 20, 'series_type': 'close'},
+    'EMA': {'time_period': 20, 'series_type': 'close'},
+    'WMA': {'time_period': 10, 'series_type': 'high'},
+    'DEMA': {'time_period': 20, 'series_type': 'close'},
+    'TEMA': {'time_period': 15, 'series_type': 'close'},
+    'TRIMA': {'time_period': 20, 'series_type': 'low'},
+    'KAMA': {'time_period': 10, 'series_type': 'close'},
+    'T3': {'time_period': 5, 'series_type': 'close'},
+    'MAMA': {'fastlimit': 0.5, 'slowlimit': 0.05, 'series_type': 'close'},
+    'MACD': {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9, 'series_type': 'close'},
+    'MACDEXT': {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9, 'fastmatype': 1, 'slowmatype': 2,
+                'signalmatype': 0, 'series_type': 'close'},
+    'STOCH': {'fastkperiod': 5, 'slowkperiod': 3, 'slowkmatype': 1, 'slowdperiod': 3, 'slowdmatype': 0},
+    'STOCHF': {'fastkperiod': 5, 'fastdperiod': 3, 'fastdmatype': 0},
+    'RSI': {'time_period': 14, 'series_type': 'close'},
+    'STOCHRSI': {'time_period': 14, 'fastkperiod': 5, 'fastdperiod': 3, 'fastdmatype': 0, 'series_type': 'close'},
+    'WILLR': {'time_period': 14},
+    'APO': {'fastperiod': 12, 'slowperiod': 26, 'matype': 1, 'series_type': 'close'},
+    'PPO': {'fastperiod': 12, 'slowperiod': 26, 'matype': 0, 'series_type': 'close'},
+    'MOM': {'time_period': 10, 'series_type': 'close'},
+    'BOP': {},
+    'CCI': {'time_period': 20},
+    'CMO': {'time_period': 14, 'series_type': 'close'},
+    'ROC': {'time_period': 10, 'series_type': 'close'},
+    'ROCR': {'time_period': 10, 'series_type': 'close'},
+    'MFI': {'time_period': 14},
+    'ULTOSC': {'timeperiod1': 7, 'timeperiod2': 14, 'timeperiod3': 28},
+    'BBANDS': {'time_period': 20, 'nbdevup': 2.0, 'nbdevdn': 1.5, 'matype': 0, 'series_type': 'close'},
+    'TRANGE': {},
+    'ATR': {'time_period': 14},
+    'NATR': {'time_period': 14},
+    'PLUS_DM': {'time_period': 14},
+    'MINUS_DM': {'time_period': 14},
+    'PLUS_DI': {'time_period': 14},
+    'MINUS_DI': {'time_period': 14},
+    'DX': {'time_period': 14},
+    'ADX': {'time_period': 14},
+    'ADXR': {'time_period': 14},
+    'SAR': {'acceleration': 0.02, 'maximum': 0.2},
+    'AROON': {'time_period': 14},
+    'AROONOSC': {'time_period': 14},
+    'AD': {},
+    'ADOSC': {'fastperiod': 3, 'slowperiod': 10},
+    'OBV': {},
+    'HT_TRENDLINE': {'series_type': 'close'},
+    'HT_SINE': {'series_type': 'close'},
+    'HT_TRENDMODE': {'series_type': 'close'},
+    'HT_DCPERIOD': {'series_type': 'close'},
+    'HT_DCPHASE': {'series_type': 'close'},
+    'HT_PHASOR': {'series_type': 'close'},
+}
+# Upstream output names in the order TA-Lib returns them, where they are not just the function name
+OUTPUTS = {
+    'MAMA': ('MAMA', 'FAMA'),
+    'MACD': ('MACD', 'MACD_Signal', 'MACD_Hist'),
+    'MACDEXT': ('MACD', 'MACD_Signal', 'MACD_Hist'),
+    'STOCH': ('SlowK', 'SlowD'),
+    'STOCHF': ('FastK', 'FastD'),
+    'STOCHRSI': ('FastK', 'FastD'),
+    'BBANDS': ('Real Upper Band', 'Real Middle Band', 'Real Lower Band'),
+    'AROON': ('Aroon Down', 'Aroon Up'),
+    'AD': ('Chaikin A/D',),
+    'HT_SINE': ('SINE', 'LEAD SINE'),
+    'HT_TRENDMODE': ('TRENDMODE',),
+    'HT_DCPERIOD': ('DCPERIOD',),
+    'HT_PHASOR': ('PHASE', 'QUADRATURE'),
+}
+# TA-Lib's names of the query arguments that differ
+TALIB_ARGUMENTS = {
+    'time_period': 'timeperiod',
+    'series_type': 'price',
+    'fastkperiod': 'fastk_period',
+    'fastdperiod': 'fastd_period',
+    'fastdmatype': 'fastd_matype',
+    'slowkperiod': 'slowk_period',
+    'slowkmatype': 'slowk_matype',
+    'slowdperiod': 'slowd_period',
+    'slowdmatype': 'slowd_matype',
+}
+
+
+def _get(params):
+    query = urllib.parse.urlencode(dict(params, apikey=os.environ['ALPHAVANTAGE_API_KEY']))
+    with urllib.request.urlopen(URL + query, timeout=60) as response:
+        return response.read().decode()
+
+
+def _generated(bars=800, seed=7):
+    """ Return a random walk of daily bars in the CSV of TIME_SERIES_DAILY """
+    rnd = random.Random(seed)
+    day, price, lines = datetime.date(2021, 1, 4), 100.0, []
+    while len(lines) < bars:
+        if day.weekday() < 5:
+            close = price * (1 + rnd.gauss(0, 0.015))
+            high = max(price, close) * (1 + abs(rnd.gauss(0, 0.006)))
+            low = min(price, close) * (1 - abs(rnd.gauss(0, 0.006)))
+            lines.append('%s,%.4f,%.4f,%.4f,%.4f,%d' % (day, price, high, low, close, rnd.randint(2000000, 9000000)))
+            price = close
+        day += datetime.timedelta(days=1)
+    return '\r\n'.join(['timestamp,open,high,low,close,volume'] + lines[::-1]) + '\r\n'
+
+
+def _talib(function, params, prices, symbol):
+    from talib import abstract
+
+    rows = list(csv.DictReader(io.StringIO(prices)))[::-1]
+    inputs = {name: np.array([float(row[name]) for row in rows]) for name in ('open', 'high', 'low', 'close', 'volume')}
+    arguments = {TALIB_ARGUMENTS.get(name, name): value for name, value in params.items()}
+    outputs = abstract.Function(function)(inputs, **arguments)
+    if isinstance(outputs, np.ndarray):
+        outputs = [outputs]
+    names = OUTPUTS.get(function, (function,))
+    data = {}
+    for i in range(len(rows) - 1, -1, -1):
+        if len(data) == RECORDED:
+            break
+        values = [float(output[i]) for output in outputs]
+        if not np.isnan(values).any():
+            data[rows[i]['timestamp']] = {name: '%.4f' % (value,) for name, value in zip(names, values)}
+    meta_data = {'1: Symbol': symbol, '2: Indicator': function, '3: Last Refreshed': rows[-1]['timestamp'],
+                 '4: Interval': 'daily'}
+    return {'Meta Data': meta_data, 'Technical Analysis: %s' % (function,): data}
+
+
+def _upstream(function, params):
+    response = json.loads(_get(dict(params, function=function, symbol=SYMBOL, interval='daily')))
+    data_key = 'Technical Analysis: %s' % (function,)
+    if data_key not in response:
+        raise SystemExit('%s: %s' % (function, response))
+    response[data_key] = dict(sorted(response[data_key].items(), reverse=True)[:RECORDED])
+    return response
+
+
+def main(offline):
+    if offline:
+        import talib
+        source = 'TA-Lib %s' % (talib.__version__,)
+        prices = _generated()
+    else:
+        source = 'AlphaVantage'
+        prices = _get({'function': 'TIME_SERIES_DAILY', 'symbol': SYMBOL, 'outputsize': 'full', 'datatype': 'csv'})
+    with open(os.path.join(DIRECTORY, 'prices.csv'), 'w', newline='') as f:
+        f.write(prices)
+    for function, params in CALLS.items():
+        if offline:
+            response = _talib(function, params, prices, SYNTHETIC)
+        else:
+            # The free plan allows 5 calls a minute
+            time.sleep(12)
+            response = _upstream(function, params)
+        with open(os.path.join(DIRECTORY, '%s.json' % (function,)), 'w') as f:
+            json.dump({'params': params, 'source': source, 'response': response}, f, indent=1)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main('--talib' in sys.argv[1:])
@@ -0,0 +1,73 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from alphavantage_mcp import backfill
+from alphavantage_mcp.store import BarStore, month_span, to_seconds
+
+
+class Month(object):
+    """ The response of one month: a bar on its 2nd and 3rd day at the given close """
+
+    def __init__(self, month, close):
+        times = to_seconds(['%s-02 10:00:00' % (month,), '%s-03 10:00:00' % (month,)])
+        self.columns = {'time': times, 'open': np.full(2, close), 'high': np.full(2, close),
+                        'low': np.full(2, close), 'close': np.full(2, close), 'volume': np.full(2, 100)}
+        self.meta_data = {'6. Time Zone': 'US/Eastern'}
+
+    def bar_columns(self):
+        return self.columns
+
+
+class Upstream(object):
+
+    def __init__(self, failing=()):
+        self.failing = failing
+
+    async def frame(self, name, month, **params):
+        # The first month arrives last, so that the others are written in one go
+        if month.endswith('-01'):
+            await asyncio.sleep(0.05)
+        if month in self.failing:
+            raise ValueError('%s failed' % (month,))
+        return Month(month, 2.0)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = BarStore(str(tmp_path))
+    monkeypatch.setattr(backfill, 'bar_store', store)
+    return store
+
+
+def test_months_between():
+    assert backfill.months_between('2023-11', '2024-02') == ['2023-11', '2023-12', '2024-01', '2024-02']
+    with pytest.raises(ValueError):
+        backfill.months_between('2024-02', '2023-11')
+
+
+def test_failed_month_keeps_its_stored_bars(store, monkeypatch):
+    store.write('IBM', '5min', Month('2023-02', 1.0).columns, 'US/Eastern', month_span('2023-02'))
+    monkeypatch.setattr(backfill, 'shared', lambda cls: Upstream(failing=('2023-02',)))
+    summary = asyncio.run(backfill.backfill('IBM', '5min', '2023-01', '2023-03'))
+    assert list(summary['failed']) == ['2023-02']
+    columns, meta = store.read('IBM', '5min')
+    assert columns['close'].tolist() == [2.0, 2.0, 1.0, 1.0, 2.0, 2.0]
+    assert meta['months'] == ['2023-01', '2023-03']
+
+
+def test_failing_write_does_not_hide_the_error(store, monkeypatch):
+    class Interrupted(Upstream):
+        async def frame(self, name, month, **params):
+            if month == '2023-01':
+                await asyncio.sleep(0.05)
+                raise RuntimeError('interrupted')
+            return Month(month, 2.0)
+
+    def write(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(backfill, 'shared', lambda cls: Interrupted())
+    monkeypatch.setattr(store, 'write', write)
+    with pytest.raises(RuntimeError, match='interrupted'):
+        asyncio.run(backfill.backfill('IBM', '5min', '2023-01', '2023-02'))
@@ -0,0 +1,94 @@
+import time
+
+from alphavantage_mcp.cache import DAY, MINUTE, SQLiteCache, TTLCache, canonical_key, refreshable, ttl_for
+
+URL = 'https://www.alphavantage.co/query?'
+
+
+def test_canonical_key_drops_the_api_key_and_sorts_the_arguments():
+    key = canonical_key(URL + 'function=TIME_SERIES_DAILY&symbol=ibm&outputsize=full&apikey=secret&datatype=json')
+    assert key == ('TIME_SERIES_DAILY', ('outputsize', 'full'), ('symbol', 'IBM'))
+    assert key == canonical_key(URL + 'symbol=IBM&apikey=other&outputsize=full&function=TIME_SERIES_DAILY')
+
+
+def test_ttl_follows_the_function_and_interval():
+    assert ttl_for(('GLOBAL_QUOTE', ('symbol', 'IBM'))) == 15
+    assert ttl_for(('TIME_SERIES_MONTHLY', ('symbol', 'IBM'))) == DAY
+    assert ttl_for(('SMA', ('interval', '5min'), ('symbol', 'IBM'))) == MINUTE
+    assert ttl_for(('WTI', ('interval', 'monthly'))) == DAY
+
+
+def test_refreshable_only_for_full_daily_series():
+    assert refreshable(('TIME_SERIES_DAILY', ('outputsize', 'full'), ('symbol', 'IBM')))
+    assert not refreshable(('TIME_SERIES_DAILY', ('outputsize', 'compact'), ('symbol', 'IBM')))
+    assert not refreshable(('TIME_SERIES_WEEKLY', ('symbol', 'IBM')))
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    cache = TTLCache(max_bytes=1000)
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cache.set(('GLOBAL_QUOTE',), 'quote', 10, 15)
+    assert cache.get(('GLOBAL_QUOTE',)) == 'quote'
+    now[0] += 15
+    assert cache.get(('GLOBAL_QUOTE',)) is None
+    assert cache.stale(('GLOBAL_QUOTE',)) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_expired_refreshable_entries_are_kept_for_stale(monkeypatch):
+    cache = TTLCache(max_bytes=1000)
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    key = ('TIME_SERIES_DAILY', ('outputsize', 'full'), ('symbol', 'IBM'))
+    cache.set(key, 'series', 10, 60)
+    now[0] += 60
+    assert cache.get(key) is None
+    assert cache.stale(key) == 'series'
+
+
+def test_least_recently_used_entries_are_evicted_within_the_byte_budget():
+    cache = TTLCache(max_bytes=100)
+    cache.set('a', 1, 40, 60)
+    cache.set('b', 2, 40, 60)
+    assert cache.get('a') == 1
+    cache.set('c', 3, 40, 60)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['bytes'] == 80 and cache.stats()['evictions'] == 1
+
+
+def test_entries_larger_than_the_budget_or_without_ttl_are_not_stored():
+    cache = TTLCache(max_bytes=100)
+    cache.set('big', 1, 101, 60)
+    cache.set('none', 1, 10, 0)
+    assert cache.stats()['entries'] == 0
+
+
+def test_sqlite_cache_serves_fresh_responses_across_instances(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    key = ('GLOBAL_QUOTE', ('symbol', 'IBM'))
+    SQLiteCache(path).set(key, b'{"Global Quote": {}}')
+    cache = SQLiteCache(path)
+    content, age = cache.get(key, 15)
+    assert content == b'{"Global Quote": {}}' and 0 <= age < 15
+    assert cache.get(('GLOBAL_QUOTE', ('symbol', 'MSFT')), 15) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_sqlite_cache_keeps_expired_responses_for_get_stale(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+    key = ('TIME_SERIES_DAILY', ('outputsize', 'full'), ('symbol', 'IBM'))
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now - 2 * DAY)
+    cache.set(key, b'old')
+    monkeypatch.setattr(time, 'time', lambda: now)
+    assert cache.get(key, DAY) is None
+    assert cache.get_stale(key) == b'old'
+
+
+def test_sqlite_cache_stores_states(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+    assert cache.get_state('["IBM"]') is None
+    cache.set_state('["IBM"]', {'last': '2024-01-02', 'state': [1.5]})
+    assert SQLiteCache(cache.path).get_state('["IBM"]') == {'last': '2024-01-02', 'state': [1.5]}
@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+from alpha_vantage.timeseries import TimeSeries
+
+from alphavantage_mcp import client
+from alphavantage_mcp.cache import response_cache
+from alphavantage_mcp.keys import KeyPool
+from alphavantage_mcp.responses import UNAVAILABLE, ThrottledError, UnavailableError, UnparseableResponseError, \
+    response_stats
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """ Route upstream calls to a handler of httpx requests set by the test """
+    answers = []
+
+    def handler(request):
+        answer = answers.pop(0) if len(answers) > 1 else answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(client, 'http_client', lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(client, 'key_pool', KeyPool(['demo']))
+    monkeypatch.setattr(client, 'disk_cache', None)
+    monkeypatch.setattr(client, 'BACKOFF_BASE', 0.01)
+    response_cache.clear()
+    yield answers
+    response_cache.clear()
+
+
+def quote():
+    return asyncio.run(client.AsyncClient(TimeSeries).get_quote_endpoint(symbol='IBM'))
+
+
+def test_server_errors_past_the_deadline_raise_unavailable(upstream, monkeypatch):
+    monkeypatch.setattr(client, 'RETRY_DEADLINE', 0.05)
+    upstream.append(httpx.Response(503, text='Service Unavailable'))
+    with pytest.raises(UnavailableError, match='HTTP 503'):
+        quote()
+
+
+def test_server_errors_are_retried(upstream):
+    upstream.extend([httpx.Response(502), httpx.Response(200, json={'Global Quote': {'01. symbol': 'IBM'}})])
+    data, _ = quote()
+    assert data == {'01. symbol': 'IBM'}
+
+
+def test_transport_errors_are_retried_and_counted(upstream):
+    unavailable = response_stats.as_dict()['kinds'].get(UNAVAILABLE, 0)
+    upstream.extend([httpx.ConnectError('refused'), httpx.ReadTimeout('slow'),
+                     httpx.Response(200, json={'Global Quote': {'01. symbol': 'IBM'}})])
+    data, _ = quote()
+    assert data == {'01. symbol': 'IBM'}
+    assert response_stats.as_dict()['kinds'][UNAVAILABLE] == unavailable + 2
+
+
+def test_transport_errors_past_the_deadline_raise_unavailable(upstream, monkeypatch):
+    monkeypatch.setattr(client, 'RETRY_DEADLINE', 0.05)
+    upstream.append(httpx.RemoteProtocolError('dropped'))
+    with pytest.raises(UnavailableError, match='RemoteProtocolError'):
+        quote()
+
+
+def test_throttled_past_the_deadline_raises_throttled(upstream, monkeypatch):
+    monkeypatch.setattr(client, 'RETRY_DEADLINE', 0.05)
+    upstream.append(httpx.Response(200, json={'Note': 'Thank you for using Alpha Vantage! Our standard API call '
+                                                      'frequency is 5 calls per minute.'}))
+    with pytest.raises(ThrottledError):
+        quote()
+
+
+def test_a_body_that_is_not_json_is_unparseable(upstream):
+    upstream.append(httpx.Response(200, text='<html>Bad Gateway</html>'))
+    with pytest.raises(UnparseableResponseError, match='could not be parsed'):
+        quote()
@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+import pytest
+from alpha_vantage.timeseries import TimeSeries
+
+from alphavantage_mcp import client, csvseries
+from alphavantage_mcp.cache import response_cache
+from alphavantage_mcp.csvseries import csv_url, from_csv
+from alphavantage_mcp.keys import KeyPool
+from alphavantage_mcp.responses import ThrottledError, UnparseableResponseError
+
+URL = 'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=ibm&outputsize=compact&datatype=json'
+DAILY = ('timestamp,open,high,low,close,volume\r\n'
+         '2024-01-03,161.0000,161.7300,160.0800,160.1000,4086100\r\n'
+         '2024-01-02,162.8300,163.2900,160.7500,161.6900,3945800\r\n')
+
+
+def test_daily_bars_and_meta_data():
+    frame = from_csv(DAILY, URL)
+    assert frame.data_key == 'Time Series (Daily)'
+    assert frame.meta_data == {'1. Information': 'Daily Prices (open, high, low, close) and Volumes',
+                               '2. Symbol': 'ibm', '3. Last Refreshed': '2024-01-03', '4. Output Size': 'Compact',
+                               '5. Time Zone': 'US/Eastern'}
+    assert frame.data()['2024-01-02'] == {'1. open': '162.8300', '2. high': '163.2900', '3. low': '160.7500',
+                                          '4. close': '161.6900', '5. volume': '3945800'}
+    assert frame.column('volume').dtype.kind == 'i'
+
+
+def test_intraday_meta_data():
+    url = 'https://www.alphavantage.co/query?function=TIME_SERIES_INTRADAY&symbol=IBM&interval=5min&outputsize=full'
+    frame = from_csv('timestamp,open,high,low,close,volume\r\n2024-01-02 19:55:00,1.0,1.0,1.0,1.0,10\r\n', url)
+    assert frame.data_key == 'Time Series (5min)'
+    assert frame.meta_data['4. Interval'] == '5min'
+    assert frame.meta_data['5. Output Size'] == 'Full size'
+    assert frame.meta_data['6. Time Zone'] == 'US/Eastern'
+    assert list(frame.data()) == ['2024-01-02 19:55:00']
+
+
+def test_header_without_bars():
+    frame = from_csv('timestamp,open,high,low,close,volume\r\n', URL)
+    assert len(frame) == 0
+    assert frame.meta_data['3. Last Refreshed'] is None
+
+
+@pytest.mark.parametrize('content', ['{"Information": "Thank you for using Alpha Vantage!"}', '',
+                                     'timestamp,open,close\r\n2024-01-02,1.0\r\n',
+                                     'timestamp,open\r\n2024-01-02,n/a\r\n'])
+def test_bodies_that_are_not_bars(content):
+    assert from_csv(content, URL) is None
+
+
+def test_only_stock_time_series_are_fetched_as_csv(monkeypatch):
+    monkeypatch.setattr(csvseries, 'UPSTREAM_DATATYPE', 'csv')
+    assert csv_url(('TIME_SERIES_DAILY',), URL).endswith('datatype=csv')
+    fx = URL.replace('TIME_SERIES_DAILY', 'FX_DAILY')
+    assert csv_url(('FX_DAILY',), fx) == fx
+    assert from_csv(DAILY, fx) is None
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """ Answer every upstream call with the response set by the test """
+    answers = []
+    monkeypatch.setattr(client, 'http_client', lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: answers[0])))
+    monkeypatch.setattr(client, 'key_pool', KeyPool(['demo']))
+    monkeypatch.setattr(client, 'disk_cache', None)
+    monkeypatch.setattr(client, 'BACKOFF_BASE', 0.01)
+    monkeypatch.setattr(client, 'RETRY_DEADLINE', 0.05)
+    monkeypatch.setattr(csvseries, 'UPSTREAM_DATATYPE', 'csv')
+    response_cache.clear()
+    yield answers
+    response_cache.clear()
+
+
+def daily():
+    return asyncio.run(client.AsyncClient(TimeSeries).get_daily(symbol='ibm'))
+
+
+def test_csv_fetch(upstream):
+    upstream.append(httpx.Response(200, text=DAILY))
+    data, meta_data = daily()
+    assert list(data) == ['2024-01-03', '2024-01-02']
+    assert meta_data['2. Symbol'] == 'ibm'
+
+
+def test_throttle_answered_as_json_to_a_csv_fetch(upstream):
+    upstream.append(httpx.Response(200, json={'Note': 'Thank you for using Alpha Vantage! Our standard API call '
+                                                      'frequency is 5 calls per minute.'}))
+    with pytest.raises(ThrottledError):
+        daily()
+
+
+def test_csv_fetch_answered_with_text_that_is_not_bars(upstream):
+    upstream.append(httpx.Response(200, text='Invalid API call. Please retry or visit the documentation.'))
+    with pytest.raises(UnparseableResponseError, match='TIME_SERIES_DAILY'):
+        daily()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from alphavantage_mcp.downsample import decimate, lttb, minmax
+from alphavantage_mcp.frames import Selection, from_json, select
+
+
+def test_lttb_keeps_the_first_and_last_points_and_the_peaks():
+    x = np.arange(10)
+    y = np.array([5.0, 5, 5, 9, 5, 5, 1, 5, 5, 5])
+    assert lttb(x, y, 4).tolist() == [0, 3, 6, 9]
+
+
+def test_lttb_keeps_every_point_when_there_are_few():
+    assert lttb(np.arange(3), np.ones(3), 5).tolist() == [0, 1, 2]
+
+
+def test_lttb_keeps_the_points_asked():
+    x = np.arange(1000)
+    kept = lttb(x, np.sin(x / 50.0), 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert (np.diff(kept) > 0).all()
+
+
+def test_minmax_keeps_the_lowest_and_highest_of_each_bucket():
+    y = np.array([3.0, 1, 4, 1, 5, 9, 2, 6])
+    # Buckets [3, 1, 4, 1] and [5, 9, 2, 6]; the first of equal lows is kept
+    assert minmax(y, 4).tolist() == [1, 2, 5, 6]
+
+
+def test_decimate_leaves_out_missing_values():
+    values = np.array([1.0, np.nan, 3, 0, np.nan, 8, 2])
+    kept = decimate(np.arange(7), values, 4, 'minmax')
+    assert kept.tolist() == [0, 2, 3, 5]
+    assert not np.isnan(values[decimate(np.arange(7), values, 3)]).any()
+
+
+def test_selection_records_the_downsampling():
+    data = {'2024-01-%02d' % (day,): {'4. close': '%d.00' % (day % 7,)} for day in range(31, 0, -1)}
+    frame = from_json({'Meta Data': {}, 'Time Series (Daily)': data})
+    data, meta_data = select(frame, {'1. Information': 'Daily Prices'}, Selection(max_points=5, order='asc'))
+    assert meta_data['Downsampling'] == {'method': 'lttb', 'original points': 31, 'points': 5}
+    assert len(data) == 5
+    assert list(data)[0] == '2024-01-01' and list(data)[-1] == '2024-01-31'
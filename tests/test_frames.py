@@ -0,0 +1,85 @@
+import pytest
+
+from alphavantage_mcp.frames import Selection, from_json, select
+
+STAMPS = ['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05', '2024-01-08']
+
+
+def daily():
+    """ Return a Frame of five daily bars, the nth closing at n + 0.5 on volume 100 * n """
+    data = {stamp: {'1. open': '%d.0000' % (n,), '4. close': '%d.5000' % (n,), '5. volume': str(100 * n)}
+            for n, stamp in reversed(list(enumerate(STAMPS, 1)))}
+    return from_json({'Meta Data': {'2. Symbol': 'IBM'}, 'Time Series (Daily)': data})
+
+
+def test_start_and_end_are_inclusive():
+    data, _ = select(daily(), {}, Selection(start='2024-01-03', end='2024-01-05'))
+    assert list(data) == ['2024-01-05', '2024-01-04', '2024-01-03']
+    assert data['2024-01-04'] == {'1. open': '3.0000', '4. close': '3.5000', '5. volume': '300'}
+
+
+def test_start_after_end_is_empty():
+    data, _ = select(daily(), {}, Selection(start='2024-01-05', end='2024-01-03'))
+    assert data == {}
+
+
+def test_range_without_bars_is_empty():
+    data, _ = select(daily(), {}, Selection(start='2024-01-06', end='2024-01-07'))
+    assert data == {}
+    assert select(daily(), {}, Selection(summary=True, start='2024-02-01'))[0] == {'field': '4. close', 'points': 0}
+
+
+@pytest.mark.parametrize('order, expected', [('desc', ['2024-01-08', '2024-01-05']),
+                                             ('asc', ['2024-01-05', '2024-01-08'])])
+def test_limit_keeps_the_newest_bars_in_either_order(order, expected):
+    data, _ = select(daily(), {}, Selection(limit=2, order=order))
+    assert list(data) == expected
+
+
+def test_limit_within_a_range():
+    data, _ = select(daily(), {}, Selection(end='2024-01-04', limit=2, order='asc'))
+    assert list(data) == ['2024-01-03', '2024-01-04']
+
+
+def test_fields_by_name_with_or_without_number():
+    data, _ = select(daily(), {}, Selection(fields='close, 5. VOLUME', limit=1))
+    assert data == {'2024-01-08': {'4. close': '5.5000', '5. volume': '500'}}
+
+
+def test_unknown_field():
+    with pytest.raises(ValueError, match="'adjusted close'"):
+        select(daily(), {}, Selection(fields='close,adjusted close'))
+
+
+@pytest.mark.parametrize('arguments', [{'order': 'newest'}, {'limit': -1}, {'start': 'yesterday'}])
+def test_invalid_arguments(arguments):
+    with pytest.raises(ValueError):
+        Selection(**arguments)
+
+
+def test_records_are_selected_by_date():
+    records = [{'date': '2024-03-01', 'value': '4.1'}, {'date': '2024-01-01', 'value': '3.9'},
+               {'date': '2024-02-01', 'value': '.'}]
+    data, _ = select(records, {}, Selection(start='2024-01-15', order='asc'))
+    assert data == [{'date': '2024-02-01', 'value': '.'}, {'date': '2024-03-01', 'value': '4.1'}]
+
+
+def test_columns_output():
+    columns, _ = select(daily(), {}, Selection(output='columns', limit=2, fields='close,volume'))
+    assert columns == {'t': ['2024-01-08', '2024-01-05'], 'c': [5.5, 4.5], 'v': [500, 400]}
+
+
+def test_columns_output_oldest_first_with_every_field():
+    columns, _ = select(daily(), {}, Selection(output='columns', order='asc', end='2024-01-03'))
+    assert columns == {'t': ['2024-01-02', '2024-01-03'], 'o': [1.0, 2.0], 'c': [1.5, 2.5], 'v': [100, 200]}
+
+
+def test_columns_output_of_records():
+    records = [{'date': '2024-02-01', 'value': '.'}, {'date': '2024-01-01', 'value': '3.9'}]
+    columns, _ = select(records, {}, Selection(output='columns'))
+    assert columns == {'t': ['2024-02-01', '2024-01-01'], 'value': [None, 3.9]}
+
+
+def test_unknown_output():
+    with pytest.raises(ValueError):
+        Selection(output='table')
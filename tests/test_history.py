@@ -0,0 +1,50 @@
+import datetime
+
+import numpy as np
+
+from alphavantage_mcp.csvseries import from_csv
+from alphavantage_mcp.history import compact_url, merge
+
+URL = 'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol=IBM&outputsize=full'
+
+
+def days(count, start=datetime.date(2024, 1, 1)):
+    return [(start + datetime.timedelta(days=i)).isoformat() for i in range(count)]
+
+
+def frame(closes, first=0, dividend=None, url=URL):
+    """ Return a daily adjusted response Frame of the given closes from day
+    first on, the bar at index dividend paying a dividend
+    """
+    lines = ['timestamp,open,high,low,close,adjusted_close,volume,dividend_amount,split_coefficient']
+    for i, (day, close) in enumerate(zip(days(first + len(closes))[first:], closes)):
+        lines.append('%s,%.2f,%.2f,%.2f,%.2f,%.2f,%d,%.4f,1.0' % (day, close, close + 1, close - 1, close, close, 1000,
+                                                                 0.5 if i == dividend else 0.0))
+    # Newest bar first, as upstream sends them
+    return from_csv('\r\n'.join(lines[:1] + lines[:0:-1]) + '\r\n', url)
+
+
+def test_compact_url():
+    assert compact_url(URL).endswith('outputsize=compact')
+
+
+def test_new_bars_are_appended():
+    full = frame([10.0, 11.0, 12.0, 13.0])
+    compact = frame([12.0, 13.5, 14.0], first=2, url=compact_url(URL))
+    merged = merge(full, compact)
+    assert merged.times.tolist() == full.times.tolist() + compact.times[-1:].tolist()
+    assert merged.column('close').tolist() == [10.0, 11.0, 12.0, 13.5, 14.0]
+
+
+def test_changed_older_bar_is_not_merged():
+    assert merge(frame([10.0, 11.0, 12.0, 13.0]), frame([12.5, 13.0, 14.0], first=2, url=compact_url(URL))) is None
+
+
+def test_gap_is_not_merged():
+    assert merge(frame([10.0, 11.0, 12.0]), frame([14.0, 15.0], first=4, url=compact_url(URL))) is None
+
+
+def test_new_dividend_is_not_merged():
+    compact = frame([12.0, 13.0, 14.0], first=2, dividend=2, url=compact_url(URL))
+    assert merge(frame([10.0, 11.0, 12.0, 13.0]), compact) is None
+    assert np.any(compact.column('dividend amount') != 0)
@@ -0,0 +1,94 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from alphavantage_mcp import indicators
+from alphavantage_mcp.bars import Bars
+from alphavantage_mcp.indicators import INDICATORS
+
+from conftest import SYMBOL, recorded_bars
+
+
+@pytest.mark.parametrize('function', list(INDICATORS))
+def test_matches_the_upstream_output(parity, function):
+    parity(function)
+
+
+def test_meta_data_reports_the_arguments(parity):
+    _, meta_data = parity('SMA')
+    assert meta_data['2: Indicator'] == 'Simple Moving Average (SMA)'
+    assert meta_data['5: Time Period'] == 20 and meta_data['6: Series Type'] == 'close'
+    assert meta_data['3: Last Refreshed'] == '2024-01-26'
+
+
+def test_revised_last_bar_recomputes_the_cycle(monkeypatch):
+    bars = recorded_bars()
+    close = np.array(bars.close)
+    close[-1] *= 1.05
+    revised = Bars(bars.index, bars.open, bars.high, bars.low, close, bars.volume, bars.time_zone, bars.times)
+    served = [bars, revised]
+
+    async def load_bars(symbol, interval='daily', month=None, entitlement=None):
+        return served.pop(0)
+    monkeypatch.setattr(indicators, 'load_bars', load_bars)
+    monkeypatch.setattr(indicators, '_cycles', indicators.OrderedDict())
+
+    before, _ = asyncio.run(indicators.compute_local('HT_DCPERIOD', SYMBOL))
+    after, _ = asyncio.run(indicators.compute_local('HT_DCPERIOD', SYMBOL))
+    last = bars.index[-1]
+    assert after[last] != before[last]
+    assert after[last] == indicators._data(revised, {'DCPERIOD': indicators.hilbert.cycle(close).dcperiod},
+                                           np.arange(len(revised)), ['DCPERIOD'])[last]
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """ Serve the recorded prices to load_bars, counting the loads """
+    loads = []
+    bars = recorded_bars()
+
+    async def load_bars(symbol, interval='daily', month=None, entitlement=None):
+        loads.append(symbol)
+        return bars
+    monkeypatch.setattr(indicators, 'load_bars', load_bars)
+    return loads
+
+
+def local(function, **params):
+    """ Return compute_local's values of each output by timestamp """
+    data, _ = asyncio.run(indicators.compute_local(function, SYMBOL, **params))
+    return {stamp: {name: float(value) for name, value in values.items()} for stamp, values in data.items()}
+
+
+def test_many_indicators_from_one_load(served):
+    specs = ['RSI', {'function': 'SMA', 'time_period': 50, 'name': 'SMA50'}, {'function': 'EMA', 'time_period': 10},
+             'MACD']
+    data, meta_data = asyncio.run(indicators.compute_many(SYMBOL, specs))
+    assert served == [SYMBOL]
+    assert list(data['columns']) == ['RSI', 'SMA50', 'EMA_10', 'MACD.MACD', 'MACD.MACD_Hist', 'MACD.MACD_Signal']
+    assert data['index'][0] == '2024-01-26' and data['index'] == sorted(data['index'], reverse=True)
+    assert meta_data['2: Indicators']['SMA50'] == {'function': 'SMA', 'time_period': 50, 'series_type': 'close'}
+    for label, function, params in [('SMA50', 'SMA', {'time_period': 50}), ('EMA_10', 'EMA', {'time_period': 10})]:
+        expected = local(function, **params)
+        values = dict(zip(data['index'], data['columns'][label]))
+        assert [stamp for stamp, value in values.items() if value is None] == \
+            [stamp for stamp in data['index'] if stamp not in expected]
+        np.testing.assert_allclose([values[stamp] for stamp in expected],
+                                   [value[function] for value in expected.values()], atol=1e-4)
+    signals = dict(zip(data['index'], data['columns']['MACD.MACD_Signal']))
+    np.testing.assert_allclose([signals[stamp] for stamp in local('MACD')],
+                               [value['MACD_Signal'] for value in local('MACD').values()], atol=1e-4)
+
+
+@pytest.mark.parametrize('specs', [
+    [],
+    ['SMA', 'SMA'],
+    [{'function': 'SMA', 'name': 'MA'}, {'function': 'EMA', 'name': 'MA'}],
+    ['GDP'],
+    [{'function': 'SMA', 'period': 5}],
+])
+def test_invalid_specs(served, specs):
+    with pytest.raises(ValueError):
+        asyncio.run(indicators.compute_many(SYMBOL, specs))
+    assert served == []
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from alphavantage_mcp import keys
+from alphavantage_mcp.keys import KeyPool
+from alphavantage_mcp.responses import INVALID_KEY, OK, THROTTLED, InvalidKeyError
+
+
+def acquire(pool, symbol=None):
+    return asyncio.run(pool.acquire(symbol))
+
+
+def test_calls_go_to_the_key_with_the_most_headroom():
+    pool = KeyPool(['a', 'b'])
+    for api_key in pool.keys:
+        api_key.limiter.per_day = 10
+    first = acquire(pool)
+    second = acquire(pool)
+    assert {first.key, second.key} == {'a', 'b'}
+    pool.release(first, OK)
+    pool.release(second, OK)
+    assert [api_key.used_today for api_key in pool.keys] == [1, 1]
+
+
+def test_sticky_routing_keeps_a_symbol_on_one_key():
+    pool = KeyPool(['a', 'b', 'c'], routing='sticky')
+    keys = set()
+    for _ in range(5):
+        api_key = acquire(pool, 'IBM')
+        pool.release(api_key, OK)
+        keys.add(api_key.key)
+    assert len(keys) == 1
+
+
+def test_throttled_keys_sit_out_and_invalid_keys_leave_the_rotation():
+    pool = KeyPool(['a', 'b', 'c'])
+    throttled, invalid = pool.keys[0], pool.keys[1]
+    throttled.in_flight = invalid.in_flight = 1
+    pool.release(throttled, THROTTLED, 'Our standard API rate limit is 25 requests per minute.')
+    pool.release(invalid, INVALID_KEY, 'the parameter apikey is invalid or missing.')
+    assert [api_key.key for api_key in pool.active_keys()] == ['c']
+    assert throttled.throttled == 1 and invalid.invalid
+    assert acquire(pool).key == 'c'
+
+
+def test_a_spent_daily_quota_sits_out_until_midnight(monkeypatch):
+    monkeypatch.setattr(keys, '_seconds_to_midnight', lambda: 5000.0)
+    pool = KeyPool(['a'])
+    api_key = acquire(pool)
+    pool.release(api_key, THROTTLED, 'You have reached the limit of 25 requests per day.')
+    stats = pool.stats()['keys'][0]
+    assert not stats['active'] and 4990 < stats['cooldown_seconds'] <= 5000
+
+
+def test_every_key_cooling_down_falls_back_to_the_first_to_recover():
+    pool = KeyPool(['a', 'b'])
+    pool.keys[0].cooldown_until, pool.keys[1].cooldown_until = 1e12, 1e11
+    assert acquire(pool).key == 'b'
+
+
+def test_no_valid_key_raises():
+    pool = KeyPool(['a'])
+    pool.keys[0].invalid = True
+    with pytest.raises(InvalidKeyError):
+        acquire(pool)
+    with pytest.raises(ValueError, match='ALPHAVANTAGE_API_KEY'):
+        acquire(KeyPool([]))
+
+
+def test_symbol_of_a_request_key():
+    pool = KeyPool(['a'])
+    assert pool.symbol_of(('FX_DAILY', ('from_symbol', 'EUR'), ('to_symbol', 'USD'))) == 'EUR'
+    assert pool.symbol_of(('CPI', ('interval', 'monthly'))) is None
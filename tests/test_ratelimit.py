@@ -0,0 +1,68 @@
+import asyncio
+import importlib
+import time
+
+from alphavantage_mcp import ratelimit
+from alphavantage_mcp.ratelimit import RateLimiter, TokenBucket
+
+
+def test_bucket_refills_continuously():
+    bucket = TokenBucket(2, 60)
+    now = bucket._updated
+    assert bucket.delay(now) == 0.0
+    bucket.take()
+    bucket.take()
+    assert bucket.delay(now) == 30.0
+    assert bucket.delay(now + 15) == 15.0
+    assert bucket.delay(now + 30) == 0.0
+    assert bucket.delay(now + 600) == 0.0 and bucket.tokens == 2
+
+
+def test_unlimited_limiter_never_waits():
+    limiter = RateLimiter(per_minute=0, per_day=0)
+
+    async def burst():
+        for _ in range(100):
+            await limiter.acquire()
+    asyncio.run(burst())
+    assert limiter.headroom() == float('inf')
+    assert limiter.stats()['acquired'] == 100 and limiter.stats()['delayed'] == 0
+
+
+def test_callers_wait_for_a_token_once_the_burst_is_spent():
+    limiter = RateLimiter(per_minute=600, per_day=0)
+
+    async def burst():
+        for _ in range(600):
+            await limiter.acquire()
+        start = time.monotonic()
+        await asyncio.gather(limiter.acquire(), limiter.acquire())
+        return time.monotonic() - start
+    waited = asyncio.run(burst())
+    # 600 per minute refills a token every 0.1 seconds
+    assert 0.15 <= waited < 1.0
+    stats = limiter.stats()
+    assert stats['acquired'] == 602 and stats['delayed'] == 2 and stats['max_queue_depth'] == 2
+
+
+def test_the_daily_limit_bounds_the_headroom():
+    limiter = RateLimiter(per_minute=60, per_day=10)
+    assert limiter.headroom() == 10
+
+    async def burst():
+        for _ in range(4):
+            await limiter.acquire()
+    asyncio.run(burst())
+    assert 5.9 < limiter.headroom() < 6.1
+
+
+def test_the_free_plan_quota_is_the_default(monkeypatch):
+    monkeypatch.delenv('ALPHAVANTAGE_REQUESTS_PER_MINUTE', raising=False)
+    monkeypatch.delenv('ALPHAVANTAGE_REQUESTS_PER_DAY', raising=False)
+    try:
+        limiter = importlib.reload(ratelimit).RateLimiter()
+        assert (limiter.per_minute, limiter.per_day) == (5, 25)
+        assert limiter.headroom() == 5
+    finally:
+        monkeypatch.undo()
+        importlib.reload(ratelimit)
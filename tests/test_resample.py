@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from alphavantage_mcp.resample import periods, resample, resample_intraday
+from alphavantage_mcp.store import to_seconds, to_stamps
+
+
+def bars(stamps):
+    """ Return columns of a bar at each stamp, the nth at prices n and volume 10 * n """
+    n = np.arange(1, len(stamps) + 1, dtype=float)
+    return {'time': to_seconds(stamps), 'open': n, 'high': n + 0.5, 'low': n - 0.5, 'close': n + 0.25,
+            'volume': (10 * n).astype(np.int64)}
+
+
+def test_weeks_run_monday_to_sunday_across_a_month_boundary():
+    columns = resample(bars(['2024-01-26', '2024-01-29', '2024-01-31', '2024-02-01', '2024-02-02', '2024-02-05']),
+                       'weekly')
+    assert to_stamps(columns['time'], 'D').tolist() == ['2024-01-26', '2024-02-02', '2024-02-05']
+    assert columns['open'].tolist() == [1.0, 2.0, 6.0]
+    assert columns['high'].tolist() == [1.5, 5.5, 6.5]
+    assert columns['low'].tolist() == [0.5, 1.5, 5.5]
+    assert columns['close'].tolist() == [1.25, 5.25, 6.25]
+    assert columns['volume'].tolist() == [10, 140, 60]
+
+
+def test_months_are_stamped_with_their_last_trading_day():
+    columns = resample(bars(['2023-12-29', '2024-01-02', '2024-01-31', '2024-02-01']), 'monthly')
+    assert to_stamps(columns['time'], 'D').tolist() == ['2023-12-29', '2024-01-31', '2024-02-01']
+    assert columns['volume'].tolist() == [10, 50, 40]
+
+
+def test_unknown_period():
+    with pytest.raises(ValueError):
+        periods(to_seconds(['2024-01-02']), 'daily')
+
+
+def test_regular_session_buckets_count_from_the_open():
+    stamps = ['2024-01-02 09:29:00', '2024-01-02 09:30:00', '2024-01-02 10:29:00', '2024-01-02 10:30:00',
+              '2024-01-02 15:59:00', '2024-01-02 16:00:00']
+    columns = resample_intraday(bars(stamps), '60min', 'false')
+    assert to_stamps(columns['time']).tolist() == ['2024-01-02 09:30:00', '2024-01-02 10:30:00',
+                                                   '2024-01-02 15:30:00']
+    assert columns['open'].tolist() == [2.0, 4.0, 5.0]
+    assert columns['volume'].tolist() == [50, 40, 50]
+
+
+def test_extended_session_buckets_count_from_four():
+    columns = resample_intraday(bars(['2024-01-02 03:59:00', '2024-01-02 09:29:00', '2024-01-02 09:30:00']),
+                                '60min', 'true')
+    assert to_stamps(columns['time']).tolist() == ['2024-01-02 09:00:00']
+    assert columns['close'].tolist() == [3.25]
+
+
+def test_around_the_clock_buckets_follow_the_clock():
+    columns = resample_intraday(bars(['2024-01-06 23:58:00', '2024-01-06 23:59:00', '2024-01-07 00:00:00']),
+                                '5min')
+    assert to_stamps(columns['time']).tolist() == ['2024-01-06 23:55:00', '2024-01-07 00:00:00']
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from alphavantage_mcp.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_load():
+    flight, calls = SingleFlight(), []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'calls': len(calls)}
+
+    async def run():
+        return await asyncio.gather(*(flight.do('IBM', load) for _ in range(5)))
+    results = asyncio.run(run())
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'in_flight': 0, 'upstream_loads': 1, 'coalesced_calls': 4}
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream failed')
+
+    async def run():
+        return await asyncio.gather(*(flight.do('IBM', load) for _ in range(3)), return_exceptions=True)
+    errors = asyncio.run(run())
+    assert [str(error) for error in errors] == ['upstream failed'] * 3
+    assert flight.loads == 1
+
+
+def test_the_key_is_freed_after_the_load():
+    flight, calls = SingleFlight(), []
+
+    async def load():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('upstream failed')
+        return len(calls)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await flight.do('IBM', load)
+        assert flight.stats()['in_flight'] == 0
+        return await flight.do('IBM', load), await flight.do('IBM', load)
+    assert asyncio.run(run()) == (2, 3)
+    assert flight.coalesced == 0
+
+
+def test_a_caller_giving_up_does_not_cancel_the_load():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return 'bars'
+
+    async def run():
+        impatient = asyncio.ensure_future(flight.do('IBM', load))
+        patient = asyncio.ensure_future(flight.do('IBM', load))
+        await asyncio.sleep(0.005)
+        impatient.cancel()
+        return await patient
+    assert asyncio.run(run()) == 'bars'
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from alphavantage_mcp.store import COLUMNS, BarStore, month_span, series_name, to_seconds, to_stamps
+
+DAY = 86400
+
+
+def bars(first, count, price=100.0):
+    """ Return the columns of count daily bars from day first of 2024 """
+    times = to_seconds(['2024-01-01']) + DAY * np.arange(first, first + count)
+    close = price + np.arange(count, dtype=float)
+    return {'time': times, 'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+            'volume': np.full(count, 1000)}
+
+
+def test_helpers():
+    assert to_stamps(to_seconds(['2024-01-02 09:30:00']), 'm').tolist() == ['2024-01-02 09:30']
+    assert month_span('2024-02') == (int(to_seconds(['2024-02-01'])[0]), int(to_seconds(['2024-03-01'])[0]))
+    assert series_name('5min', 'false', 'false') == '5min-regular-raw'
+
+
+def test_missing_series_reads_none(tmp_path):
+    assert BarStore(str(tmp_path)).read('IBM', 'daily') is None
+
+
+def test_round_trip_and_span(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('ibm', 'daily', bars(0, 10), 'US/Eastern', months=['2024-01'])
+    columns, meta = store.read('IBM', 'daily', start=int(bars(2, 1)['time'][0]), end=int(bars(5, 1)['time'][0]))
+    assert columns['close'].tolist() == [102.0, 103.0, 104.0]
+    assert meta['time_zone'] == 'US/Eastern' and meta['months'] == ['2024-01'] and meta['rows'] == 10
+
+
+def test_new_bars_are_appended_in_place(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('IBM', 'daily', bars(0, 10), 'US/Eastern')
+    store.write('IBM', 'daily', bars(10, 3, price=200.0), 'US/Eastern')
+    columns, meta = store.read('IBM', 'daily')
+    assert meta['generation'] == 0 and meta['rows'] == 13
+    assert columns['close'].tolist()[8:] == [108.0, 109.0, 200.0, 201.0, 202.0]
+
+
+def test_revised_last_bar_is_a_new_generation(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('IBM', 'daily', bars(0, 10), 'US/Eastern')
+    store.write('IBM', 'daily', bars(9, 3, price=200.0), 'US/Eastern')
+    columns, meta = store.read('IBM', 'daily')
+    assert meta['generation'] == 1 and meta['rows'] == 12
+    assert columns['close'].tolist()[8:] == [108.0, 200.0, 201.0, 202.0]
+
+
+def test_held_read_survives_an_overlapping_write(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('IBM', 'daily', bars(0, 10), 'US/Eastern')
+    held, _ = store.read('IBM', 'daily')
+    store.write('IBM', 'daily', bars(2, 10, price=1.0), 'US/Eastern', span=(int(bars(2, 1)['time'][0]),
+                                                                          int(bars(12, 1)['time'][0])))
+    assert held['close'].tolist() == [100.0 + i for i in range(10)]
+    columns, meta = store.read('IBM', 'daily')
+    assert meta['generation'] == 1 and columns['close'].tolist() == [100.0, 101.0] + [1.0 + i for i in range(10)]
+
+
+def test_older_bars_are_rewritten_as_a_new_generation(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('IBM', 'daily', bars(0, 10), 'US/Eastern')
+    store.write('IBM', 'daily', bars(3, 2, price=50.0), 'US/Eastern')
+    columns, meta = store.read('IBM', 'daily')
+    assert meta['generation'] == 1 and meta['rows'] == 10
+    assert columns['close'].tolist()[2:6] == [102.0, 50.0, 51.0, 105.0]
+    assert not any(os.path.exists(os.path.join(str(tmp_path), 'IBM', 'daily', '%s.0' % (name,))) for name, _ in COLUMNS)
+
+
+def test_record_keeps_the_request_info(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.record('IBM', 'daily', 'full', {'fetched': 1})
+    store.write('IBM', 'daily', bars(0, 3), 'US/Eastern')
+    store.record('IBM', 'daily', 'full', {'fetched': 2})
+    assert store.meta('IBM', 'daily')['requests'] == {'full': {'fetched': 2}}
+
+
+def test_reads_do_not_race_rewrites(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.write('IBM', 'daily', bars(0, 50), 'US/Eastern')
+    done, errors = threading.Event(), []
+
+    def read():
+        while not done.is_set():
+            try:
+                columns, _ = store.read('IBM', 'daily')
+                assert len(columns['close']) == 50
+            except Exception as e:
+                errors.append(e)
+            time.sleep(0.0005)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(300):
+            store.write('IBM', 'daily', bars(10, 5, price=float(i)), 'US/Eastern')
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert not errors
+    assert store.meta('IBM', 'daily')['generation'] == 300
@@ -0,0 +1,74 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from alphavantage_mcp import indicators
+from alphavantage_mcp.bars import Bars
+from alphavantage_mcp.cache import SQLiteCache
+from alphavantage_mcp.indicators import streaming
+
+from conftest import SYMBOL, recorded_bars
+
+SPECS = ['RSI', {'function': 'EMA', 'time_period': 10}, 'MACD']
+
+
+def head(bars, end):
+    """ Return the first end bars, as load_bars did before the later ones arrived """
+    return Bars(bars.index[:end], bars.open[:end], bars.high[:end], bars.low[:end], bars.close[:end],
+                bars.volume[:end], bars.time_zone, bars.times[:end])
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """ Return the list whose last Bars load_bars serves, with no stream state kept """
+    served = [recorded_bars()]
+
+    async def load_bars(symbol, interval='daily', month=None, entitlement=None):
+        return served[-1]
+    monkeypatch.setattr(indicators, 'load_bars', load_bars)
+    monkeypatch.setattr(streaming, '_states', streaming.OrderedDict())
+    monkeypatch.setattr(streaming, 'disk_cache', None)
+    return served
+
+
+def test_streamed_bars_match_a_full_recomputation(served):
+    bars = served.pop()
+    updates, since = {}, None
+    for end in range(700, len(bars) + 1, 7):
+        served.append(head(bars, end))
+        data, _ = asyncio.run(indicators.compute_updates(SYMBOL, SPECS, since=since))
+        for i, stamp in enumerate(data['index']):
+            updates[stamp] = {name: column[i] for name, column in data['columns'].items()}
+        since = data['index'][0]
+    full, _ = asyncio.run(indicators.compute_many(SYMBOL, SPECS))
+    for i, stamp in enumerate(full['index'][:len(updates)]):
+        assert updates[stamp] == {name: column[i] for name, column in full['columns'].items()}
+
+
+def test_revised_last_bar_is_stepped_again(served):
+    asyncio.run(indicators.compute_updates(SYMBOL, ['RSI']))
+    bars = served[-1]
+    close = np.array(bars.close)
+    close[-1] *= 1.02
+    served.append(Bars(bars.index, bars.open, bars.high, bars.low, close, bars.volume, bars.time_zone, bars.times))
+    streamed, _ = asyncio.run(indicators.compute_updates(SYMBOL, ['RSI']))
+    full, _ = asyncio.run(indicators.compute_many(SYMBOL, ['RSI']))
+    assert streamed['columns']['RSI'][0] == full['columns']['RSI'][0]
+
+
+def test_states_are_bounded(served, monkeypatch):
+    monkeypatch.setattr(streaming, 'STATE_MEMO_SIZE', 2)
+    for period in (5, 10, 20):
+        asyncio.run(indicators.compute_updates(SYMBOL, [{'function': 'EMA', 'time_period': period}]))
+    assert len(streaming._states) == 2
+    assert all('"EMA"' in key for key in streaming._states)
+
+
+def test_states_are_resumed_from_the_disk_cache(served, monkeypatch, tmp_path):
+    monkeypatch.setattr(streaming, 'disk_cache', SQLiteCache(str(tmp_path / 'cache.sqlite')))
+    asyncio.run(indicators.compute_updates(SYMBOL, ['RSI']))
+    key = next(iter(streaming._states))
+    streaming._states.clear()
+    assert asyncio.run(streaming._load(key)) == streaming.disk_cache.get_state(key)
+    assert key in streaming._states
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from alphavantage_mcp.frames import Selection, from_json, select
+from alphavantage_mcp.store import to_seconds
+from alphavantage_mcp.summary import summarize
+
+STAMPS = ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']
+
+
+def test_summary_of_prices():
+    summary = summarize(to_seconds(STAMPS), [100.0, 110.0, 99.0, 121.0], STAMPS.__getitem__)
+    assert summary['points'] == 4
+    assert summary['first'] == {'time': '2024-01-01', 'value': 100.0}
+    assert summary['last'] == {'time': '2024-01-04', 'value': 121.0}
+    assert summary['change'] == 21.0
+    assert summary['min'] == {'time': '2024-01-03', 'value': 99.0}
+    assert summary['max'] == {'time': '2024-01-04', 'value': 121.0}
+    assert summary['mean'] == 107.5
+    assert summary['std'] == pytest.approx(np.sqrt(317 / 4), abs=1e-6)
+    assert summary['percentiles']['50'] == 105.0
+    assert summary['trend']['slope_per_day'] == 5.2
+    assert summary['return'] == 0.21
+    assert summary['returns']['best'] == {'time': '2024-01-04', 'value': 0.222222}
+    assert summary['returns']['worst'] == {'time': '2024-01-03', 'value': -0.1}
+    assert summary['returns']['periods_per_year'] == 365.25
+    assert summary['max_drawdown'] == {'value': -0.1, 'peak': {'time': '2024-01-02', 'value': 110.0},
+                                       'trough': {'time': '2024-01-03', 'value': 99.0}}
+
+
+def test_summary_of_values_not_all_positive_has_no_returns():
+    summary = summarize(to_seconds(STAMPS), [1.0, -1.0, np.nan, 3.0], STAMPS.__getitem__)
+    assert summary['points'] == 3
+    assert summary['last'] == {'time': '2024-01-04', 'value': 3.0}
+    assert summary['trend']['slope_per_day'] == pytest.approx(6 / 7, abs=1e-6)
+    assert 'return' not in summary and 'max_drawdown' not in summary
+
+
+def test_summary_of_a_single_value():
+    summary = summarize(to_seconds(STAMPS[:1]), [5.0], STAMPS.__getitem__)
+    assert summary['points'] == 1
+    assert 'trend' not in summary and 'returns' not in summary
+
+
+def test_selection_summarizes_the_adjusted_close():
+    data = {stamp: {'4. close': '%d.00' % (n,), '5. adjusted close': '%d.00' % (2 * n,), '6. volume': '1'}
+            for n, stamp in reversed(list(enumerate(STAMPS, 1)))}
+    frame = from_json({'Meta Data': {}, 'Time Series (Daily)': data})
+    summary, _ = select(frame, {}, Selection(summary=True, start='2024-01-02'))
+    assert summary['field'] == '5. adjusted close'
+    assert summary['first'] == {'time': '2024-01-02', 'value': 4.0}
+    assert summary['return'] == 1.0
@@ -0,0 +1,50 @@
+import asyncio
+import inspect
+
+import pytest
+
+import main
+from alphavantage_mcp.indicators import INDICATORS
+
+
+def descriptions():
+    return {tool.name: tool.description for tool in asyncio.run(main.mcp.list_tools())}
+
+
+def test_selection_arguments_are_documented_once():
+    documented = descriptions()
+    for name, description in documented.items():
+        parameters = inspect.signature(getattr(main, name)).parameters
+        for argument in ('start, end', 'limit', 'fields', 'max_points', 'summary', 'output'):
+            expected = 1 if argument.split(',')[0] in parameters else 0
+            assert description.count('\n        %s:' % (argument,)) == expected, (name, argument)
+
+
+def test_indicator_tools_list_their_own_outputs():
+    documented = descriptions()
+    for function, indicator in INDICATORS.items():
+        description = documented['get_%s' % (function.lower(),)]
+        assert all("'%s'" % (output,) in description for output in indicator.outputs), function
+
+
+def test_columns_output_names_the_tool_columns():
+    documented = descriptions()
+    assert "{'t': [...], 'value': [...]}" in documented['get_wti']
+    assert "{'t': [...], 'SMA': [...]}" in documented['get_sma']
+    assert "'ac': [...]" in documented['get_daily_adjusted']
+    assert "'v': [...]" not in documented['get_currency_exchange_daily']
+
+
+def test_unknown_compute_is_refused(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('an unknown compute must not reach upstream')
+    monkeypatch.setattr(main, 'shared', fail)
+    monkeypatch.setattr(main, 'compute_local', fail)
+    for function in INDICATORS:
+        with pytest.raises(ValueError, match="compute must be 'local' or 'remote'"):
+            asyncio.run(getattr(main, 'get_%s' % (function.lower(),))('IBM', compute='locally'))
+
+
+def test_no_tool_takes_self():
+    for tool in asyncio.run(main.mcp.list_tools()):
+        assert 'self' not in inspect.signature(getattr(main, tool.name)).parameters, tool.name